@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import hashlib
+import collections.abc
+import DataCodec  # 数据文件的编码格式
+import ChangeLog  # 已有文章的追加式变更日志
+
+# =================== 配置项 ===================
+ARTICLES_DIR = "articles"   # 文章文件所在的子目录，文件名由文章 URL 生成，与显示位置无关
+INDEX_FILE = "index.json"   # 清单：显示顺序、分页和每篇文章的元数据
+FIXED_DIR = "fixed"         # 固定页面（如关于页面）所在的子目录，不参与排序
+PAGE_SIZE = 10              # 每页文章数，写入索引
+# 只在内存中使用、不写入文章文件的字段：页码和页内序号由索引决定，文件路径由 URL 决定
+TRANSIENT_FIELDS = ("page", "order", "filename")
+# 清单中记录、读取时不需要打开文章文件的字段（另有 page、order、filename）
+MANIFEST_FIELDS = ("article_url", "title", "article_time")
+
+# 旧版目录结构 page{N}/page{N}_order{M}_{id}.json
+LEGACY_PAGE_DIR_RE = re.compile(r'^page(\d+)$')
+LEGACY_ORDER_RE = re.compile(r'order(\d+)')
+
+# =================== 文件读写 ===================
+
+def article_key(article_url):
+    """
+    由文章 URL 生成稳定的存储键
+    """
+    return hashlib.md5(article_url.encode("utf-8")).hexdigest()
+
+def write_json(path, data):
+    """
+    按 DataCodec.FORMAT 写出，先写临时文件再替换，中途出错不会留下不完整的文件
+    """
+    DataCodec.dump_file(path, data)
+
+def write_article(path, article):
+    """
+    写出一篇文章，不包含 TRANSIENT_FIELDS 中的字段
+    """
+    write_json(path, {key: value for key, value in article.items() if key not in TRANSIENT_FIELDS})
+
+# =================== 清单 ===================
+
+def count_comments(comments):
+    """
+    评论总数（含所有层级的回复）
+    """
+    count = 0
+    stack = list(comments or [])
+    while stack:
+        comment = stack.pop()
+        count += 1
+        stack.extend(comment.get("children", []))
+    return count
+
+def manifest_entry(article):
+    """
+    一篇文章的清单条目：URL、标题、发布时间、评论数、正文哈希和文件路径（相对数据目录），
+    页码和页内序号由 ArticleStore.save_order 填入
+    """
+    key = article_key(article["article_url"])
+    return {
+        "key": key,
+        "article_url": article["article_url"],
+        "title": article.get("title"),
+        "article_time": article.get("article_time"),
+        "comment_count": count_comments(article.get("comments")),
+        "content_hash": hashlib.md5((article.get("content") or "").encode("utf-8")).hexdigest(),
+        "path": f"{ARTICLES_DIR}/{key}.json",
+    }
+
+
+class LazyArticle(collections.abc.MutableMapping):
+    """
+    由清单条目创建的文章：清单中的字段（URL、标题、发布时间、页码、序号、文件路径）直接返回，
+    第一次访问正文、评论等其余字段时才读取文章文件。读取前设置的字段在读取后覆盖文件中的值，
+    与一开始就完整读取再修改的结果相同。
+    """
+
+    def __init__(self, meta, path, reader=DataCodec.load_file):
+        self._meta = meta
+        self._path = path
+        self._reader = reader
+        self._changes = {}
+        self._data = None
+
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def load(self):
+        if self._data is None:
+            data = self._reader(self._path)
+            for key in TRANSIENT_FIELDS:
+                data[key] = self._meta[key]
+            data.update(self._changes)
+            self._data = data
+        return self._data
+
+    def __getitem__(self, key):
+        if self._data is None:
+            if key in self._changes:
+                return self._changes[key]
+            if key in self._meta:
+                return self._meta[key]
+        return self.load()[key]
+
+    def __setitem__(self, key, value):
+        if self._data is None:
+            self._changes[key] = value
+        else:
+            self._data[key] = value
+
+    def __delitem__(self, key):
+        del self.load()[key]
+
+    def __contains__(self, key):
+        if self._data is None and (key in self._changes or key in self._meta):
+            return True
+        return key in self.load()
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __repr__(self):
+        return f"LazyArticle({self._meta['article_url']!r}, loaded={self.loaded})"
+
+# =================== 按 URL 存储 ===================
+
+class ArticleStore:
+    """
+    按文章 URL 存储：data/articles/<key>.json 每篇文章一个文件，文件名只由 URL 决定；
+    data/index.json 为清单，按显示顺序（最新在前）记录每篇文章的元数据（见 manifest_entry）和页码、序号。
+    插入 N 篇新文章只需写 N 个文章文件和一次清单，已有文章的文件不动；
+    保存已排序的文章时同步更新它在清单中的条目。
+    change_log 为 True 时，保存已有文章只在变更日志（见 ChangeLog.py）中追加变化的字段和评论，
+    文章文件和清单由 compact() 统一写回；读取时总会应用日志中尚未压缩的记录。
+    """
+
+    def __init__(self, data_dir, page_size=PAGE_SIZE, change_log=False):
+        self.data_dir = data_dir
+        self.page_size = page_size
+        self.articles_dir = os.path.join(data_dir, ARTICLES_DIR)
+        self.index_path = os.path.join(data_dir, INDEX_FILE)
+        self.change_log = change_log
+        self.log = ChangeLog.ChangeLog(data_dir)
+        self._entries = None    # 清单条目，第一次使用时读取
+
+    def path_for(self, article_url):
+        return os.path.join(self.articles_dir, f"{article_key(article_url)}.json")
+
+    def has_index(self):
+        return os.path.exists(self.index_path)
+
+    def read_index(self):
+        """
+        返回清单中的条目列表（显示顺序），没有清单时返回 []；同一个 ArticleStore 只读取一次
+        """
+        if self._entries is None:
+            self._entries = DataCodec.load_file(self.index_path).get("articles", []) if self.has_index() else []
+            # 变更日志中尚未压缩的记录带有更新后的条目（不含页码和序号）
+            positions = {entry["key"]: i for i, entry in enumerate(self._entries)}
+            for key, records in self.log.pending().items():
+                if key in positions:
+                    for record in records:
+                        self._entries[positions[key]].update(record.get("manifest", {}))
+        return self._entries
+
+    def read_file(self, path):
+        """
+        读取一篇文章的文件，并应用变更日志中尚未压缩的记录
+        """
+        key = os.path.splitext(os.path.basename(path))[0]
+        return self.log.apply(key, DataCodec.load_file(path))
+
+    def _write_index(self):
+        os.makedirs(self.data_dir, exist_ok=True)
+        write_json(self.index_path, {"page_size": self.page_size, "articles": self._entries})
+
+    def contains(self, article_url):
+        return os.path.exists(self.path_for(article_url))
+
+    def position(self, i):
+        """
+        顺序中第 i 篇（从 0 开始）对应的 (页码, 页内序号)，均从 1 开始
+        """
+        return i // self.page_size + 1, i % self.page_size + 1
+
+    def load_all(self, lazy=False):
+        """
+        按清单顺序加载全部文章，每篇附带 page、order、filename 字段；文件缺失或损坏的文章跳过。
+        lazy 为 True 时返回 LazyArticle，只用到清单中的字段（如按标题匹配、取第一篇的 URL）时不读取文章文件；
+        旧版清单中没有元数据的条目仍直接读取。
+        """
+        articles = []
+        for i, entry in enumerate(self.read_index()):
+            path = os.path.join(self.data_dir, entry["path"]) if "path" in entry else self.path_for(entry["article_url"])
+            page, order = self.position(i)
+            if lazy and "title" in entry:
+                if not os.path.exists(path):
+                    print(f"❌ 加载文件 {path} 出错: 文件不存在")
+                    continue
+                meta = {key: entry.get(key) for key in MANIFEST_FIELDS}
+                meta.update(page=page, order=order, filename=path)
+                articles.append(LazyArticle(meta, path, reader=self.read_file))
+                continue
+            try:
+                article = self.read_file(path)
+            except Exception as e:
+                print(f"❌ 加载文件 {path} 出错: {e}")
+                continue
+            article["page"], article["order"] = page, order
+            article["filename"] = path
+            articles.append(article)
+        return articles
+
+    def save_article(self, article):
+        """
+        写出一篇文章到按 URL 决定的文件，并把路径记录在 article["filename"] 中；
+        文章已在清单中时同步更新它的条目
+        """
+        return self.save_articles([article])[0]
+
+    def save_articles(self, articles):
+        """
+        写出多篇文章，已在清单中的文章的条目一并更新，清单最多写一次。返回各文章的文件路径。
+        使用变更日志时，已有文章只追加一条变更记录（没有变化则不写），清单条目随记录保存
+        """
+        os.makedirs(self.articles_dir, exist_ok=True)
+        positions = {entry["key"]: i for i, entry in enumerate(self.read_index())}
+        paths = []
+        changed = False
+        for article in articles:
+            key = article_key(article["article_url"])
+            path = self.path_for(article["article_url"])
+            i = positions.get(key)
+            if self.change_log and os.path.exists(path):
+                stored = {field: value for field, value in article.items() if field not in TRANSIENT_FIELDS}
+                record = ChangeLog.make_record(self.read_file(path), stored)
+                if record is not None:
+                    record["manifest"] = manifest_entry(stored)
+                    self.log.append(key, record)
+                    if i is not None:
+                        self._entries[i].update(record["manifest"])
+            else:
+                write_article(path, article)
+                if i is not None:
+                    entry = manifest_entry(article)
+                    entry["page"], entry["order"] = self.position(i)
+                    self._entries[i] = entry
+                    changed = True
+            article["filename"] = path
+            paths.append(path)
+        if changed:
+            self._write_index()
+        return paths
+
+    def save_order(self, articles):
+        """
+        按给定顺序写出清单，并更新各文章的 page、order 字段；重复的 URL 只保留第一次出现的位置。
+        未读取文件的 LazyArticle 沿用原来的条目，不会因此读取文章文件
+        """
+        existing = {entry["key"]: entry for entry in self.read_index()}
+        entries = []
+        seen = set()
+        for article in articles:
+            url = article["article_url"]
+            if url in seen:
+                continue
+            seen.add(url)
+            key = article_key(url)
+            if isinstance(article, LazyArticle) and not article.loaded and "title" in existing.get(key, {}):
+                entry = dict(existing[key])
+            else:
+                entry = manifest_entry(article)
+            entry["page"], entry["order"] = self.position(len(entries))
+            article["page"], article["order"] = entry["page"], entry["order"]
+            entries.append(entry)
+        self._entries = entries
+        self._write_index()
+
+    def compact(self):
+        """
+        压缩变更日志：把当前日志段中的记录写回文章文件并重写清单，然后把日志段移入历史。
+        开始压缩后追加的记录写入新的日志段；中途中断时记录仍在，下次重新压缩。
+        返回写回的文章数。
+        """
+        segments, records = self.log.take_segments()
+        if not segments:
+            return 0
+        self._entries = None
+        positions = {entry["key"]: i for i, entry in enumerate(self.read_index())}
+        written = 0
+        for key, key_records in records.items():
+            path = os.path.join(self.articles_dir, f"{key}.json")
+            if not os.path.exists(path):
+                continue
+            article = DataCodec.load_file(path)
+            if ChangeLog.apply_records(article, key_records):
+                write_article(path, article)
+                written += 1
+            if key in positions:
+                self._entries[positions[key]].update(manifest_entry(article))
+        self._write_index()
+        self.log.retire_segments(segments)
+        print(f"✅ 变更日志压缩完成，写回 {written} 篇文章")
+        return written
+
+    # ------------------- 旧版目录结构迁移 -------------------
+
+    def legacy_files(self):
+        """
+        旧版 page{N}/page{N}_order{M}_{id}.json 文件列表 [(页码, 序号, 路径)]，按显示顺序排列
+        """
+        files = []
+        if not os.path.isdir(self.data_dir):
+            return files
+        for folder in os.listdir(self.data_dir):
+            m = LEGACY_PAGE_DIR_RE.match(folder)
+            folder_path = os.path.join(self.data_dir, folder)
+            if not m or not os.path.isdir(folder_path):
+                continue
+            for filename in os.listdir(folder_path):
+                if filename.endswith(".json"):
+                    m2 = LEGACY_ORDER_RE.search(filename)
+                    files.append((int(m.group(1)), int(m2.group(1)) if m2 else 0, os.path.join(folder_path, filename)))
+        files.sort()
+        return files
+
+    def load_legacy(self):
+        """
+        按显示顺序读取旧版目录结构中的文章（不修改文件），损坏的文件跳过
+        """
+        articles = []
+        for _, _, path in self.legacy_files():
+            try:
+                articles.append(DataCodec.load_file(path))
+            except Exception as e:
+                print(f"❌ 加载文件 {path} 出错: {e}")
+        return articles
+
+    def migrate_legacy(self):
+        """
+        把旧版按页码存储的文章迁移为按 URL 存储：先写文章文件和索引，最后删除旧文件，
+        中途中断时下次重新迁移（已有索引时只清理剩余的旧文件）。返回迁移的文章数。
+        """
+        legacy = self.legacy_files()
+        if not legacy:
+            return 0
+        migrated = []
+        if not self.has_index():
+            migrated = self.load_legacy()
+            self.save_articles(migrated)
+            self.save_order(migrated)
+            print(f"✅ 已将 {len(migrated)} 篇文章迁移为按 URL 存储（{self.articles_dir}）")
+        for _, _, path in legacy:
+            os.remove(path)
+        for folder in {os.path.dirname(path) for _, _, path in legacy}:
+            if not os.listdir(folder):
+                os.rmdir(folder)
+        return len(migrated)
+
+
+def load_fixed(data_dir):
+    """
+    加载 data_dir/fixed 下的固定页面，每篇附带 filename 字段
+    """
+    articles = []
+    fixed_dir = os.path.join(data_dir, FIXED_DIR)
+    if not os.path.exists(fixed_dir):
+        return articles
+    for filename in os.listdir(fixed_dir):
+        if filename.endswith(".json"):
+            filepath = os.path.join(fixed_dir, filename)
+            try:
+                data = DataCodec.load_file(filepath)
+                data["filename"] = filepath
+                articles.append(data)
+            except Exception as e:
+                print(f"❌ 加载固定页面文件 {filepath} 出错: {e}")
+    return articles
+
+def open_store(data_dir, page_size=PAGE_SIZE, change_log=False):
+    """
+    打开数据目录的文章存储，发现旧版目录结构时先迁移；
+    不使用变更日志但日志中还有未压缩的记录时先压缩，之后直接写文章文件不会与日志冲突
+    """
+    store = ArticleStore(data_dir, page_size=page_size, change_log=change_log)
+    store.migrate_legacy()
+    if not change_log and store.log.pending_bytes():
+        store.compact()
+    return store
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+from bs4 import BeautifulSoup
+import Http
+import RateLimit
+import StandIn
+import HtmlArchive
+import HtmlParse
+import Extract
+import Timestamps
+import DataCodec
+
+# =================== 配置项 ===================
+BENCH_RATE = 1000.0         # 替身站点在本机，默认放开主机限速器；--polite 时保持 RateLimit 的默认速率
+STORAGE_ARTICLES = 5000     # 数据文件格式对比使用的合成文章数
+STORAGE_COMMENTS = 20       # 数据文件格式对比中每篇文章的评论数
+
+# =================== 端到端性能测试 ===================
+
+@contextlib.contextmanager
+def working_directory(path):
+    """
+    临时切换工作目录：CrawlAll 和 Rdata 都把数据写在当前目录下
+    """
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+def count_written_files(folder, since):
+    """
+    统计 folder 下 since 之后写入的 JSON 文件数，即本阶段保存的文章数
+    """
+    count = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith(".json") and os.path.getmtime(os.path.join(root, name)) >= since:
+                count += 1
+    return count
+
+def run_phase(name, server, func, output_dir):
+    """
+    运行一个阶段并返回 {阶段, 请求数, 文章数, 耗时}
+    """
+    before = server.snapshot_stats()
+    start_wall = time.time()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    after = server.snapshot_stats()
+    return {
+        "phase": name,
+        "requests": after.get("requests", 0) - before.get("requests", 0),
+        "errors": after.get("errors", 0) - before.get("errors", 0),
+        "articles": count_written_files(output_dir, start_wall - 1),
+        "seconds": elapsed,
+    }
+
+def configure_modules(base_url, site, polite=False):
+    """
+    把 CrawlAll 和 Rdata 指向替身站点
+    """
+    import CrawlAll
+    import Rdata
+    CrawlAll.BASE_URL = base_url
+    CrawlAll.PAGE_URLS = [f"{base_url}?page_id={page_id}" for page_id in site.fixed_page_ids]
+    Rdata.BASE_URL = base_url
+    if not polite:
+        limiter = RateLimit.limiter_for(base_url)
+        limiter.rate = limiter.max_rate = BENCH_RATE
+        limiter.burst = BENCH_RATE
+    return CrawlAll, Rdata
+
+def run_benchmark(articles=StandIn.ARTICLES, comments=StandIn.COMMENTS_PER_ARTICLE, depth=StandIn.THREAD_DEPTH,
+                  latency=StandIn.LATENCY, error_rate=StandIn.ERROR_RATE, new_articles=3, new_comments=20,
+                  use_async=False, pipeline=False, polite=False, work_dir=None):
+    """
+    启动替身站点，依次运行：
+    1. CrawlAll.crawl() 全量爬取（use_async 时改用 crawl_concurrent()，pipeline 时改用 crawl_pipeline()）；
+    2. Rdata.main_update() 首次更新（本地没有数据）；
+    3. 站点新增 new_articles 篇文章和 new_comments 条评论后再次运行 Rdata.main_update()。
+    返回每个阶段的结果列表。work_dir 为 None 时在临时目录中运行，结束后删除。
+    """
+    site = StandIn.StandInSite(articles=articles, comments=comments, depth=depth)
+    server = StandIn.start(site, latency=latency, error_rate=error_rate)
+    CrawlAll, Rdata = configure_modules(server.base_url, site, polite=polite)
+    folder = work_dir or tempfile.mkdtemp(prefix="bench_")
+    os.makedirs(folder, exist_ok=True)
+    results = []
+    try:
+        with working_directory(folder):
+            if pipeline:
+                crawl = CrawlAll.crawl_pipeline
+            elif use_async:
+                crawl = CrawlAll.crawl_concurrent
+            else:
+                crawl = CrawlAll.crawl
+            results.append(run_phase(f"CrawlAll.{crawl.__name__}", server, crawl, "datatest"))
+            results.append(run_phase("Rdata.main_update（首次）", server, Rdata.main_update, Rdata.DATA_DIR))
+            for _ in range(new_articles):
+                site.add_article()
+            ids = site.article_ids()
+            for i in range(new_comments):
+                site.add_comment(ids[i % len(ids)])
+            results.append(run_phase("Rdata.main_update（增量）", server, Rdata.main_update, Rdata.DATA_DIR))
+    finally:
+        Http.disable_cache()
+        server.shutdown()
+        server.server_close()
+        if work_dir is None:
+            shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+# =================== 解析器对比 ===================
+
+def parser_variants():
+    """
+    参与对比的解析方式：(名称, 解析函数(bytes, 编码) -> 解析树)。
+    基准为原来的做法：先解码为文本，再用 html.parser 解析整个页面。
+    """
+    variants = [
+        ("html.parser 全页（基准）", lambda body, enc: BeautifulSoup(body.decode(enc), "html.parser")),
+        ("html.parser 区域", lambda body, enc: HtmlParse.make_soup(body, enc, HtmlParse.ARTICLE_REGIONS,
+                                                                  parser="html.parser")),
+    ]
+    if HtmlParse.HAS_LXML:
+        variants += [
+            ("lxml 全页", lambda body, enc: HtmlParse.make_soup(body, enc, parser="lxml")),
+            ("lxml 区域", lambda body, enc: HtmlParse.make_soup(body, enc, HtmlParse.ARTICLE_REGIONS, parser="lxml")),
+        ]
+    return variants
+
+def benchmark_parsers(archive_dir=HtmlArchive.ARCHIVE_DIR, repeat=3):
+    """
+    用原始网页存档中的文章页对比各解析方式的耗时（只计解析，不含字段提取），
+    并检查从解析树提取出的快照与基准是否完全一致。
+    返回结果列表 {名称, 页面数, 耗时, 不一致数}。
+    """
+    archive = HtmlArchive.open_archive(archive_dir)
+    pages = []
+    for url in archive.urls():
+        if "?p=" in url or "page_id=" in url:
+            body, encoding = archive.get(url)
+            pages.append((url, body, encoding or HtmlParse.DEFAULT_ENCODING))
+    if not pages:
+        print(f"❌ 存档 {archive_dir} 中没有文章页面，请先用 CrawlAll.py --archive 爬取一次")
+        return []
+    print(f"📌 存档中共有 {len(pages)} 个文章页面，每种解析方式重复 {repeat} 次")
+    expected = None
+    results = []
+    for name, parse in parser_variants():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            soups = [parse(body, encoding) for _, body, encoding in pages]
+        elapsed = time.perf_counter() - start
+        snapshots = [Extract.build_snapshot(soup, url) for soup, (url, _, _) in zip(soups, pages)]
+        if expected is None:
+            expected = snapshots
+        mismatched = [url for (url, _, _), a, b in zip(pages, snapshots, expected) if a != b]
+        for url in mismatched[:3]:
+            print(f"❌ {name} 解析结果与基准不一致：{url}")
+        results.append({"parser": name, "pages": len(pages) * repeat, "seconds": elapsed,
+                        "mismatched": len(mismatched)})
+    return results
+
+def print_parser_report(results):
+    print("\n=================== 解析器对比结果 ===================")
+    print(f"{'解析方式':<24}{'页面数':>8}{'耗时(s)':>10}{'页面/s':>10}{'加速比':>8}{'不一致':>8}")
+    base = results[0]["seconds"] if results else 0
+    for r in results:
+        seconds = max(r["seconds"], 1e-9)
+        print(f"{r['parser']:<24}{r['pages']:>8}{r['seconds']:>10.2f}{r['pages'] / seconds:>10.1f}"
+              f"{base / seconds:>8.1f}{r['mismatched']:>8}")
+
+# =================== 评论树解析对比 ===================
+
+def recursive_parse_comment(comment, article_url, level=0, selected_color="white", index=0):
+    """
+    逐层递归解析评论（改为显式栈之前的写法），作为对比基准
+    """
+    author_tag = comment.find("cite", class_="fn")
+    if not author_tag:
+        return None, index
+    comment_user = author_tag.text.strip()
+
+    time_tag = comment.find("small")
+    if time_tag:
+        time_text, epoch = Timestamps.parse_comment_time(time_tag.get_text(strip=True))
+    else:
+        time_text, epoch = "", None
+
+    comment_text_tag = comment.find("div", class_="comment_text")
+    if not comment_text_tag:
+        return None, index
+
+    # 删除评论中的回复按钮标签
+    for reply in comment_text_tag.find_all("div", class_="reply"):
+        reply.decompose()
+    comment_text = comment_text_tag.decode_contents().strip()
+
+    highlight = (comment_user in Extract.TARGET_USERS)
+    current_index = index
+    comment_id = Extract.generate_unique_id(article_url, current_index)
+    index = current_index + 1
+
+    datatest = {
+        "id": comment_id,
+        "author": comment_user,
+        "time": time_text,
+        "epoch": epoch,
+        "content": comment_text,
+        "level": level,
+        "highlight": highlight,
+        "children": []
+    }
+
+    children_container = comment.find("ul", class_="children")
+    if children_container:
+        child_comments = children_container.find_all("li", class_="comment", recursive=False)
+        for child in child_comments:
+            child_datatest, index = recursive_parse_comment(child, article_url, level + 1, selected_color, index)
+            if child_datatest:
+                datatest["children"].append(child_datatest)
+    return datatest, index
+
+def recursive_comment_html(comment, article_url, level=0, selected_color="white", index=0):
+    """
+    逐层递归生成评论 HTML（Ghtml 改为显式栈之前的写法），作为对比基准
+    """
+    import Ghtml
+    if comment.get("highlight", False):
+        highlight_class, bg_color = "highlight", "#fff5cc"
+    else:
+        highlight_class, bg_color = "reply", selected_color
+    comment_id = Ghtml.generate_unique_id(article_url, index)
+    index += 1
+    epoch_attr = f' data-epoch="{comment["epoch"]}"' if comment.get("epoch") is not None else ''
+    html = f'<div class="comment {highlight_class}" style="background-color:{bg_color}" id="{comment_id}"{epoch_attr} onclick="removeHighlight(this)">'
+    html += f'<div class="author">{comment["author"]}</div>'
+    html += f'<div class="time">{comment["time"]}</div>'
+    html += f'<div class="comment-text">{comment["content"]}</div>'
+    if comment.get("children", []):
+        replies_html = ""
+        for child in comment["children"]:
+            child_html, index = recursive_comment_html(child, article_url, level + 1, selected_color, index)
+            replies_html += child_html
+        html += f'<div class="replies">{replies_html}</div>'
+    html += '</div>'
+    return html, index
+
+def thread_cases():
+    """
+    参与对比的评论树：(名称, 评论数, 最大回复层级)。
+    前几项为一条评论接一条回复的深层楼中楼，最后一项为大量浅层评论。
+    """
+    return [
+        ("深度 500", 501, 500),
+        ("深度 900", 901, 900),
+        ("深度 3000", 3001, 3000),
+        ("宽 3000 条 / 深度 3", 3000, 3),
+    ]
+
+def flatten_comments(comments):
+    """
+    按先序把评论树展开为 [(评论字段, 回复数)]，用于比较深层评论树
+    （直接用 == 比较嵌套字典本身也会超出递归深度）
+    """
+    flat = []
+    stack = list(reversed(comments))
+    while stack:
+        comment = stack.pop()
+        children = comment.get("children", [])
+        flat.append(({key: value for key, value in comment.items() if key != "children"}, len(children)))
+        stack.extend(reversed(children))
+    return flat
+
+def run_tree_impl(func, items, article_url):
+    """
+    对每条顶层评论调用 func，返回 (结果列表, 耗时)；超出递归深度时结果为 None
+    """
+    start = time.perf_counter()
+    try:
+        results = [func(item, article_url)[0] for item in items]
+    except RecursionError:
+        results = None
+    return results, time.perf_counter() - start
+
+def benchmark_comment_trees(repeat=3):
+    """
+    对比逐层递归与显式栈两种写法：从页面解析评论树（Extract.parse_comment，CrawlAll 和 Rdata 共用），
+    以及把评论树生成 HTML（Ghtml.parse_comment）。页面解析不计入耗时；
+    检查两种写法的结果完全一致，递归写法超出递归深度限制时记为失败。
+    返回结果列表 {用例, 阶段, 递归耗时, 显式栈耗时, 是否一致}。
+    """
+    import Ghtml
+    base_url = "http://127.0.0.1/wp/"
+    results = []
+    for name, comments, depth in thread_cases():
+        site = StandIn.StandInSite(articles=1, comments=comments, depth=depth, fixed_page_ids=[])
+        post_id = site.article_ids()[0]
+        article_url = site.post_url(base_url, post_id)
+        page = site.article_page(base_url, post_id)
+        timings = {}
+        outputs = {}
+        for impl_name, func in (("recursive", recursive_parse_comment), ("iterative", Extract.parse_comment)):
+            timings[impl_name] = 0.0
+            for _ in range(repeat):
+                # 解析时会删除回复按钮，每次都用新的解析树
+                soup = HtmlParse.make_soup(page, regions=HtmlParse.ARTICLE_REGIONS)
+                top = soup.find("ol", class_="commentlist").find_all("li", class_="comment", recursive=False)
+                outputs[impl_name], elapsed = run_tree_impl(func, top, article_url)
+                timings[impl_name] += elapsed
+        results.append(tree_result(name, "页面 -> 评论", timings, outputs))
+
+        tree = outputs["iterative"]
+        for impl_name, func in (("recursive", recursive_comment_html), ("iterative", Ghtml.parse_comment)):
+            timings[impl_name] = 0.0
+            for _ in range(repeat):
+                outputs[impl_name], elapsed = run_tree_impl(func, tree, article_url)
+                timings[impl_name] += elapsed
+        results.append(tree_result(name, "评论 -> HTML", timings, outputs))
+    return results
+
+def tree_result(name, stage, timings, outputs):
+    failed = outputs["recursive"] is None
+    if not failed and stage == "页面 -> 评论":
+        identical = flatten_comments(outputs["recursive"]) == flatten_comments(outputs["iterative"])
+    else:
+        identical = outputs["recursive"] == outputs["iterative"]
+    return {"case": name, "stage": stage,
+            "recursive": None if failed else timings["recursive"],
+            "iterative": timings["iterative"],
+            "identical": None if failed else identical}
+
+def print_tree_report(results):
+    print("\n=================== 评论树解析对比结果 ===================")
+    print(f"{'用例':<20}{'阶段':<12}{'递归(s)':>14}{'显式栈(s)':>12}{'加速比':>8}{'结果一致':>10}")
+    for r in results:
+        if r["recursive"] is None:
+            recursive, speedup, identical = "超出递归深度", "-", "-"
+        else:
+            recursive = f"{r['recursive']:.3f}"
+            speedup = f"{r['recursive'] / max(r['iterative'], 1e-9):.2f}"
+            identical = "是" if r["identical"] else "否"
+        print(f"{r['case']:<20}{r['stage']:<12}{recursive:>14}{r['iterative']:>12.3f}{speedup:>8}{identical:>10}")
+
+# =================== 数据文件格式对比 ===================
+
+def synthetic_article(n, comments=STORAGE_COMMENTS, depth=3):
+    """
+    合成一篇与 Rdata 保存的结构相同的文章：几段带格式的正文，
+    comments 条评论，每 depth+1 条为一组，组内依次回复上一条
+    """
+    base_url = "https://andylee.pro/wp/"
+    article_url = f"{base_url}?p={n}"
+    article_time = f"2025年01月{n % 28 + 1:02d}日 {n % 24:02d}:{n % 60:02d}"
+    paragraph = (f"<p>第 {n} 篇文章的正文段落，包含<strong>加粗</strong>、<a href=\"{base_url}?p={n - 1}\">链接</a>"
+                 f"和一些较长的中文内容，用来模拟真实文章的篇幅与标记密度。</p>\n")
+    top = []
+    parent = None
+    for i in range(comments):
+        level = i % (depth + 1)
+        comment = {
+            "id": Extract.generate_unique_id(article_url, i),
+            "author": f"读者{i % 7}",
+            "time": article_time,
+            "epoch": Timestamps.display_to_epoch(article_time),
+            "content": f"<p>第 {i + 1} 条评论，回复内容较短，偶尔引用<em>原文</em>。</p>",
+            "level": level,
+            "highlight": i % 11 == 0,
+            "children": []
+        }
+        if level == 0:
+            top.append(comment)
+        else:
+            parent["children"].append(comment)
+        parent = comment
+    return {
+        "article_url": article_url,
+        "title": f"文章 {n}",
+        "content": paragraph * 8,
+        "article_time": article_time,
+        "article_epoch": Timestamps.display_to_epoch(article_time),
+        "comments": top,
+        "timestamp": 1738200000.0 + n,
+    }
+
+def benchmark_storage(articles=STORAGE_ARTICLES, comments=STORAGE_COMMENTS, repeat=3):
+    """
+    在合成的 articles 篇文章上对比 DataCodec 各数据文件格式：写出全部文件、读回全部文件的耗时和磁盘占用，
+    并检查读回的数据与原数据完全一致。"pretty" 即原来的 json.dump(indent=2) / json.load。
+    所有格式都写完后再依次读取，读取重复 repeat 次取最短耗时，减少刚写入的文件回写磁盘对读取的干扰。
+    返回结果列表 {格式, 文章数, 写入耗时, 读取耗时, 字节数, 是否一致}。
+    """
+    data = [synthetic_article(n, comments=comments) for n in range(1, articles + 1)]
+    folder = tempfile.mkdtemp(prefix="bench_storage_")
+    results = []
+    try:
+        for fmt in DataCodec.available_formats():
+            fmt_dir = os.path.join(folder, fmt)
+            os.makedirs(fmt_dir)
+            paths = [os.path.join(fmt_dir, f"{n}.json") for n in range(len(data))]
+            start = time.perf_counter()
+            for path, article in zip(paths, data):
+                DataCodec.dump_file(path, article, fmt)
+            results.append({"format": fmt, "articles": len(data), "write": time.perf_counter() - start,
+                            "bytes": sum(os.path.getsize(path) for path in paths), "paths": paths})
+        for r in results:
+            r["read"] = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                loaded = [DataCodec.load_file(path) for path in r["paths"]]
+                elapsed = time.perf_counter() - start
+                r["read"] = elapsed if r["read"] is None else min(r["read"], elapsed)
+            r["identical"] = loaded == data
+            del r["paths"]
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+def print_storage_report(results):
+    print("\n=================== 数据文件格式对比结果 ===================")
+    print(f"{'格式':<10}{'文章数':>8}{'写入(s)':>10}{'读取(s)':>10}{'磁盘(MB)':>10}{'体积比':>8}{'结果一致':>10}")
+    base = results[0]["bytes"] if results else 0
+    for r in results:
+        print(f"{r['format']:<10}{r['articles']:>8}{r['write']:>10.2f}{r['read']:>10.2f}{r['bytes'] / 1024 / 1024:>10.1f}"
+              f"{r['bytes'] / max(base, 1):>8.2f}{'是' if r['identical'] else '否':>10}")
+
+def print_report(results):
+    print("\n=================== 性能测试结果 ===================")
+    print(f"{'阶段':<24}{'请求数':>8}{'错误':>6}{'文章数':>8}{'耗时(s)':>10}{'请求/s':>10}{'文章/s':>10}")
+    for r in results:
+        seconds = max(r["seconds"], 1e-9)
+        print(f"{r['phase']:<24}{r['requests']:>8}{r['errors']:>6}{r['articles']:>8}{r['seconds']:>10.2f}"
+              f"{r['requests'] / seconds:>10.1f}{r['articles'] / seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="在本地替身站点上运行 CrawlAll 和 Rdata 的端到端性能测试")
+    parser.add_argument("--articles", type=int, default=StandIn.ARTICLES, help="文章总数")
+    parser.add_argument("--comments", type=int, default=StandIn.COMMENTS_PER_ARTICLE, help="每篇文章的评论数")
+    parser.add_argument("--depth", type=int, default=StandIn.THREAD_DEPTH, help="回复的最大层级")
+    parser.add_argument("--latency", type=float, default=StandIn.LATENCY, help="每个请求注入的延迟秒数")
+    parser.add_argument("--error-rate", type=float, default=StandIn.ERROR_RATE, help="随机返回 503 的请求比例")
+    parser.add_argument("--new-articles", type=int, default=3, help="增量更新前新增的文章数")
+    parser.add_argument("--new-comments", type=int, default=20, help="增量更新前新增的评论数")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="全量爬取使用 asyncio 并发模式")
+    parser.add_argument("--pipeline", action="store_true", help="全量爬取使用流水线模式（多进程解析）")
+    parser.add_argument("--polite", action="store_true", help="保持默认的主机限速（与线上相同）")
+    parser.add_argument("--work-dir", default=None, help="保留输出数据的目录，默认使用临时目录并在结束后删除")
+    parser.add_argument("--parsers", action="store_true", help="不运行爬取，改为在原始网页存档上对比各解析器")
+    parser.add_argument("--archive-dir", default=HtmlArchive.ARCHIVE_DIR, help="解析器对比使用的原始网页存档目录")
+    parser.add_argument("--repeat", type=int, default=3, help="解析器对比时每种方式重复解析的次数（数据文件格式对比时为读取次数）")
+    parser.add_argument("--comment-trees", action="store_true", help="不运行爬取，改为对比递归与显式栈的评论树解析")
+    parser.add_argument("--storage", action="store_true", help="不运行爬取，改为在合成文章上对比数据文件格式")
+    parser.add_argument("--storage-articles", type=int, default=STORAGE_ARTICLES, help="数据文件格式对比使用的文章数")
+    args = parser.parse_args()
+    if args.parsers:
+        print_parser_report(benchmark_parsers(args.archive_dir, repeat=args.repeat))
+    elif args.comment_trees:
+        print_tree_report(benchmark_comment_trees(repeat=args.repeat))
+    elif args.storage:
+        print_storage_report(benchmark_storage(articles=args.storage_articles, repeat=args.repeat))
+    else:
+        print_report(run_benchmark(articles=args.articles, comments=args.comments, depth=args.depth,
+                                   latency=args.latency, error_rate=args.error_rate,
+                                   new_articles=args.new_articles, new_comments=args.new_comments,
+                                   use_async=args.use_async, pipeline=args.pipeline, polite=args.polite,
+                                   work_dir=args.work_dir))
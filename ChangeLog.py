@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import hashlib
+import difflib
+import threading
+import Extract  # 评论 id 的生成规则
+
+# =================== 配置项 ===================
+CHANGES_DIR = "changes"             # 变更日志目录（位于数据目录下）
+HISTORY_DIR = "history"             # 压缩后的日志段移到这里保留为历史记录
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024  # 单个日志段的大小上限，超过后写入新的日志段
+KEEP_HISTORY = True                 # 压缩后保留日志段作为历史；为 False 时直接删除
+SEGMENT_PREFIX = "changes-"
+SEGMENT_SUFFIX = ".jsonl"
+
+# =================== 评论增量 ===================
+# 评论树按先序展开为 [(评论字段（不含 children）, 层级)]，增量记录为对这个列表的插入、删除和替换，
+# 只包含有变化的评论。评论 id 由文章 URL 和先序序号生成，应用增量后统一重新计算。
+
+def flatten_comments(comments):
+    flat = []
+    stack = [(comment, 0) for comment in reversed(comments or [])]
+    while stack:
+        comment, depth = stack.pop()
+        flat.append(({key: value for key, value in comment.items() if key != "children"}, depth))
+        for child in reversed(comment.get("children", [])):
+            stack.append((child, depth + 1))
+    return flat
+
+def build_comments(flat, article_url):
+    """
+    由先序展开的列表重建嵌套评论，并按先序序号重新生成评论 id
+    """
+    roots = []
+    path = []   # 当前路径上每一层的评论
+    for index, (fields, depth) in enumerate(flat):
+        comment = dict(fields)
+        if "id" in comment:
+            comment["id"] = Extract.generate_unique_id(article_url, index)
+        comment["children"] = []
+        del path[depth:]
+        if depth == 0:
+            roots.append(comment)
+        else:
+            path[depth - 1]["children"].append(comment)
+        path.append(comment)
+    return roots
+
+def _comment_key(item):
+    fields, depth = item
+    return json.dumps([{key: value for key, value in fields.items() if key != "id"}, depth], ensure_ascii=False)
+
+def digest(article):
+    """
+    文章数据（保存到文件的形式）的摘要，字段顺序不同摘要也不同
+    """
+    return hashlib.md5(json.dumps(article, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def apply_record(article, record):
+    """
+    把一条变更记录应用到文章数据上（原地修改）
+    """
+    if "full" in record:
+        article.clear()
+        article.update(record["full"])
+        return
+    for key, value in record["fields"].items():
+        article[key] = value
+    if record["comments"]:
+        flat = flatten_comments(article.get("comments"))
+        for op in reversed(record["comments"]):
+            flat[op["at"]:op["end"]] = [(fields, depth) for fields, depth in op["new"]]
+        article["comments"] = build_comments(flat, article["article_url"])
+
+def apply_records(article, records):
+    """
+    在文章数据上依次应用记录（原地修改），从最后一条已包含在数据中的记录之后开始，
+    前后摘要对不上的记录跳过并提示。返回是否有改动。
+    """
+    current = digest(article)
+    start = 0
+    for i, record in enumerate(records):
+        if record["after"] == current:
+            start = i + 1
+    changed = False
+    for record in records[start:]:
+        if record["before"] != current:
+            print(f"❌ 变更记录与文章数据不符，已跳过：{article.get('article_url', record.get('key'))}")
+            continue
+        apply_record(article, record)
+        current = record["after"]
+        changed = True
+    return changed
+
+def make_record(old, new):
+    """
+    比较文章的当前数据 old 和新数据 new（都为保存到文件的形式），返回变更记录，没有变化返回 None。
+    记录只包含变化的字段和评论（连同被替换的旧值，作为历史）；
+    增量无法准确还原 new 时（例如删除了字段、评论 id 不是按先序序号生成的），记录整篇文章。
+    """
+    before, after = digest(old), digest(new)
+    if before == after:
+        return None
+    record = {"time": time.time(), "before": before, "after": after, "fields": {}, "old_fields": {}, "comments": []}
+    if set(old) - set(new):
+        record["full"] = new
+        return record
+    for key, value in new.items():
+        if key != "comments" and (key not in old or old[key] != value):
+            record["fields"][key] = value
+            record["old_fields"][key] = old.get(key)
+    old_flat = flatten_comments(old.get("comments"))
+    new_flat = flatten_comments(new.get("comments"))
+    matcher = difflib.SequenceMatcher(None, [_comment_key(item) for item in old_flat],
+                                      [_comment_key(item) for item in new_flat], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            record["comments"].append({"op": tag, "at": i1, "end": i2,
+                                       "new": new_flat[j1:j2], "old": old_flat[i1:i2]})
+    check = dict(old)
+    try:
+        apply_record(check, record)
+        exact = digest(check) == after
+    except (IndexError, KeyError):
+        exact = False
+    if not exact:
+        record = {"time": record["time"], "before": before, "after": after, "full": new}
+    return record
+
+# =================== 变更日志 ===================
+
+class ChangeLog:
+    """
+    追加式变更日志：每次保存一篇已有文章只追加一行记录（变化的字段和评论），不重写整篇文章文件；
+    读取文章时在文件内容上依次应用尚未压缩的记录。每条记录带有应用前后的摘要，
+    已应用过或与当前数据不符的记录会被跳过，压缩中断后重新读取或重新压缩都不会重复应用。
+    日志段按大小滚动，压缩（见 ArticleStore.compact）把记录写回文章文件后移入 history/ 保留为历史。
+    """
+
+    def __init__(self, data_dir):
+        self.changes_dir = os.path.join(data_dir, CHANGES_DIR)
+        self.history_dir = os.path.join(self.changes_dir, HISTORY_DIR)
+        self._lock = threading.Lock()
+        self._pending = None    # {文章键: [记录]}，第一次使用时读取
+
+    def segments(self, folder=None):
+        folder = folder or self.changes_dir
+        if not os.path.isdir(folder):
+            return []
+        return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+                if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)]
+
+    @staticmethod
+    def read_segments(paths):
+        """
+        依次读取日志段中的记录；压缩时已移走的日志段和写入中断留下的半行忽略
+        """
+        records = []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except FileNotFoundError:
+                continue
+        return records
+
+    def pending(self):
+        """
+        尚未压缩的记录 {文章键: [记录]}，按写入顺序排列
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = {}
+                for record in self.read_segments(self.segments()):
+                    self._pending.setdefault(record["key"], []).append(record)
+            return self._pending
+
+    def pending_bytes(self):
+        return sum(os.path.getsize(path) for path in self.segments() if os.path.exists(path))
+
+    def append(self, key, record):
+        """
+        追加一条记录（一行 JSON），当前日志段超过 SEGMENT_MAX_BYTES 时写入新的日志段
+        """
+        record = dict(record, key=key)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self.pending()
+        with self._lock:
+            os.makedirs(self.changes_dir, exist_ok=True)
+            segments = self.segments()
+            if not segments or os.path.getsize(segments[-1]) >= SEGMENT_MAX_BYTES:
+                number = int(os.path.basename(segments[-1])[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1 if segments else 1
+                path = os.path.join(self.changes_dir, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+            else:
+                path = segments[-1]
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._pending.setdefault(key, []).append(record)
+
+    def apply(self, key, article):
+        """
+        在文章数据上应用该文章尚未压缩的记录（原地修改，见 apply_records），返回文章数据
+        """
+        records = self.pending().get(key)
+        if records:
+            apply_records(article, records)
+        return article
+
+    def take_segments(self):
+        """
+        压缩开始时取出当前所有日志段和其中的记录，之后追加的记录写入新的日志段，留到下次压缩
+        """
+        with self._lock:
+            segments = self.segments()
+            if segments:
+                os.makedirs(self.changes_dir, exist_ok=True)
+                number = int(os.path.basename(segments[-1])[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1
+                # 先创建新的空日志段，压缩期间的写入不会进入正在压缩的日志段
+                open(os.path.join(self.changes_dir, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"), "a").close()
+        records = {}
+        for record in self.read_segments(segments):
+            records.setdefault(record["key"], []).append(record)
+        return segments, records
+
+    def retire_segments(self, segments):
+        """
+        压缩完成后把日志段移入历史目录（KEEP_HISTORY 为 False 时删除），并清除内存中的待应用记录
+        """
+        with self._lock:
+            if KEEP_HISTORY:
+                os.makedirs(self.history_dir, exist_ok=True)
+            for path in segments:
+                if KEEP_HISTORY:
+                    os.replace(path, os.path.join(self.history_dir, os.path.basename(path)))
+                else:
+                    os.remove(path)
+            self._pending = None
+
+    def history(self, key):
+        """
+        一篇文章的全部变更记录（含已压缩的历史），按时间先后排列
+        """
+        records = self.read_segments(self.segments(self.history_dir) + self.segments())
+        return [record for record in records if record["key"] == key]
+
+
+def describe(record):
+    """
+    一条记录的摘要，例如 "新增 2 条评论，修改 1 条评论，字段 timestamp"
+    """
+    if "full" in record:
+        return "整篇文章"
+    parts = []
+    added = sum(len(op["new"]) - len(op["old"]) for op in record["comments"] if len(op["new"]) > len(op["old"]))
+    removed = sum(len(op["old"]) - len(op["new"]) for op in record["comments"] if len(op["old"]) > len(op["new"]))
+    edited = sum(min(len(op["old"]), len(op["new"])) for op in record["comments"])
+    if added:
+        parts.append(f"新增 {added} 条评论")
+    if edited:
+        parts.append(f"修改 {edited} 条评论")
+    if removed:
+        parts.append(f"删除 {removed} 条评论")
+    if record["fields"]:
+        parts.append("字段 " + ", ".join(record["fields"]))
+    return "，".join(parts) or "无变化"
+
+def main():
+    if len(sys.argv) < 2:
+        print("用法：python ChangeLog.py <文章URL> [数据目录]")
+        return
+    article_url = sys.argv[1]
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else "data"
+    key = hashlib.md5(article_url.encode("utf-8")).hexdigest()  # 与 ArticleStore.article_key 相同
+    records = ChangeLog(data_dir).history(key)
+    if not records:
+        print(f"📌 没有 {article_url} 的变更记录")
+        return
+    for record in records:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['time']))}  {describe(record)}")
+
+if __name__ == "__main__":
+    main()
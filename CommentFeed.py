@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import email.utils
+import urllib.parse
+import xml.etree.ElementTree as ET
+import Http
+
+# =================== 配置项 ===================
+MAX_FEED_PAGES = 20         # 单次最多向前翻多少页评论 feed（每页通常 10 条）
+# 评论 feed 条目标题的常见格式，用于取出文章标题
+TITLE_PATTERNS = [
+    re.compile(r"^Comment on (?P<title>.+) by (?P<author>.+)$", re.S),
+    re.compile(r"^(?P<author>.+)对《(?P<title>.+)》的评论$", re.S),
+    re.compile(r"^(?P<author>.+)在《(?P<title>.+)》上的评论$", re.S),
+]
+
+# =================== 评论 feed 解析 ===================
+
+def feed_url(base_url, page=1):
+    """
+    评论 RSS 地址，例如 https://andylee.pro/wp/?feed=comments-rss2&paged=2
+    """
+    url = f"{base_url}?feed=comments-rss2"
+    if page > 1:
+        url += f"&paged={page}"
+    return url
+
+def article_url_from_link(link):
+    """
+    评论链接形如 ?p=123&cpage=2#comment-456，去掉锚点和评论分页参数得到文章链接
+    """
+    parts = urllib.parse.urlsplit(link)
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True) if k != "cpage"]
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, urllib.parse.urlencode(query), ""))
+
+def article_title_from_item(title):
+    """
+    从 "Comment on 标题 by 作者" 等格式中取出文章标题，不认识的格式原样返回
+    """
+    for pattern in TITLE_PATTERNS:
+        m = pattern.match(title.strip())
+        if m:
+            return m.group("title").strip()
+    return title.strip()
+
+def parse_feed(xml_bytes):
+    """
+    解析评论 RSS，返回条目列表（按 feed 顺序，即最新在前），
+    每个条目为 {guid, date, link, article_url, title}
+    """
+    root = ET.fromstring(xml_bytes)
+    items = []
+    for item in root.iter("item"):
+        link = (item.findtext("link") or "").strip()
+        guid = (item.findtext("guid") or link).strip()
+        pub_date = item.findtext("pubDate")
+        try:
+            date = email.utils.parsedate_to_datetime(pub_date).isoformat() if pub_date else ""
+        except (TypeError, ValueError):
+            date = ""
+        items.append({
+            "guid": guid,
+            "date": date,
+            "link": link,
+            "article_url": article_url_from_link(link),
+            "title": article_title_from_item(item.findtext("title") or ""),
+        })
+    return items
+
+def fetch_feed_page(base_url, page=1):
+    """
+    请求并解析一页评论 feed，页码超出范围（404 或没有条目）返回 []，请求出错返回 None
+    """
+    try:
+        response = Http.get(feed_url(base_url, page))
+    except Exception as e:
+        print(f"❌ 获取评论 feed 第 {page} 页出错：{e}")
+        return None
+    if response.status_code == 404:
+        return []
+    if response.status_code != 200:
+        print(f"❌ 获取评论 feed 第 {page} 页失败，状态码: {response.status_code}")
+        return None
+    try:
+        return parse_feed(response.content)
+    except ET.ParseError as e:
+        print(f"❌ 评论 feed 第 {page} 页不是有效的 RSS：{e}")
+        return None
+
+# =================== 高水位标记 ===================
+
+def load_state(state_file):
+    """
+    读取上次处理到的评论位置 {guid, date}，没有记录返回 None
+    """
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"❌ 读取评论 feed 记录失败: {e}")
+        return None
+
+def save_state(state_file, state):
+    """
+    保存最新处理到的评论位置，应在对应文章全部刷新成功后再调用
+    """
+    folder = os.path.dirname(state_file)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+
+def detect_changed_articles(base_url, state_file):
+    """
+    从评论 feed 中找出上次记录之后有新评论的文章。
+    返回 (标题->链接 字典, 新的高水位标记)；feed 不可用时返回 None（调用方退回到近期评论小工具）。
+    首次运行没有记录时只处理第一页 feed。
+    只有翻到上次记录的位置（或 feed 的末尾）时才推进高水位标记；中途请求失败或翻满 MAX_FEED_PAGES 页时
+    仍返回已读到的文章，但标记保持不变，未读到的评论留到下次运行。
+    """
+    state = load_state(state_file)
+    new_items = []
+    reached_mark = False
+    page = 1
+    while page <= MAX_FEED_PAGES:
+        items = fetch_feed_page(base_url, page)
+        if items is None:
+            if page == 1:
+                return None
+            break
+        if not items:
+            reached_mark = True     # 已翻到 feed 末尾，所有评论都已读到
+            break
+        for item in items:
+            if state and (item["guid"] == state.get("guid") or
+                          (item["date"] and state.get("date") and item["date"] < state["date"])):
+                reached_mark = True
+                break
+            new_items.append(item)
+        if reached_mark or state is None:
+            break
+        page += 1
+    if state and not reached_mark:
+        if page > MAX_FEED_PAGES:
+            print(f"❌ 翻阅 {MAX_FEED_PAGES} 页评论 feed 仍未到达上次记录的位置，部分文章可能需要全量更新")
+        else:
+            print(f"❌ 评论 feed 第 {page} 页获取失败，未到达上次记录的位置")
+
+    title_to_url = {}
+    for item in new_items:
+        if item["article_url"] not in title_to_url.values():
+            title_to_url.setdefault(item["title"], item["article_url"])
+    new_state = state
+    if new_items and (state is None or reached_mark):
+        new_state = {"guid": new_items[0]["guid"], "date": new_items[0]["date"]}
+    print(f"✅ 评论 feed 中有 {len(new_items)} 条新评论，涉及 {len(title_to_url)} 篇文章")
+    return title_to_url, new_state
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import codecs
+import tempfile
+import html.parser
+from bs4 import BeautifulSoup
+
+# =================== 配置项 ===================
+CHUNK_SIZE = 64 * 1024      # 流式读取时每次读取的字节数
+# 没有结束标签的元素，不入栈
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+
+# =================== 增量切分评论列表 ===================
+
+class CommentSplitter(html.parser.HTMLParser):
+    """
+    边接收页面文本边切分评论：
+    - ol.commentlist 之前的内容原样保存在 prefix 中（标题、发布时间、正文都在这里）；
+    - 评论列表中每个 li.comment 只保留它自身的部分（到 ul.children 开始或 li 结束为止），
+      按先序放入 ready，元素为 (片段 HTML, 层级)；
+    - 评论列表结束后的内容直接丢弃。
+    内存中只保留当前这一条评论的片段和打开的标签栈，与评论总数无关。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.prefix = []
+        self.list_started = False
+        self.list_done = False
+        self.ready = []
+        self._stack = []        # 评论列表内打开的标签 [标签名, 角色, 是否已有回复列表]
+        self._capture = None    # 当前评论自身部分 (片段列表, 层级)
+
+    def pop_ready(self):
+        ready, self.ready = self.ready, []
+        return ready
+
+    def _emit(self):
+        parts, level = self._capture
+        self.ready.append(("".join(parts), level))
+        self._capture = None
+
+    def _text(self, text):
+        if not self.list_started:
+            self.prefix.append(text)
+        elif self._capture is not None and not self.list_done:
+            self._capture[0].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        raw = self.get_starttag_text()
+        if self.list_done:
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if not self.list_started:
+            if tag == "ol" and "commentlist" in classes:
+                self.list_started = True
+                self._stack = [[tag, "list", False]]
+            else:
+                self.prefix.append(raw)
+            return
+        parent = self._stack[-1] if self._stack else None
+        role = "other"
+        if tag == "li" and "comment" in classes and parent and parent[1] in ("list", "children"):
+            level = sum(1 for entry in self._stack if entry[1] == "comment")
+            self._capture = ([raw], level)
+            role = "comment"
+        elif tag == "ul" and "children" in classes and parent and parent[1] == "comment" and not parent[2]:
+            # 回复列表开始，当前评论自身的部分到此结束
+            parent[2] = True
+            if self._capture is not None:
+                self._emit()
+            role = "children"
+        elif self._capture is not None:
+            self._capture[0].append(raw)
+        if tag not in VOID_TAGS:
+            self._stack.append([tag, role, False])
+
+    def handle_startendtag(self, tag, attrs):
+        self._text(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if self.list_done:
+            return
+        if not self.list_started:
+            self.prefix.append(f"</{tag}>")
+            return
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            # 没有对应开始标签的结束标签
+            self._text(f"</{tag}>")
+            return
+        if self._capture is not None:
+            self._capture[0].append(f"</{tag}>")
+        for _, role, _ in reversed(self._stack[i:]):
+            if role == "comment" and self._capture is not None:
+                self._emit()
+            elif role == "list":
+                self.list_done = True
+        del self._stack[i:]
+
+    def handle_data(self, data):
+        self._text(data)
+
+    def handle_entityref(self, name):
+        self._text(f"&{name};")
+
+    def handle_charref(self, name):
+        self._text(f"&#{name};")
+
+    def handle_comment(self, data):
+        self._text(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._text(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._text(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._text(f"<![{data}]>")
+
+
+def stream_article(chunks, article_url, parse_comment, selected_color="white", encoding="utf-8"):
+    """
+    边读边解析文章页面：chunks 为字节块的迭代器（例如 response.iter_content()），
+    parse_comment 为 Extract.parse_comment 这样的函数。
+    先产出一次 ("prefix", 评论列表之前的页面 HTML)，之后按先序逐条产出 ("comment", 评论字典)，
+    字典与 parse_comment 的结果相同，但 children 为空，层级见 level。
+    解析失败的评论（parse_comment 返回 None）与递归解析时一样连同其回复一起跳过。
+    每条评论只在它自身的部分中查找作者、时间和内容；在完整解析树上 find() 时，
+    缺少这些元素的评论会取到回复中的元素，流式解析则直接跳过这样的评论。
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    splitter = CommentSplitter()
+    prefix_sent = False
+    index = 0
+    skip_level = None
+    for chunk in _with_final(chunks):
+        if chunk is None:
+            splitter.feed(decoder.decode(b"", final=True))
+            splitter.close()
+        else:
+            splitter.feed(decoder.decode(chunk))
+        if not prefix_sent and (splitter.list_started or chunk is None):
+            prefix_sent = True
+            yield "prefix", "".join(splitter.prefix)
+            splitter.prefix = []
+        for fragment, level in splitter.pop_ready():
+            if skip_level is not None and level > skip_level:
+                continue
+            skip_level = None
+            li = BeautifulSoup(fragment, "html.parser").find("li")
+            data, index = parse_comment(li, article_url, level, selected_color, index)
+            if data is None:
+                skip_level = level
+                continue
+            yield "comment", data
+        if splitter.list_done:
+            break
+
+def _with_final(chunks):
+    """
+    在字节块之后追加一个 None，表示输入结束
+    """
+    yield from chunks
+    yield None
+
+# =================== 流式写出 JSON ===================
+
+def _dumps(value, indent):
+    """
+    按 json.dump(indent=2) 的格式序列化一个值，indent 为所在行的缩进
+    """
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + " " * indent)
+
+def write_comments(f, comments, indent):
+    """
+    把按先序产出的评论（children 为空，层级见 level）写成嵌套的 JSON 数组，
+    格式与 json.dump(indent=2) 完全相同；indent 为 "comments" 键所在行的缩进
+    """
+    def item_indent(level):
+        return indent + 2 + 4 * level
+
+    def open_comment(comment):
+        pad = " " * item_indent(comment["level"])
+        f.write(pad + "{\n")
+        for key, value in comment.items():
+            if key != "children":
+                f.write(f'{pad}  {json.dumps(key)}: {_dumps(value, len(pad) + 2)},\n')
+        f.write(f'{pad}  "children": ')
+
+    def close_to(level, prev_level):
+        # 上一条评论没有回复
+        f.write("[]\n" + " " * item_indent(prev_level) + "}")
+        for open_level in range(prev_level - 1, level - 1, -1):
+            pad = " " * item_indent(open_level)
+            f.write(f"\n{pad}  ]\n{pad}}}")
+
+    prev_level = None
+    for comment in comments:
+        level = comment["level"]
+        if prev_level is None:
+            f.write("[\n")
+        elif level == prev_level + 1:
+            f.write("[\n")
+        elif level <= prev_level:
+            close_to(level, prev_level)
+            f.write(",\n")
+        else:
+            raise ValueError(f"评论层级不连续：{prev_level} -> {level}")
+        open_comment(comment)
+        prev_level = level
+    if prev_level is None:
+        f.write("[]")
+        return
+    close_to(0, prev_level)
+    f.write("\n" + " " * indent + "]")
+
+def write_article_json(filename, head, comments, tail):
+    """
+    流式写出文章 JSON，结果与 json.dump({**head, "comments": [...], **tail}, ensure_ascii=False, indent=2) 相同。
+    comments 为按先序产出的评论，写完一条即可释放。先写临时文件再替换，中途出错不会留下不完整的文件。
+    """
+    # 写入同目录下名字唯一的临时文件，多个写入者之间不会互相覆盖或删除
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(filename) or ".",
+                                    prefix=os.path.basename(filename) + ".", suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write("{")
+            for key, value in head.items():
+                f.write(f"\n  {json.dumps(key)}: {_dumps(value, 2)},")
+            f.write('\n  "comments": ')
+            write_comments(f, comments, 2)
+            for key, value in tail.items():
+                f.write(f",\n  {json.dumps(key)}: {_dumps(value, 2)}")
+            f.write("\n}")
+        os.replace(f.name, filename)
+    except BaseException:
+        if os.path.exists(f.name):
+            os.remove(f.name)
+        raise
@@ -1,336 +1,670 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import hashlib
-import re
-import json
-import os
-import datetime  # 新增，用于解析发布时间
-
-BASE_URL = "https://andylee.pro/wp/"
-# 固定页面（如关于页面）不参与翻页爬取
-PAGE_URLS = [
-    "https://andylee.pro/wp/?page_id=11",
-    "https://andylee.pro/wp/?page_id=18",
-    "https://andylee.pro/wp/?page_id=1230",
-    "https://andylee.pro/wp/?page_id=2115",
-]
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-}
-TARGET_USERS = ["李宗恩", "andy"]
-
-# 进度文件，用于记录当前页码和页内文章序号（均从1开始）
-PROGRESS_FILE = "progress.txt"
-
-
-def fetch_url(url, headers=HEADERS, timeout=10, max_retries=10):
-    """
-    尝试获取 URL 内容，如果失败则重试 max_retries 次。
-    成功返回 response 对象，失败返回 None。
-    """
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.get(url, headers=headers, timeout=timeout)
-            if response.status_code == 200:
-                return response
-            else:
-                print(f"❌ 尝试 {attempt} 次: 获取 {url} 失败，状态码: {response.status_code}")
-        except Exception as e:
-            print(f"❌ 尝试 {attempt} 次: 请求 {url} 出错: {e}")
-        time.sleep(2)  # 等待2秒后重试
-    print(f"❌ 已尝试 {max_retries} 次，仍无法获取 {url}")
-    return None
-
-
-def get_last_progress():
-    """
-    返回上次成功爬取的进度，格式为 (page, order)。
-    如果文件不存在或格式错误，则默认返回 (1, 1)。
-    """
-    if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            try:
-                progress = json.load(f)
-                page = progress.get("page", 1)
-                order = progress.get("order", 1)
-                return page, order
-            except Exception as e:
-                print(f"❌ 读取进度文件失败: {e}")
-                return 1, 1
-    return 1, 1
-
-
-def save_progress(page, order):
-    """
-    保存当前爬取进度，page 表示当前页码，
-    order 表示当前页下一篇需要爬取的文章序号（1-indexed）。
-    """
-    progress = {"page": page, "order": order}
-    with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-        json.dump(progress, f)
-
-
-def get_article_links(page=1):
-    """
-    获取指定页码的所有文章链接
-    """
-    url = f"{BASE_URL}?paged={page}"
-    response = fetch_url(url)
-    if not response:
-        return []
-    soup = BeautifulSoup(response.text, "html.parser")
-    articles = soup.find_all("h2", class_="entry-title")
-    links = [article.a["href"] for article in articles if article.a]
-    return links
-
-
-def get_article_title(article_url):
-    """
-    获取文章标题
-    """
-    response = fetch_url(article_url)
-    if not response:
-        return "未知标题"
-    soup = BeautifulSoup(response.text, "html.parser")
-    title_tag = soup.find("h1", class_="post-title entry-title")
-    return title_tag.text.strip() if title_tag else "未知标题"
-
-
-def get_article_content(article_url):
-    """
-    获取文章正文内容
-    """
-    response = fetch_url(article_url)
-    if not response:
-        return "未知内容"
-    soup = BeautifulSoup(response.text, "html.parser")
-    content_tag = soup.find("div", class_="entry-content")
-    if content_tag:
-        # 使用 decode_contents() 保留内部 HTML 格式
-        return content_tag.decode_contents().strip()
-    return "未知内容"
-
-
-def get_article_time(article_url):
-    """
-    获取文章发布时间，格式为 "YYYY年MM月DD日 HH:MM"
-    """
-    response = fetch_url(article_url)
-    if not response:
-        return ""
-    soup = BeautifulSoup(response.text, "html.parser")
-    time_span = soup.find("span", class_="entry-date post-date")
-    if time_span:
-        abbr_tag = time_span.find("abbr", class_="published")
-        if abbr_tag and abbr_tag.has_attr("title"):
-            iso_time = abbr_tag["title"]  # 例如 "2025-01-29T16:49:00-08:00"
-            try:
-                dt = datetime.datetime.fromisoformat(iso_time)
-                formatted_time = dt.strftime("%Y年%m月%d日 %H:%M")
-                return formatted_time
-            except Exception as e:
-                print("❌ 解析发布时间错误:", e)
-                return abbr_tag.text.strip()
-        else:
-            return time_span.get_text(strip=True)
-    return ""
-
-
-def get_page_title(page_url):
-    """
-    获取固定页面的标题
-    """
-    response = fetch_url(page_url)
-    if not response:
-        return "未知标题"
-    soup = BeautifulSoup(response.text, "html.parser")
-    title_tag = soup.find("h1")
-    return title_tag.text.strip() if title_tag else "未知标题"
-
-
-def generate_unique_id(article_url, index):
-    """
-    生成唯一的ID，结合文章URL和评论索引
-    """
-    return hashlib.md5(f"{article_url}-{index}".encode('utf-8')).hexdigest()
-
-
-def parse_comment(comment, article_url, level=0, selected_color="white", index=0):
-    """
-    解析评论及其子评论，并返回数据字典和最新的索引值
-    """
-    author_tag = comment.find("cite", class_="fn")
-    if not author_tag:
-        return None, index
-    comment_user = author_tag.text.strip()
-
-    time_tag = comment.find("small")
-    if time_tag:
-        raw_time = time_tag.get_text(strip=True)
-        match = re.search(r'(\d+)\s*(\d+)\s*月,\s*(\d{4})\s+at\s+(\d+):(\d+)\s*(上午|下午)', raw_time)
-        if match:
-            day = int(match.group(1))
-            month = int(match.group(2))
-            year = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            period = match.group(6)
-            if period == "下午" and hour < 12:
-                hour += 12
-            time_text = f"{year}年{month:02d}月{day:02d}日 {hour:02d}:{minute:02d}"
-        else:
-            time_text = raw_time
-    else:
-        time_text = ""
-
-    comment_text_tag = comment.find("div", class_="comment_text")
-    if not comment_text_tag:
-        return None, index
-
-    # 删除评论中的回复按钮标签
-    for reply in comment_text_tag.find_all("div", class_="reply"):
-        reply.decompose()
-    comment_text = comment_text_tag.decode_contents().strip()
-
-    highlight = (comment_user in TARGET_USERS)
-    current_index = index
-    comment_id = generate_unique_id(article_url, current_index)
-    index = current_index + 1
-
-    datatest = {
-        "id": comment_id,
-        "author": comment_user,
-        "time": time_text,
-        "content": comment_text,
-        "level": level,
-        "highlight": highlight,
-        "children": []
-    }
-
-    children_container = comment.find("ul", class_="children")
-    if children_container:
-        child_comments = children_container.find_all("li", class_="comment", recursive=False)
-        for child in child_comments:
-            child_datatest, index = parse_comment(child, article_url, level + 1, selected_color, index)
-            if child_datatest:
-                datatest["children"].append(child_datatest)
-    return datatest, index
-
-
-def get_comments(article_url, selected_color="white"):
-    """
-    获取文章的所有评论及其回复，并返回评论数据（列表字典）
-    """
-    response = fetch_url(article_url)
-    if not response:
-        return []
-    soup = BeautifulSoup(response.text, "html.parser")
-    comment_list = soup.find("ol", class_="commentlist")
-    if comment_list:
-        top_comments = comment_list.find_all("li", class_="comment", recursive=False)
-    else:
-        top_comments = soup.find_all("li", class_="comment", recursive=False)
-
-    results = []
-    index = 0
-    for comment in top_comments:
-        datatest, index = parse_comment(comment, article_url, selected_color=selected_color, index=index)
-        if datatest:
-            results.append(datatest)
-    return results
-
-
-def save_to_json_file(article_url, article_title, article_content, comments_datatest, page, order):
-    """
-    将爬取的文章信息、正文、发布时间和评论数据保存为 JSON 文件到 datatest/page{page}/ 目录下
-    """
-    article_time = get_article_time(article_url)
-    out = {
-        "article_url": article_url,
-        "title": article_title,
-        "content": article_content,
-        "article_time": article_time,
-        "comments": comments_datatest,
-        "page": page,
-        "order": order
-    }
-    unique = generate_unique_id(article_url, order)
-    folder = os.path.join("datatest", f"page{page}")
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    filename = os.path.join(folder, f"page{page}_order{order}_{unique}.json")
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
-    print(f"保存《{article_title}》评论数据到 {filename}")
-
-
-def crawl():
-    """
-    爬取评论并将数据保存为 JSON 文件，每页最多处理 10 篇文章。
-    支持断点续爬，进度记录包含当前页和页内文章序号。
-    """
-    start_page, start_order = get_last_progress()
-    current_page = start_page
-    articles_per_page = 10
-
-    while True:
-        print(f"📌 正在爬取第 {current_page} 页文章...")
-        article_links = get_article_links(current_page)
-        if not article_links:
-            print("🚫 没有更多文章，停止爬取。")
-            break
-
-        # 如果当前页为断点页，则从 start_order 开始爬取，否则从第一篇开始
-        if current_page == start_page:
-            article_links = article_links[start_order - 1:]
-            initial_order = start_order
-        else:
-            initial_order = 1
-
-        for idx, link in enumerate(article_links, start=initial_order):
-            article_title = get_article_title(link)
-            article_content = get_article_content(link)
-            print(f"📌 爬取 第 {current_page} 页 第 {idx} 篇: {link} | {article_title}")
-            comments_datatest = get_comments(link)
-            save_to_json_file(link, article_title, article_content, comments_datatest, current_page, idx)
-            # 每成功处理一篇文章，更新进度记录（下一篇序号为 idx+1）
-            save_progress(current_page, idx + 1)
-            time.sleep(2)
-
-        # 当前页处理完成，重置页内文章序号，并记录进度
-        start_order = 1
-        save_progress(current_page, 1)
-        current_page += 1
-        time.sleep(3)
-
-    # 爬取固定页面（非分页页面）
-    fixed_folder = os.path.join("datatest", "fixed")
-    if not os.path.exists(fixed_folder):
-        os.makedirs(fixed_folder)
-    for page_url in PAGE_URLS:
-        print(f"📌 爬取固定页面: {page_url}")
-        page_title = get_page_title(page_url)
-        article_content = get_article_content(page_url)
-        print(f"📌 页面标题: {page_title}")
-        comments_datatest = get_comments(page_url)
-        file_id = generate_unique_id(page_url, 0)
-        article_time = get_article_time(page_url)
-        filename = os.path.join(fixed_folder, f"{file_id}.json")
-        out = {
-            "article_url": page_url,
-            "title": page_title,
-            "content": article_content,
-            "article_time": article_time,
-            "comments": comments_datatest,
-            "fixed": True
-        }
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(out, f, ensure_ascii=False, indent=2)
-        print(f"保存固定页面《{page_title}》到 {filename}")
-        time.sleep(2)
-    print("\n✅ 爬取完成，评论数据已保存到 datatest 目录中。")
-
-
-if __name__ == "__main__":
-    crawl()
+import json
+import os
+import queue
+import asyncio
+import threading
+import argparse
+import collections
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import Http  # 共享的连接池会话，请求间隔由 RateLimit 中的主机限速器控制
+import RetryPolicy
+import HtmlArchive  # 原始网页存档，用于离线回放和重新解析
+import Sitemap  # 站点地图文章发现
+import HtmlParse  # 解析器后端与区域解析
+import CommentStream  # 大评论串的流式解析与写出
+import Extract  # 与 Rdata 共用的页面字段和评论提取
+import Timestamps  # 时间戳与排序键
+import DataCodec  # 数据文件的编码格式
+
+BASE_URL = "https://andylee.pro/wp/"
+# 固定页面（如关于页面）不参与翻页爬取
+PAGE_URLS = [
+    "https://andylee.pro/wp/?page_id=11",
+    "https://andylee.pro/wp/?page_id=18",
+    "https://andylee.pro/wp/?page_id=1230",
+    "https://andylee.pro/wp/?page_id=2115",
+]
+HEADERS = Http.HEADERS  # 默认请求头与共享会话保持一致
+
+# 进度文件，用于记录当前页码和页内文章序号（均从1开始）
+PROGRESS_FILE = "progress.txt"
+
+# 并发爬取模式下，每个主机同时进行的请求数上限
+ASYNC_CONCURRENCY = 5
+
+# 重新解析存档时使用的进程数，None 表示与 CPU 核数相同
+REPARSE_WORKERS = None
+
+# 全量爬取耗时较长，整次运行的重试预算相应放宽
+RETRY_BUDGET = 2000
+
+# 站点地图模式下记录每个页面上次 lastmod 的文件
+SITEMAP_STATE_FILE = "sitemap_state.txt"
+
+# 流式模式：文章页面边下载边解析，评论逐条写入文件，内存占用与评论数量无关
+STREAM_COMMENTS = False
+
+# 流水线模式：抓取线程数、解析进程数（None 表示与 CPU 核数相同）、已下载但尚未写入的页面数上限
+PIPELINE_FETCHERS = ASYNC_CONCURRENCY
+PIPELINE_PARSE_WORKERS = None
+PIPELINE_QUEUE_SIZE = 32
+
+
+def fetch_url(url, headers=HEADERS, timeout=None, max_retries=10):
+    """
+    尝试获取 URL 内容，如果失败则按指数退避重试 max_retries 次，
+    重试同时受本次运行共享的重试预算、熔断和截止时间限制。
+    成功返回 response 对象，失败返回 None。
+    """
+    return Http.fetch(url, headers=headers, max_attempts=max_retries, timeout=timeout)
+
+
+def get_last_progress():
+    """
+    返回上次成功爬取的进度，格式为 (page, order)。
+    如果文件不存在或格式错误，则默认返回 (1, 1)。
+    """
+    if os.path.exists(PROGRESS_FILE):
+        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
+            try:
+                progress = json.load(f)
+                page = progress.get("page", 1)
+                order = progress.get("order", 1)
+                return page, order
+            except Exception as e:
+                print(f"❌ 读取进度文件失败: {e}")
+                return 1, 1
+    return 1, 1
+
+
+def save_progress(page, order):
+    """
+    保存当前爬取进度，page 表示当前页码，
+    order 表示当前页下一篇需要爬取的文章序号（1-indexed）。
+    """
+    progress = {"page": page, "order": order}
+    with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
+        json.dump(progress, f)
+
+
+def get_article_links(page=1):
+    """
+    获取指定页码的所有文章链接
+    """
+    url = f"{BASE_URL}?paged={page}"
+    response = fetch_url(url)
+    if not response:
+        return []
+    return Extract.parse_article_links(response.content, encoding=HtmlParse.response_encoding(response))
+
+
+def get_article_snapshot(article_url, fixed=False, selected_color="white"):
+    """
+    文章页面快照：只请求并解析一次页面，从同一棵解析树中同时提取
+    标题、正文、发布时间和评论。请求失败时各字段为默认值（评论为 []）。
+    """
+    response = fetch_url(article_url)
+    if not response:
+        return default_snapshot(article_url)
+    return parse_article_snapshot(response.content, article_url, fixed=fixed, selected_color=selected_color,
+                                  encoding=HtmlParse.response_encoding(response))
+
+
+def default_snapshot(article_url):
+    """
+    请求失败时使用的快照
+    """
+    return {
+        "article_url": article_url,
+        "title": "未知标题",
+        "content": "未知内容",
+        "article_time": "",
+        "comments": [],
+    }
+
+
+def fill_defaults(snapshot):
+    """
+    页面中缺失的标题、正文（Extract 返回 None）改为 default_snapshot() 中的默认值
+    """
+    defaults = default_snapshot(snapshot["article_url"])
+    for key in ("title", "content"):
+        if snapshot.get(key) is None:
+            snapshot[key] = defaults[key]
+    return snapshot
+
+
+def parse_article_snapshot(html, article_url, fixed=False, selected_color="white", encoding=None):
+    """
+    解析已获取的页面 HTML（str 或按 encoding 编码的 bytes），返回与 get_article_snapshot() 相同结构的快照（不访问网络）。
+    只解析标题、发布时间、正文和评论区域。
+    """
+    return fill_defaults(Extract.parse_article_snapshot(html, article_url, fixed=fixed, selected_color=selected_color,
+                                                        encoding=encoding))
+
+
+def save_to_json_file(article_url, article_title, article_content, comments_datatest, page, order, article_time=None):
+    """
+    将爬取的文章信息、正文、发布时间和评论数据保存为 JSON 文件到 datatest/page{page}/ 目录下
+    article_time 为 None 时才会重新请求页面获取发布时间
+    """
+    if article_time is None:
+        article_time = get_article_snapshot(article_url)["article_time"]
+    out = {
+        "article_url": article_url,
+        "title": article_title,
+        "content": article_content,
+        "article_time": article_time,
+        "article_epoch": Timestamps.display_to_epoch(article_time),
+        "comments": comments_datatest,
+        "page": page,
+        "order": order
+    }
+    filename = article_json_path(article_url, page, order)
+    DataCodec.dump_file(filename, out)
+    print(f"保存《{article_title}》评论数据到 {filename}")
+
+
+def article_json_path(article_url, page, order):
+    """
+    文章 JSON 文件的路径 datatest/page{page}/page{page}_order{order}_{unique}.json，目录不存在时创建
+    """
+    unique = Extract.generate_unique_id(article_url, order)
+    folder = os.path.join("datatest", f"page{page}")
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    return os.path.join(folder, f"page{page}_order{order}_{unique}.json")
+
+
+def stream_article_to_file(article_url, page, order, selected_color="white"):
+    """
+    流式爬取一篇文章：边下载边解析，评论逐条解析并直接写入 JSON 文件，
+    不在内存中保留整个页面的解析树和评论树，适合评论数量很多的文章。
+    写出的数据与 get_article_snapshot() + save_to_json_file() 完全相同（流式写出总是带缩进的 JSON，读取时由 DataCodec 自动识别）。
+    流式读取中途出错时改为完整请求一次。返回文章标题。
+    流式请求不经过缓存，也不写入原始网页存档。
+    """
+    response = Http.fetch(article_url, headers=HEADERS, max_attempts=10, stream=True)
+    if response is not None:
+        try:
+            events = CommentStream.stream_article(response.iter_content(chunk_size=CommentStream.CHUNK_SIZE),
+                                                  article_url, Extract.parse_comment, selected_color=selected_color,
+                                                  encoding=HtmlParse.response_encoding(response))
+            # 评论列表之前的部分很小，包含标题、发布时间和正文
+            _, prefix = next(events)
+            soup = HtmlParse.make_soup(prefix, regions=HtmlParse.ARTICLE_REGIONS)
+            head = fill_defaults({
+                "article_url": article_url,
+                "title": Extract.extract_title(soup),
+                "content": Extract.extract_content(soup),
+                "article_time": Extract.extract_time(soup),
+            })
+            head["article_epoch"] = Timestamps.display_to_epoch(head["article_time"])
+            article_title = head["title"]
+            print(f"📌 爬取 第 {page} 页 第 {order} 篇: {article_url} | {article_title}")
+            filename = article_json_path(article_url, page, order)
+            CommentStream.write_article_json(filename, head, (data for _, data in events),
+                                             {"page": page, "order": order})
+            print(f"保存《{article_title}》评论数据到 {filename}")
+            return article_title
+        except Exception as e:
+            print(f"❌ 流式解析 {article_url} 出错，改为完整请求: {e}")
+            snapshot = get_article_snapshot(article_url, selected_color=selected_color)
+        finally:
+            # 回放模式返回的响应没有底层连接（raw 为 None），无需关闭
+            if response.raw is not None:
+                response.close()
+    else:
+        snapshot = default_snapshot(article_url)
+    print(f"📌 爬取 第 {page} 页 第 {order} 篇: {article_url} | {snapshot['title']}")
+    save_to_json_file(article_url, snapshot["title"], snapshot["content"], snapshot["comments"],
+                      page, order, article_time=snapshot["article_time"])
+    return snapshot["title"]
+
+
+def save_fixed_page(page_url, snapshot):
+    """
+    将固定页面的快照保存为 JSON 文件到 datatest/fixed/ 目录下
+    """
+    fixed_folder = os.path.join("datatest", "fixed")
+    if not os.path.exists(fixed_folder):
+        os.makedirs(fixed_folder)
+    page_title = snapshot["title"]
+    print(f"📌 页面标题: {page_title}")
+    file_id = Extract.generate_unique_id(page_url, 0)
+    filename = os.path.join(fixed_folder, f"{file_id}.json")
+    out = {
+        "article_url": page_url,
+        "title": page_title,
+        "content": snapshot["content"],
+        "article_time": snapshot["article_time"],
+        "article_epoch": Timestamps.display_to_epoch(snapshot["article_time"]),
+        "comments": snapshot["comments"],
+        "fixed": True
+    }
+    DataCodec.dump_file(filename, out)
+    print(f"保存固定页面《{page_title}》到 {filename}")
+
+
+def crawl():
+    """
+    爬取评论并将数据保存为 JSON 文件，每页最多处理 10 篇文章。
+    支持断点续爬，进度记录包含当前页和页内文章序号。
+    """
+    Http.set_retry_policy(RetryPolicy.RetryPolicy(max_attempts=10, run_budget=RETRY_BUDGET))
+    start_page, start_order = get_last_progress()
+    current_page = start_page
+    articles_per_page = 10
+
+    while True:
+        print(f"📌 正在爬取第 {current_page} 页文章...")
+        article_links = get_article_links(current_page)
+        if not article_links:
+            print("🚫 没有更多文章，停止爬取。")
+            break
+
+        # 如果当前页为断点页，则从 start_order 开始爬取，否则从第一篇开始
+        if current_page == start_page:
+            article_links = article_links[start_order - 1:]
+            initial_order = start_order
+        else:
+            initial_order = 1
+
+        for idx, link in enumerate(article_links, start=initial_order):
+            if STREAM_COMMENTS:
+                stream_article_to_file(link, current_page, idx)
+            else:
+                snapshot = get_article_snapshot(link)
+                article_title = snapshot["title"]
+                print(f"📌 爬取 第 {current_page} 页 第 {idx} 篇: {link} | {article_title}")
+                save_to_json_file(link, article_title, snapshot["content"], snapshot["comments"],
+                                  current_page, idx, article_time=snapshot["article_time"])
+            # 每成功处理一篇文章，更新进度记录（下一篇序号为 idx+1）
+            save_progress(current_page, idx + 1)
+
+        # 当前页处理完成，重置页内文章序号，并记录进度
+        start_order = 1
+        save_progress(current_page, 1)
+        current_page += 1
+
+    # 爬取固定页面（非分页页面）
+    for page_url in PAGE_URLS:
+        print(f"📌 爬取固定页面: {page_url}")
+        snapshot = get_article_snapshot(page_url, fixed=True)
+        save_fixed_page(page_url, snapshot)
+    print("\n✅ 爬取完成，评论数据已保存到 datatest 目录中。")
+
+
+class HostLimiter:
+    """
+    按主机限制并发请求数：同一主机同时最多 limit 个请求在进行
+    """
+
+    def __init__(self, limit=ASYNC_CONCURRENCY):
+        self.limit = limit
+        self._semaphores = {}
+
+    def for_url(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limit)
+        return self._semaphores[host]
+
+
+class OrderedProgress:
+    """
+    按顺序提交进度：文章可以乱序完成，但 progress.txt 只按照
+    顺序爬取时的写入序列推进，保证断点续爬的语义与 crawl() 相同。
+    """
+
+    def __init__(self):
+        self._pending = collections.deque()
+        self._finished = set()
+
+    def expect_article(self, page, order):
+        self._pending.append(("article", page, order))
+
+    def expect_page_end(self, page):
+        self._pending.append(("page", page, 1))
+
+    def finish(self, page, order):
+        self._finished.add(("article", page, order))
+        while self._pending:
+            kind, page, order = self._pending[0]
+            if kind == "article":
+                if (kind, page, order) not in self._finished:
+                    break
+                self._finished.discard((kind, page, order))
+                # 与 crawl() 相同：下一篇序号为 order+1
+                save_progress(page, order + 1)
+            else:
+                # 当前页全部完成，重置页内文章序号
+                save_progress(page, 1)
+            self._pending.popleft()
+
+
+async def crawl_async(concurrency=ASYNC_CONCURRENCY):
+    """
+    基于 asyncio 的并发爬取：列表页和文章页并行请求，
+    同一主机的并发数不超过 concurrency。
+    输出的 datatest/pageN/pageN_orderM_*.json 与 progress.txt 的含义与 crawl() 相同。
+    """
+    loop = asyncio.get_running_loop()
+    Http.set_retry_policy(RetryPolicy.RetryPolicy(max_attempts=10, run_budget=RETRY_BUDGET))
+    # 连接池至少要容纳 concurrency 个并发连接
+    Http.configure(pool_size=max(Http.POOL_SIZE, concurrency))
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    limiter = HostLimiter(concurrency)
+    progress = OrderedProgress()
+
+    async def run_limited(url, func, *args, **kwargs):
+        async with limiter.for_url(url):
+            return await loop.run_in_executor(executor, lambda: func(*args, **kwargs))
+
+    async def crawl_article(link, page, order):
+        if STREAM_COMMENTS:
+            await run_limited(link, stream_article_to_file, link, page, order)
+            progress.finish(page, order)
+            return
+        snapshot = await run_limited(link, get_article_snapshot, link)
+        print(f"📌 爬取 第 {page} 页 第 {order} 篇: {link} | {snapshot['title']}")
+        save_to_json_file(link, snapshot["title"], snapshot["content"], snapshot["comments"],
+                          page, order, article_time=snapshot["article_time"])
+        progress.finish(page, order)
+
+    async def get_links(page):
+        return await run_limited(BASE_URL, get_article_links, page)
+
+    start_page, start_order = get_last_progress()
+    current_page = start_page
+    article_tasks = []
+    try:
+        finished = False
+        while not finished:
+            # 一次并行请求 concurrency 个列表页，文章任务在后台同时进行
+            pages = list(range(current_page, current_page + concurrency))
+            print(f"📌 正在爬取第 {pages[0]}-{pages[-1]} 页文章列表...")
+            page_links = await asyncio.gather(*(get_links(page) for page in pages))
+            for page, article_links in zip(pages, page_links):
+                if not article_links:
+                    print(f"🚫 第 {page} 页没有更多文章，停止爬取。")
+                    finished = True
+                    break
+                # 如果当前页为断点页，则从 start_order 开始爬取，否则从第一篇开始
+                if page == start_page:
+                    article_links = article_links[start_order - 1:]
+                    initial_order = start_order
+                else:
+                    initial_order = 1
+                for idx, link in enumerate(article_links, start=initial_order):
+                    progress.expect_article(page, idx)
+                    article_tasks.append(asyncio.ensure_future(crawl_article(link, page, idx)))
+                progress.expect_page_end(page)
+            current_page += concurrency
+        await asyncio.gather(*article_tasks)
+
+        # 固定页面（非分页页面）同样并行请求
+        print("📌 爬取固定页面...")
+        snapshots = await asyncio.gather(*(run_limited(page_url, get_article_snapshot, page_url, fixed=True)
+                                           for page_url in PAGE_URLS))
+        for page_url, snapshot in zip(PAGE_URLS, snapshots):
+            save_fixed_page(page_url, snapshot)
+    finally:
+        executor.shutdown(wait=False)
+    print("\n✅ 爬取完成，评论数据已保存到 datatest 目录中。")
+
+
+def crawl_concurrent(concurrency=ASYNC_CONCURRENCY):
+    """
+    并发爬取模式入口，同步调用 crawl_async()
+    """
+    asyncio.run(crawl_async(concurrency=concurrency))
+
+
+def crawl_pipeline(fetchers=PIPELINE_FETCHERS, parse_workers=PIPELINE_PARSE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE):
+    """
+    分阶段流水线爬取，网络请求、解析和写文件同时进行：
+    - 列表线程逐页获取文章链接，放入有界的链接队列；
+    - fetchers 个抓取线程下载文章页面，原始字节交给 parse_workers 个进程解析，抓取线程不等待解析；
+    - 主线程是唯一的写入者，保存 JSON 并按 crawl() 的顺序提交 progress.txt（乱序完成、顺序提交）。
+    已下载但尚未写入的页面最多 queue_size 个：解析或写入跟不上时抓取线程等待，链接队列随之填满，
+    列表线程也停下来（反压），内存占用有上限。输出与 crawl() 相同；本模式不使用流式解析。
+    """
+    Http.set_retry_policy(RetryPolicy.RetryPolicy(max_attempts=10, run_budget=RETRY_BUDGET))
+    Http.configure(pool_size=max(Http.POOL_SIZE, fetchers))
+    link_queue = queue.Queue(maxsize=queue_size)
+    # 写入队列的条目数受 slots 限制，这里不再设上限，解析完成的回调放入结果时不会阻塞
+    result_queue = queue.Queue()
+    slots = threading.BoundedSemaphore(queue_size)
+    progress = OrderedProgress()
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+
+    def list_links():
+        """
+        列表线程：先在写入队列中登记进度顺序，再把任务放入链接队列，保证写入者先登记后完成
+        """
+        count = 0
+        try:
+            start_page, start_order = get_last_progress()
+            current_page = start_page
+            while True:
+                print(f"📌 正在爬取第 {current_page} 页文章...")
+                article_links = get_article_links(current_page)
+                if not article_links:
+                    print("🚫 没有更多文章，停止爬取。")
+                    break
+                # 如果当前页为断点页，则从 start_order 开始爬取，否则从第一篇开始
+                if current_page == start_page:
+                    article_links = article_links[start_order - 1:]
+                    initial_order = start_order
+                else:
+                    initial_order = 1
+                for idx, link in enumerate(article_links, start=initial_order):
+                    result_queue.put(("expect", (current_page, idx)))
+                    link_queue.put((current_page, idx, link, False))
+                    count += 1
+                result_queue.put(("page_end", current_page))
+                current_page += 1
+            # 固定页面（非分页页面）同样经过流水线，不参与进度记录
+            for page_url in PAGE_URLS:
+                link_queue.put((None, None, page_url, True))
+                count += 1
+        finally:
+            for _ in range(fetchers):
+                link_queue.put(None)
+            result_queue.put(("total", count))
+
+    def fetch_pages():
+        """
+        抓取线程：取得写入槽位后下载页面，提交到进程池解析，解析完成后由回调放入写入队列
+        """
+        while True:
+            task = link_queue.get()
+            if task is None:
+                return
+            link, fixed = task[2], task[3]
+            slots.acquire()
+            try:
+                response = fetch_url(link)
+                if not response:
+                    result_queue.put(("result", (task, default_snapshot(link))))
+                    continue
+                future = executor.submit(parse_article_snapshot, response.content, link, fixed,
+                                         encoding=HtmlParse.response_encoding(response))
+            except Exception as e:
+                print(f"❌ 抓取 {link} 出错: {e}")
+                result_queue.put(("result", (task, default_snapshot(link))))
+                continue
+            future.add_done_callback(lambda f, task=task: result_queue.put(("result", (task, f))))
+
+    threads = [threading.Thread(target=list_links, daemon=True)]
+    threads += [threading.Thread(target=fetch_pages, daemon=True) for _ in range(fetchers)]
+    try:
+        # 先创建解析进程再启动线程，避免在其他线程持有锁时 fork
+        executor.submit(os.getpid).result()
+        for thread in threads:
+            thread.start()
+        total = None
+        written = 0
+        # 写入队列中的消息：("expect", (页码, 序号))、("page_end", 页码)、("total", 任务总数)、
+        # ("result", (任务, 快照或解析中的 Future))
+        while total is None or written < total:
+            kind, value = result_queue.get()
+            if kind == "expect":
+                progress.expect_article(*value)
+            elif kind == "page_end":
+                progress.expect_page_end(value)
+            elif kind == "total":
+                total = value
+            else:
+                (page, order, link, fixed), snapshot = value
+                if not isinstance(snapshot, dict):
+                    try:
+                        snapshot = snapshot.result()
+                    except Exception as e:
+                        print(f"❌ 解析 {link} 出错: {e}")
+                        snapshot = default_snapshot(link)
+                if fixed:
+                    save_fixed_page(link, snapshot)
+                else:
+                    print(f"📌 爬取 第 {page} 页 第 {order} 篇: {link} | {snapshot['title']}")
+                    save_to_json_file(link, snapshot["title"], snapshot["content"], snapshot["comments"],
+                                      page, order, article_time=snapshot["article_time"])
+                    progress.finish(page, order)
+                written += 1
+                slots.release()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    print("\n✅ 爬取完成，评论数据已保存到 datatest 目录中。")
+
+
+def _reparse_worker(task):
+    """
+    在子进程中从存档读取页面并解析为快照
+    """
+    archive_dir, link, fixed = task
+    body, encoding = HtmlArchive.open_archive(archive_dir).get(link)
+    if body is None:
+        return None
+    return parse_article_snapshot(body, link, fixed=fixed, encoding=encoding)
+
+
+def reparse_archive(archive_dir=HtmlArchive.ARCHIVE_DIR, workers=REPARSE_WORKERS):
+    """
+    不访问网络，从原始网页存档重新解析全部文章，输出与 crawl() 相同的 datatest 目录结构。
+    列表页用于确定 page/order，文章页的解析分配到多个进程并行执行。
+    """
+    archive = HtmlArchive.open_archive(archive_dir)
+    tasks = []
+    page = 1
+    while True:
+        body, encoding = archive.get(f"{BASE_URL}?paged={page}")
+        if body is None:
+            break
+        links = Extract.parse_article_links(body, encoding=encoding)
+        if not links:
+            break
+        for idx, link in enumerate(links, start=1):
+            tasks.append((page, idx, link))
+        page += 1
+    print(f"📌 存档中共有 {page - 1} 页列表、{len(tasks)} 篇文章，开始重新解析...")
+
+    jobs = [(archive_dir, link, False) for _, _, link in tasks]
+    jobs += [(archive_dir, page_url, True) for page_url in PAGE_URLS]
+    missing = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        snapshots = executor.map(_reparse_worker, jobs, chunksize=8)
+        for i, snapshot in enumerate(snapshots):
+            if snapshot is None:
+                missing += 1
+                print(f"❌ 存档中没有页面: {jobs[i][1]}")
+                continue
+            if i < len(tasks):
+                page, idx, link = tasks[i]
+                save_to_json_file(link, snapshot["title"], snapshot["content"], snapshot["comments"],
+                                  page, idx, article_time=snapshot["article_time"])
+            else:
+                save_fixed_page(jobs[i][1], snapshot)
+    print(f"\n✅ 重新解析完成，缺失 {missing} 个页面，数据已保存到 datatest 目录中。")
+
+
+def load_crawled_articles():
+    """
+    读取 datatest 目录中已爬取的文章，返回 {article_url: 文件中的数据}
+    """
+    crawled = {}
+    if not os.path.exists("datatest"):
+        return crawled
+    for folder in os.listdir("datatest"):
+        folder_path = os.path.join("datatest", folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in os.listdir(folder_path):
+            if filename.endswith(".json"):
+                data = DataCodec.load_file(os.path.join(folder_path, filename))
+                crawled[data["article_url"]] = data
+    return crawled
+
+
+def crawl_sitemap_changes():
+    """
+    站点地图模式：只重新爬取站点地图中 lastmod 有变化的文章，并在 datatest 中原地覆盖（page/order 不变）。
+    新文章的页码需要整体后移，这里只提示，由 Rdata 的更新流程插入；提示过的新文章下次仍会被检测到。
+    """
+    crawled = load_crawled_articles()
+    new_urls, modified_urls, state = Sitemap.discover_changes(BASE_URL, SITEMAP_STATE_FILE, known_urls=crawled)
+    for url in modified_urls:
+        data = crawled.get(url)
+        if data is None:
+            continue
+        fixed = data.get("fixed", False)
+        snapshot = get_article_snapshot(url, fixed=fixed)
+        print(f"📌 重新爬取已修改的文章: {url} | {snapshot['title']}")
+        if fixed:
+            save_fixed_page(url, snapshot)
+        else:
+            save_to_json_file(url, snapshot["title"], snapshot["content"], snapshot["comments"],
+                              data["page"], data["order"], article_time=snapshot["article_time"])
+    if new_urls:
+        print(f"📌 站点地图中有 {len(new_urls)} 篇新文章，请运行更新程序插入新文章：")
+        for url in new_urls:
+            print(f"    {url}")
+            state.pop(url, None)
+    Sitemap.save_state(SITEMAP_STATE_FILE, state)
+    print("\n✅ 站点地图检查完成。")
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 打包为 exe 后多进程需要
+    parser = argparse.ArgumentParser(description="爬取全部文章和评论到 datatest 目录")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="使用 asyncio 并发爬取")
+    parser.add_argument("--concurrency", type=int, default=ASYNC_CONCURRENCY, help="每个主机的并发请求数")
+    parser.add_argument("--archive", action="store_true", help="同时把原始网页保存到存档目录")
+    parser.add_argument("--replay", action="store_true", help="不访问网络，从存档回放页面")
+    parser.add_argument("--reparse", action="store_true", help="从存档多进程重新解析全部文章")
+    parser.add_argument("--archive-dir", default=HtmlArchive.ARCHIVE_DIR, help="原始网页存档目录")
+    parser.add_argument("--workers", type=int, default=REPARSE_WORKERS, help="重新解析或流水线解析使用的进程数")
+    parser.add_argument("--sitemap", action="store_true", help="读取站点地图，只重新爬取修改过的文章")
+    parser.add_argument("--stream", action="store_true", help="流式解析文章页面，评论逐条写入文件（不写入存档）")
+    parser.add_argument("--pipeline", action="store_true", help="流水线爬取：多线程下载、多进程解析、单线程写入")
+    parser.add_argument("--fetchers", type=int, default=PIPELINE_FETCHERS, help="流水线模式的抓取线程数")
+    args = parser.parse_args()
+    STREAM_COMMENTS = STREAM_COMMENTS or args.stream
+    if args.reparse:
+        reparse_archive(args.archive_dir, workers=args.workers)
+    elif args.sitemap:
+        crawl_sitemap_changes()
+    else:
+        if args.replay:
+            Http.enable_replay(args.archive_dir)
+        elif args.archive:
+            Http.enable_archive(args.archive_dir)
+        if args.pipeline:
+            crawl_pipeline(fetchers=args.fetchers, parse_workers=args.workers)
+        elif args.use_async:
+            crawl_concurrent(concurrency=args.concurrency)
+        else:
+            crawl()
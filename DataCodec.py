@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+
+# orjson、msgpack 为可选依赖：orjson 用于快速的紧凑 JSON，msgpack 用于二进制格式
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# =================== 配置项 ===================
+# 文章数据文件的写出格式（读取时按文件内容自动识别，旧文件不需要转换）：
+#   "pretty"  标准库 json，ensure_ascii=False、indent=2（原来的格式，便于人工查看）
+#   "compact" 紧凑 JSON，有 orjson 时用 orjson，否则用标准库
+#   "msgpack" MessagePack 二进制（需要安装 msgpack）
+# 文件名仍为 .json，切换格式后旧文件在下次写入时才改为新格式，不会出现同一篇文章的两份文件。
+# 默认保持原来的格式，需要更小更快的文件时再改为 "compact" 或 "msgpack"。
+FORMAT = "pretty"
+FORMATS = ("pretty", "compact", "msgpack")
+
+# JSON 文本以这些字节开头（允许 UTF-8 BOM 和空白），其余按 MessagePack 解码
+JSON_START = b"{[\xef \t\r\n"
+
+# =================== 编码与解码 ===================
+
+def dumps(data, fmt=None):
+    """
+    按 fmt（默认 FORMAT）把数据编码为 bytes
+    """
+    fmt = fmt or FORMAT
+    if fmt == "pretty":
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    if fmt == "compact":
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if fmt == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("未安装 msgpack，无法使用 msgpack 格式（pip install msgpack）")
+        return msgpack.packb(data, use_bin_type=True)
+    raise ValueError(f"未知的数据格式: {fmt}（可选 {', '.join(FORMATS)}）")
+
+def loads(raw):
+    """
+    解码 dumps() 写出的任一格式（以及原来 json.dump 写出的文件），按第一个字节区分 JSON 与 MessagePack
+    """
+    if not raw or raw[0] in JSON_START:
+        if raw.startswith(b"\xef\xbb\xbf"):
+            raw = raw[3:]
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw.decode("utf-8"))
+    if msgpack is None:
+        raise RuntimeError("文件为 msgpack 格式，但未安装 msgpack（pip install msgpack）")
+    return msgpack.unpackb(raw, raw=False)
+
+def load_file(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def dump_file(path, data, fmt=None):
+    """
+    先写同目录下的临时文件再替换，中途出错不会留下不完整的文件；
+    临时文件名各不相同，多个写入方同时保存同一路径时互不干扰（最后替换的生效）
+    """
+    raw = dumps(data, fmt)
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write(raw)
+        os.replace(f.name, path)
+    except BaseException:
+        if os.path.exists(f.name):
+            os.remove(f.name)
+        raise
+
+def available_formats():
+    """
+    当前环境可用的格式（msgpack 未安装时不含 msgpack）
+    """
+    return [fmt for fmt in FORMATS if fmt != "msgpack" or msgpack is not None]
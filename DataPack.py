@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import mmap
+import struct
+import tempfile
+import ArticleStore  # 按 URL 存储的文章和清单
+import ChangeLog  # 变更日志中尚未压缩的记录
+import DataCodec  # 数据的编码格式
+import Timestamps  # 打包时补全时间戳
+
+# =================== 配置项 ===================
+PACK_FILE = "articles.pack"     # 打包文件（位于数据目录下），生成 HTML 时只需打开这一个文件
+REPACK_RATIO = 0.5              # 失效数据超过文件大小的这个比例时整体重写，否则只在末尾追加
+PACK_FORMAT = "compact"         # 打包文件内部的编码格式（见 DataCodec.FORMATS），与文章文件的格式无关
+MAGIC = b"RDPACK01"             # 文件头和文件尾的标记
+FOOTER = struct.Struct("<QQ8s")  # 文件尾：索引的偏移、长度和标记
+
+# 文件结构：MAGIC | 文章数据 ... | 索引 | 文件尾
+# 每篇文章按 PACK_FORMAT 编码为一段数据，索引（同样按 DataCodec 编码）记录每段的偏移和长度，
+# 以及清单中的字段、页码和序号。更新时只把有变化的文章追加到末尾，再追加新的索引和文件尾，
+# 旧的数据段和索引成为失效数据，累计过多时整体重写。写入中断时文件尾不完整，读取时视为没有打包文件。
+
+# =================== 来源文件 ===================
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def source_signature(data_dir):
+    """
+    数据目录的整体签名：清单、文章目录、固定页面目录和各变更日志段的修改时间与大小。
+    文章文件都是先写临时文件再替换，写入任何一篇都会改变所在目录的修改时间，
+    因此不需要逐个查看文章文件就能判断打包文件是否过期。
+    """
+    signature = {name: _stat(os.path.join(data_dir, name))
+                 for name in (ArticleStore.INDEX_FILE, ArticleStore.ARTICLES_DIR, ArticleStore.FIXED_DIR)}
+    for path in ChangeLog.ChangeLog(data_dir).segments():
+        signature[f"{ChangeLog.CHANGES_DIR}/{os.path.basename(path)}"] = _stat(path)
+    return signature
+
+def _file_signature(path, records=None):
+    """
+    一篇文章的签名：文件的修改时间与大小，加上变更日志中最后一条记录应用后的摘要
+    """
+    stat = _stat(path)
+    return None if stat is None else stat + [records[-1]["after"] if records else None]
+
+# =================== 读写打包文件 ===================
+
+def read_pack_index(pack_path):
+    """
+    读取打包文件的索引，文件不存在、不完整或格式不符时返回 None
+    """
+    try:
+        with open(pack_path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < len(MAGIC) + FOOTER.size:
+                return None
+            f.seek(0)
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            f.seek(size - FOOTER.size)
+            offset, length, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != MAGIC or offset + length > size - FOOTER.size:
+                return None
+            f.seek(offset)
+            return DataCodec.loads(f.read(length))
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+def _write_blob(f, raw):
+    offset = f.tell()
+    f.write(raw)
+    return offset, len(raw)
+
+def build_pack(data_dir):
+    """
+    由数据目录生成或更新打包文件：签名未变的文章沿用原来的数据段，其余读取后（应用变更日志、补全时间戳）重新编码，
+    清单中的字段取自文章数据本身。
+    失效数据超过 REPACK_RATIO 时写临时文件后整体替换，否则追加到原文件末尾。
+    没有清单或还有旧版 page* 目录时不生成，返回 False；打包文件已是最新或更新完成时返回 True。
+    """
+    store = ArticleStore.ArticleStore(data_dir)
+    if not store.has_index() or store.legacy_files():
+        print(f"📌 {data_dir} 中没有清单或还有未迁移的旧版目录，不生成打包文件")
+        return False
+    pack_path = os.path.join(data_dir, PACK_FILE)
+    # 先取签名再读取，打包期间的写入会让打包文件在下次检查时显示为过期
+    sources = source_signature(data_dir)
+    old = read_pack_index(pack_path)
+    if old is not None and old.get("sources") == sources:
+        return True
+    old_items = {item["path"]: item for item in old["articles"] + old["fixed"]} if old else {}
+
+    # 逐篇比较签名，决定沿用还是重新编码
+    pending = store.log.pending()
+    plan = []   # [(条目, 沿用的旧条目或 None)]
+    for i, entry in enumerate(store.read_index()):
+        rel = entry.get("path") or f"{ArticleStore.ARTICLES_DIR}/{entry['key']}.json"
+        path = os.path.join(data_dir, rel)
+        signature = _file_signature(path, pending.get(entry["key"]))
+        if signature is None:
+            print(f"❌ 打包时文件 {path} 不存在，已跳过")
+            continue
+        page, order = store.position(i)
+        item = {"path": rel, "sig": signature, "page": page, "order": order}
+        plan.append((item, old_items.get(rel) if old_items.get(rel, {}).get("sig") == signature else None))
+    fixed_dir = os.path.join(data_dir, ArticleStore.FIXED_DIR)
+    for filename in (os.listdir(fixed_dir) if os.path.isdir(fixed_dir) else []):
+        if filename.endswith(".json"):
+            rel = f"{ArticleStore.FIXED_DIR}/{filename}"
+            item = {"path": rel, "sig": _file_signature(os.path.join(data_dir, rel)), "fixed": True}
+            plan.append((item, old_items.get(rel) if old_items.get(rel, {}).get("sig") == item["sig"] else None))
+
+    reused = sum(old_item["length"] for _, old_item in plan if old_item)
+    size = os.path.getsize(pack_path) if old is not None else 0
+    rewrite = old is None or size - reused > REPACK_RATIO * size
+    written = 0
+    # 整体重写时写入同目录下名字唯一的临时文件，完成后再替换
+    f = (tempfile.NamedTemporaryFile(dir=data_dir, prefix=PACK_FILE + ".", suffix=".tmp", delete=False)
+         if rewrite else open(pack_path, "r+b"))
+    old_file = open(pack_path, "rb") if rewrite and old is not None else None
+    try:
+        with f:
+            if rewrite:
+                f.write(MAGIC)
+            else:
+                f.seek(0, os.SEEK_END)
+            index = {"sources": sources, "articles": [], "fixed": []}
+            for item, old_item in plan:
+                fixed = item.pop("fixed", False)
+                if old_item is None:
+                    path = os.path.join(data_dir, item["path"])
+                    try:
+                        data = DataCodec.load_file(path) if fixed else store.read_file(path)
+                    except Exception as e:
+                        print(f"❌ 打包时读取 {path} 出错: {e}")
+                        continue
+                    Timestamps.stamp_article(data)
+                    item["offset"], item["length"] = _write_blob(f, DataCodec.dumps(data, PACK_FORMAT))
+                    if not fixed:
+                        item.update({key: data.get(key) for key in ArticleStore.MANIFEST_FIELDS})
+                    written += 1
+                else:
+                    if rewrite:
+                        old_file.seek(old_item["offset"])
+                        item["offset"], item["length"] = _write_blob(f, old_file.read(old_item["length"]))
+                    else:
+                        item["offset"], item["length"] = old_item["offset"], old_item["length"]
+                    if not fixed:
+                        item.update({key: old_item.get(key) for key in ArticleStore.MANIFEST_FIELDS})
+                index["fixed" if fixed else "articles"].append(item)
+            offset, length = _write_blob(f, DataCodec.dumps(index, PACK_FORMAT))
+            f.write(FOOTER.pack(offset, length, MAGIC))
+    except BaseException:
+        if rewrite:
+            os.remove(f.name)
+        raise
+    finally:
+        if old_file is not None:
+            old_file.close()
+    if rewrite:
+        os.replace(f.name, pack_path)
+    print(f"✅ 打包文件已更新：{pack_path}（重新编码 {written} 篇，{'整体重写' if rewrite else '追加写入'}）")
+    return True
+
+
+class PackReader:
+    """
+    通过 mmap 读取打包文件：打开时只解码索引，文章在第一次访问正文、评论等字段时才解码对应的数据段，
+    不需要逐个打开文章文件。使用期间保持文件打开，用完后 close()（或使用 with 语句）。
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.pack_path = os.path.join(data_dir, PACK_FILE)
+        self.index = read_pack_index(self.pack_path)
+        if self.index is None:
+            raise ValueError(f"打包文件 {self.pack_path} 不存在或不完整")
+        self._file = open(self.pack_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._items = {item["path"]: item for item in self.index["articles"] + self.index["fixed"]}
+
+    def read(self, path):
+        """
+        解码一篇文章（path 为数据目录下的文件路径，与 ArticleStore 中的 filename 相同）
+        """
+        item = self._items[os.path.relpath(path, self.data_dir).replace(os.sep, "/")]
+        return DataCodec.loads(self._map[item["offset"]:item["offset"] + item["length"]])
+
+    def load_all(self):
+        """
+        按清单顺序返回全部文章（LazyArticle，附带 page、order、filename），之后是固定页面（没有页码的记为 9999）
+        """
+        articles = []
+        for item in self.index["articles"]:
+            meta = {key: item[key] for key in ArticleStore.MANIFEST_FIELDS + ("page", "order")}
+            meta["filename"] = os.path.join(self.data_dir, item["path"])
+            articles.append(ArticleStore.LazyArticle(meta, meta["filename"], reader=self.read))
+        for item in self.index["fixed"]:
+            path = os.path.join(self.data_dir, item["path"])
+            data = self.read(path)
+            data.setdefault("page", 9999)
+            data["filename"] = path
+            articles.append(data)
+        return articles
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_pack(data_dir):
+    """
+    打开数据目录的打包文件，过期或不存在时先增量更新；无法生成时返回 None（此时应直接读取文章文件）
+    """
+    index = read_pack_index(os.path.join(data_dir, PACK_FILE))
+    if index is None or index.get("sources") != source_signature(data_dir):
+        if not build_pack(data_dir):
+            return None
+    return PackReader(data_dir)
+
+def main():
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    build_pack(data_dir)
+
+if __name__ == "__main__":
+    main()
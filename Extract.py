@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import datetime
+import HtmlParse  # 解析器后端与区域解析
+import Timestamps  # 时间戳与排序键
+
+# =================== 配置项 ===================
+TARGET_USERS = ["李宗恩", "andy"]  # 针对特定评论作者做高亮处理
+
+# 页面字段的选择器："标签名.class1.class2"（元素需同时包含这些 class），列表中的候选依次尝试，取第一个找到的元素。
+# CrawlAll（全量爬取）和 Rdata（增量更新）共用这里的定义，修改页面结构时只需改这一处。
+SELECTORS = {
+    "title": ["h1.post-title", "h1.entry-title"],   # 文章标题
+    "fixed_title": ["h1"],                          # 固定页面（如关于页面）标题
+    "content": ["div.entry-content"],               # 正文
+    "published": ["span.entry-date.post-date"],     # 发布时间区域
+    "published_iso": ["abbr.published"],            # 发布时间区域内带 ISO 时间（title 属性）的标签
+    "listing_title": ["h2.entry-title"],            # 文章列表页中每篇文章的标题（内含链接）
+    "comment_list": ["ol.commentlist"],             # 评论列表
+    "comment": ["li.comment"],                      # 一条评论（直接回复在其 ul.children 中）
+    "comment_author": ["cite.fn"],
+    "comment_time": ["small"],
+    "comment_text": ["div.comment_text"],
+    "reply_button": ["div.reply"],                  # 评论内容中的回复按钮，提取内容前删除
+    "comment_children": ["ul.children"],
+}
+
+# =================== 选择器 ===================
+
+class Selector:
+    """
+    编译后的选择器：创建时拆分出标签名和 class 集合，查找时直接交给 bs4 按标签名和第一个 class 过滤，
+    其余 class 再逐个检查，不必每次查找都重新解析选择器字符串
+    """
+
+    def __init__(self, spec):
+        name, *classes = spec.split(".")
+        self.spec = spec
+        self.name = name or None
+        self.classes = frozenset(classes)
+        self.first_class = classes[0] if classes else None
+        # 传给 bs4 的过滤条件；没有 class 时不能传 class_=None（新版 bs4 会把它当作“没有 class 属性”）
+        self.filters = {"class_": self.first_class} if classes else {}
+
+    def __repr__(self):
+        return f"Selector({self.spec!r})"
+
+    def matches(self, tag):
+        if self.name and tag.name != self.name:
+            return False
+        return self.classes.issubset(tag.get("class") or ())
+
+    def find(self, tag):
+        if len(self.classes) <= 1:
+            return tag.find(self.name, **self.filters)
+        for found in tag.find_all(self.name, **self.filters):
+            if self.matches(found):
+                return found
+        return None
+
+    def find_all(self, tag, recursive=True):
+        found = tag.find_all(self.name, recursive=recursive, **self.filters)
+        if len(self.classes) <= 1:
+            return found
+        return [element for element in found if self.matches(element)]
+
+    def find_first(self, tag):
+        """
+        结果与 find() 相同，但先逐个查看直接子节点（见 HtmlParse.find_first），用于层级很深的评论
+        """
+        if len(self.classes) <= 1:
+            return HtmlParse.find_first(tag, self.name, self.first_class)
+        return self.find(tag)
+
+
+def compile_selectors(selectors):
+    """
+    把 {字段: [选择器字符串]} 编译为 {字段: [Selector]}
+    """
+    return {field: [Selector(spec) for spec in specs] for field, specs in selectors.items()}
+
+# 模块加载时编译一次；运行时修改 SELECTORS 后需重新调用 compile_selectors()
+COMPILED = compile_selectors(SELECTORS)
+
+
+def find(tag, field):
+    """
+    依次尝试字段的各个候选选择器，返回第一个找到的元素，都没有返回 None
+    """
+    for selector in COMPILED[field]:
+        found = selector.find(tag)
+        if found is not None:
+            return found
+    return None
+
+def find_in_comment(comment, field):
+    """
+    在一条评论中查找字段，结果与 find() 相同，但不会先遍历整棵回复子树
+    """
+    for selector in COMPILED[field]:
+        found = selector.find_first(comment)
+        if found is not None:
+            return found
+    return None
+
+def find_all(tag, field, recursive=True):
+    for selector in COMPILED[field]:
+        found = selector.find_all(tag, recursive=recursive)
+        if found:
+            return found
+    return []
+
+# =================== 页面字段 ===================
+
+def extract_links(soup):
+    """
+    从文章列表页的解析树中提取文章链接
+    """
+    links = []
+    for heading in find_all(soup, "listing_title"):
+        a_tag = heading.find("a")
+        if a_tag and "href" in a_tag.attrs:
+            links.append(a_tag["href"])
+    return links
+
+def parse_article_links(html, encoding=None):
+    """
+    从列表页 HTML（str 或按 encoding 编码的 bytes）中解析文章链接，只解析文章标题区域
+    """
+    return extract_links(HtmlParse.make_soup(html, encoding, regions=HtmlParse.LISTING_REGIONS))
+
+def extract_title(soup, fixed=False):
+    """
+    从解析树中提取标题，没有返回 None；固定页面直接取第一个 <h1>
+    """
+    title_tag = find(soup, "fixed_title" if fixed else "title")
+    return title_tag.get_text(strip=True) if title_tag else None
+
+def extract_content(soup):
+    """
+    从解析树中提取正文内容（保留内部 HTML 格式），没有返回 None
+    """
+    content_tag = find(soup, "content")
+    return content_tag.decode_contents().strip() if content_tag else None
+
+def extract_time(soup):
+    """
+    从解析树中提取发布时间，格式为 "YYYY年MM月DD日 HH:MM"，没有返回 ""
+    """
+    time_span = find(soup, "published")
+    if not time_span:
+        return ""
+    abbr_tag = find(time_span, "published_iso")
+    if abbr_tag and abbr_tag.has_attr("title"):
+        iso_time = abbr_tag["title"]  # 例如 "2025-01-29T16:49:00-08:00"
+        try:
+            return datetime.datetime.fromisoformat(iso_time).strftime("%Y年%m月%d日 %H:%M")
+        except Exception as e:
+            print("❌ 解析发布时间错误:", e)
+            return abbr_tag.get_text(strip=True)
+    return time_span.get_text(strip=True)
+
+def extract_comments(soup, article_url, selected_color="white"):
+    """
+    从解析树中提取所有评论及其回复（列表字典），页面中无评论时返回 []
+    """
+    comment_list = find(soup, "comment_list")
+    top_comments = find_all(comment_list if comment_list else soup, "comment", recursive=False)
+    results = []
+    index = 0
+    for comment in top_comments:
+        data, index = parse_comment(comment, article_url, selected_color=selected_color, index=index)
+        if data:
+            results.append(data)
+    return results
+
+def build_snapshot(soup, article_url, fixed=False, selected_color="white"):
+    """
+    从解析树构造文章快照 {article_url, title, content, article_time, comments}；
+    页面中缺失的标题、正文为 None，发布时间为 ""
+    """
+    return {
+        "article_url": article_url,
+        "title": extract_title(soup, fixed=fixed),
+        "content": extract_content(soup),
+        "article_time": extract_time(soup),
+        "comments": extract_comments(soup, article_url, selected_color=selected_color),
+    }
+
+def parse_article_snapshot(html, article_url, fixed=False, selected_color="white", encoding=None):
+    """
+    解析已获取的页面 HTML（str 或按 encoding 编码的 bytes），返回文章快照，不访问网络。
+    只解析标题、发布时间、正文和评论区域。
+    """
+    soup = HtmlParse.make_soup(html, encoding, regions=HtmlParse.ARTICLE_REGIONS)
+    return build_snapshot(soup, article_url, fixed=fixed, selected_color=selected_color)
+
+# =================== 评论 ===================
+
+def generate_unique_id(article_url, index):
+    """
+    生成唯一的ID，结合文章URL和评论索引
+    """
+    return hashlib.md5(f"{article_url}-{index}".encode('utf-8')).hexdigest()
+
+def parse_comment(comment, article_url, level=0, selected_color="white", index=0):
+    """
+    解析评论及其子评论，并返回数据字典和最新的索引值。
+    用显式栈按先序遍历回复（id、层级和顺序与逐层递归相同），回复层级很深时也不会超出递归深度限制。
+    """
+    root = None
+    # 栈中元素：(评论标签, 层级, 父评论的 children 列表)，根评论的父列表为 None
+    stack = [(comment, level, None)]
+    while stack:
+        tag, tag_level, siblings = stack.pop()
+        data, child_comments = parse_comment_node(tag, article_url, tag_level, index)
+        if data is None:
+            # 解析失败的评论连同其回复一起跳过
+            continue
+        index += 1
+        if siblings is None:
+            root = data
+        else:
+            siblings.append(data)
+        for child in reversed(child_comments):
+            stack.append((child, tag_level + 1, data["children"]))
+    return root, index
+
+def parse_comment_node(comment, article_url, level, index):
+    """
+    只解析一条评论自身（不含回复），返回 (数据字典, 直接回复的标签列表)；
+    缺少作者或内容时返回 (None, [])。index 为该评论的索引值。
+    """
+    author_tag = find_in_comment(comment, "comment_author")
+    if not author_tag:
+        return None, []
+    comment_user = author_tag.text.strip()
+
+    time_tag = find_in_comment(comment, "comment_time")
+    if time_tag:
+        time_text, epoch = Timestamps.parse_comment_time(time_tag.get_text(strip=True))
+    else:
+        time_text, epoch = "", None
+
+    comment_text_tag = find_in_comment(comment, "comment_text")
+    if not comment_text_tag:
+        return None, []
+
+    # 删除评论中的回复按钮标签
+    for reply in find_all(comment_text_tag, "reply_button"):
+        reply.decompose()
+    comment_text = comment_text_tag.decode_contents().strip()
+
+    data = {
+        "id": generate_unique_id(article_url, index),
+        "author": comment_user,
+        "time": time_text,
+        "epoch": epoch,
+        "content": comment_text,
+        "level": level,
+        "highlight": comment_user in TARGET_USERS,
+        "children": []
+    }
+
+    children_container = find_in_comment(comment, "comment_children")
+    if children_container:
+        return data, find_all(children_container, "comment", recursive=False)
+    return data, []
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# =================== 配置项 ===================
+ARCHIVE_DIR = "html_archive"    # 原始网页存档目录
+INDEX_FILE = "index.jsonl"      # URL -> 正文哈希 的追加式索引
+
+# =================== 原始网页存档 ===================
+
+class HtmlArchive:
+    """
+    按内容寻址的原始网页存档：正文以 sha256 命名并 gzip 压缩保存在 objects/ 下，
+    相同内容只存一份；index.jsonl 逐行追加记录每个 URL 最新对应的正文哈希。
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index = {}
+        if not os.path.exists(archive_dir):
+            os.makedirs(archive_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 写入中断留下的半行，忽略
+                    continue
+                self._index[entry["url"]] = entry
+
+    def _object_path(self, digest):
+        return os.path.join(self.archive_dir, "objects", digest[:2], f"{digest}.gz")
+
+    def __contains__(self, url):
+        return url in self._index
+
+    def urls(self):
+        """
+        返回存档中所有 URL（按首次存档顺序）
+        """
+        return list(self._index)
+
+    def put(self, url, body, encoding=None):
+        """
+        存档一个页面正文（bytes），内容未变化时不重复写入
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        entry = self._index.get(url)
+        if entry and entry["sha256"] == digest:
+            return digest
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        entry = {"url": url, "sha256": digest, "encoding": encoding, "fetched": time.time()}
+        with self._lock:
+            self._index[url] = entry
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+
+    def get(self, url):
+        """
+        返回 (正文 bytes, 编码)，存档中没有该 URL 时返回 (None, None)
+        """
+        entry = self._index.get(url)
+        if not entry:
+            return None, None
+        with gzip.open(self._object_path(entry["sha256"]), "rb") as f:
+            return f.read(), entry.get("encoding")
+
+    def get_text(self, url):
+        """
+        返回解码后的页面文本，存档中没有该 URL 时返回 None
+        """
+        body, encoding = self.get(url)
+        if body is None:
+            return None
+        return body.decode(encoding or "utf-8", errors="replace")
+
+    def response(self, url):
+        """
+        用存档正文构造 Response，供回放模式代替网络请求；没有存档时返回 404
+        """
+        body, encoding = self.get(url)
+        replayed = requests.models.Response()
+        replayed.url = url
+        replayed.from_cache = True
+        if body is None:
+            replayed.status_code = 404
+            replayed._content = b""
+            replayed.reason = "Not Archived"
+            return replayed
+        replayed.status_code = 200
+        replayed._content = body
+        replayed.encoding = encoding or "utf-8"
+        replayed.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=" + replayed.encoding})
+        return replayed
+
+
+_opened = {}
+
+def open_archive(archive_dir=ARCHIVE_DIR):
+    """
+    按目录返回进程内复用的 HtmlArchive（多进程重新解析时每个进程只加载一次索引）
+    """
+    if archive_dir not in _opened:
+        _opened[archive_dir] = HtmlArchive(archive_dir)
+    return _opened[archive_dir]
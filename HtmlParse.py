@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib.util
+from bs4 import BeautifulSoup
+
+try:
+    from bs4.filter import ElementFilter  # bs4 >= 4.13，只创建需要的节点
+except ImportError:
+    ElementFilter = None
+
+# lxml 为可选依赖，安装后解析速度明显快于 html.parser
+HAS_LXML = importlib.util.find_spec("lxml") is not None
+
+# =================== 配置项 ===================
+PARSER = "auto"             # 解析器："auto" 有 lxml 时用 lxml，否则用 html.parser；也可指定 "lxml" / "html.parser"
+DEFAULT_ENCODING = "utf-8"  # 响应头没有声明 charset 时使用的编码（WordPress 默认 UTF-8），不做编码探测
+# 只解析以下区域（标签名, class），区域外的节点不创建；class 为 None 表示该标签全部保留
+# 没有 ol.commentlist 的页面直接从 li.comment 提取评论，因此 li.comment 也单独保留
+ARTICLE_REGIONS = [("h1", None), ("div", "entry-content"), ("span", "entry-date"), ("ol", "commentlist"),
+                   ("li", "comment")]
+LISTING_REGIONS = [("h2", "entry-title")]
+RECENT_COMMENTS_REGIONS = [("aside", None)]
+
+# =================== 区域解析 ===================
+
+if ElementFilter is not None:
+    class RegionFilter(ElementFilter):
+        """
+        只为指定区域及其内部内容创建节点，区域之外的标签和文本直接丢弃。
+        判断只发生在区域之外，区域内部的内容全部保留，与在完整解析树上 find() 的结果一致。
+        """
+
+        def __init__(self, regions):
+            self.regions = {}
+            for name, class_name in regions:
+                self.regions.setdefault(name, set()).add(class_name)
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            wanted = self.regions.get(name)
+            if not wanted:
+                return False
+            if None in wanted:
+                return True
+            classes = (attrs or {}).get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            return any(class_name in classes for class_name in wanted)
+
+        def allow_string_creation(self, string):
+            return False
+else:
+    RegionFilter = None
+
+
+def parser_name(parser=None):
+    """
+    返回实际使用的 BeautifulSoup 解析器名称，指定 lxml 但未安装时退回 html.parser
+    """
+    parser = parser or PARSER
+    if parser == "auto" or (parser == "lxml" and not HAS_LXML):
+        return "lxml" if HAS_LXML else "html.parser"
+    return parser
+
+def response_encoding(response):
+    """
+    响应头声明了 charset 时使用该编码，否则使用 DEFAULT_ENCODING，避免 response.text 触发编码探测
+    """
+    if "charset=" in response.headers.get("Content-Type", "").lower() and response.encoding:
+        return response.encoding
+    return DEFAULT_ENCODING
+
+def make_soup(markup, encoding=None, regions=None, parser=None):
+    """
+    解析页面：markup 可以是 bytes（按 encoding 解码，不做探测）或 str；
+    给出 regions 时只解析这些区域（bs4 低于 4.13 时退回完整解析，结果相同只是更慢）
+    """
+    parse_only = RegionFilter(regions) if regions and RegionFilter is not None else None
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, parser_name(parser), parse_only=parse_only,
+                             from_encoding=encoding or DEFAULT_ENCODING)
+    return BeautifulSoup(markup, parser_name(parser), parse_only=parse_only)
+
+def response_soup(response, regions=None, parser=None):
+    """
+    直接从响应的原始字节解析，不经过 response.text
+    """
+    return make_soup(response.content, response_encoding(response), regions=regions, parser=parser)
+
+def find_first(tag, name, class_=None):
+    """
+    结果与 tag.find(name, class_=class_) 相同，但按文档顺序逐个查看直接子节点，找到即返回。
+    bs4 的 find() 每次调用都会先走到整个子树的最后一个节点，在层级很深的评论上逐条调用时
+    总耗时与层级的平方成正比；评论自身的作者、内容都在回复列表之前，这里不会进入回复子树。
+    """
+    for child in tag.children:
+        if getattr(child, "name", None) is None:
+            continue
+        if child.name == name and (class_ is None or class_ in (child.get("class") or [])):
+            return child
+        found = child.find(name, class_=class_) if class_ else child.find(name)
+        if found:
+            return found
+    return None
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+import HttpCache
+import HtmlArchive
+import RateLimit
+import RetryPolicy
+
+# =================== 配置项 ===================
+POOL_SIZE = 10              # 每个主机保持的长连接数量
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+}
+
+_session = None
+_session_lock = threading.Lock()
+_cache = None
+_archive = None    # 存档模式：成功的响应写入原始网页存档
+_replay = None     # 回放模式：直接从存档返回响应，不访问网络
+_policy = RetryPolicy.RetryPolicy()
+# 这些状态码说明页面确实不存在或无权访问，重试也没有意义
+NO_RETRY_STATUSES = (400, 401, 403, 404, 410)
+
+
+class RequestBlocked(requests.RequestException):
+    """
+    重试策略拒绝发出请求（主机熔断中或已超过运行截止时间）
+    """
+
+# =================== 共享会话 ===================
+
+def create_session(pool_size=POOL_SIZE, headers=None):
+    """
+    创建一个带连接池的 requests.Session，
+    同一主机的请求复用 TCP/TLS 长连接（keep-alive），默认请求头取自 HEADERS。
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS if headers is None else headers)
+    session.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def configure(pool_size=POOL_SIZE, headers=None):
+    """
+    按给定的连接池大小和默认请求头重建共享会话（旧会话的连接会被关闭）。
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(pool_size=pool_size, headers=headers)
+    return _session
+
+def get_session():
+    """
+    返回进程内共享的会话，首次调用时按默认配置创建
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def close():
+    """
+    关闭共享会话并释放连接池
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def enable_cache(cache_dir, max_bytes=HttpCache.MAX_BYTES):
+    """
+    启用磁盘上的条件请求缓存，之后 get() 会自动带上 If-None-Match / If-Modified-Since
+    """
+    global _cache
+    _cache = HttpCache.HttpCache(cache_dir, max_bytes=max_bytes)
+    return _cache
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+def enable_archive(archive_dir=HtmlArchive.ARCHIVE_DIR):
+    """
+    启用原始网页存档，之后 get() 成功取得的页面正文都会写入存档
+    """
+    global _archive
+    _archive = HtmlArchive.open_archive(archive_dir)
+    return _archive
+
+def enable_replay(archive_dir=HtmlArchive.ARCHIVE_DIR):
+    """
+    启用回放模式，之后 get() 只从存档读取页面，不访问网络（存档中没有的 URL 返回 404）
+    """
+    global _replay
+    _replay = HtmlArchive.open_archive(archive_dir)
+    return _replay
+
+def disable_archive():
+    global _archive, _replay
+    _archive = None
+    _replay = None
+
+def set_retry_policy(policy):
+    """
+    设置本次运行共享的重试策略（重试预算、熔断、截止时间和超时）
+    """
+    global _policy
+    _policy = policy
+    return _policy
+
+def get_retry_policy():
+    return _policy
+
+def fetch(url, headers=None, max_attempts=None, timeout=None, **kwargs):
+    """
+    请求 URL 直到返回 200，失败时按指数退避重试，成功返回 response，放弃时返回 None。
+    重试次数受 max_attempts（默认取重试策略的设置）和共享的重试预算限制；
+    404 等确定性错误、主机熔断或超过截止时间时立即放弃。
+    """
+    policy = _policy
+    max_attempts = max_attempts or policy.max_attempts
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = get(url, headers=headers, timeout=timeout, **kwargs)
+            if response.status_code == 200:
+                return response
+            print(f"❌ 尝试 {attempt} 次: 获取 {url} 失败，状态码: {response.status_code}")
+            if response.status_code in NO_RETRY_STATUSES:
+                return None
+        except RequestBlocked as e:
+            print(f"❌ 放弃请求 {url}：{e}")
+            return None
+        except Exception as e:
+            print(f"❌ 尝试 {attempt} 次: 请求 {url} 出错: {e}")
+        if attempt >= max_attempts or not policy.allow_retry(url):
+            print(f"❌ 已尝试 {attempt} 次，仍无法获取 {url}")
+            return None
+        remaining = policy.remaining_time()
+        RateLimit.backoff(attempt, cap=RateLimit.BACKOFF_CAP if remaining is None else min(RateLimit.BACKOFF_CAP, remaining))
+
+def get(url, headers=None, timeout=None, **kwargs):
+    """
+    通过共享会话发送 GET 请求，用法与 requests.get 相同；
+    headers 会与会话默认请求头合并。
+    启用缓存时发送条件请求，服务器返回 304 则返回缓存正文（response.from_cache 为 True）。
+    启用存档时记录成功的页面正文；回放模式下直接返回存档内容。
+    timeout 为 None 时使用重试策略中的 (连接超时, 读取超时)。
+    """
+    if _replay is not None:
+        return _replay.response(url)
+    response = _cached_get(url, headers=headers, timeout=timeout, **kwargs)
+    archive = _archive
+    if archive is not None and response.status_code == 200 and not kwargs.get("stream"):
+        archive.put(url, response.content, response.encoding)
+    return response
+
+def _cached_get(url, headers=None, timeout=None, **kwargs):
+    cache = _cache
+    if cache is None or kwargs.get("stream"):
+        return _send(url, headers=headers, timeout=timeout, **kwargs)
+    request_headers = dict(headers or {})
+    request_headers.update(cache.conditional_headers(url))
+    response = _send(url, headers=request_headers, timeout=timeout, **kwargs)
+    if response.status_code == 304:
+        cached = cache.cached_response(url, response)
+        if cached is not None:
+            return cached
+        # 缓存已被淘汰，去掉校验头重新完整请求
+        response = _send(url, headers=headers, timeout=timeout, **kwargs)
+    cache.store(url, response)
+    return response
+
+def _send(url, headers=None, timeout=None, **kwargs):
+    """
+    经过重试策略和主机限速器发送一次请求，并把结果（耗时、429/503 及 Retry-After、异常）
+    反馈给限速器和熔断器；主机熔断或超过截止时间时抛出 RequestBlocked
+    """
+    policy = _policy
+    reason = policy.start_request(url)
+    if reason:
+        raise RequestBlocked(reason)
+    limiter = RateLimit.limiter_for(url)
+    limiter.acquire()
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout or policy.timeout, **kwargs)
+    except Exception:
+        limiter.record_failure()
+        policy.record_failure(url)
+        raise
+    if response.status_code in (429, 503):
+        limiter.record_failure(RateLimit.parse_retry_after(response.headers.get("Retry-After")))
+        policy.record_failure(url)
+    elif response.status_code >= 500:
+        limiter.record_failure()
+        policy.record_failure(url)
+    else:
+        limiter.record_success(response.elapsed.total_seconds())
+        policy.record_success(url)
+    return response
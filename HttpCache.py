@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import hashlib
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# =================== 配置项 ===================
+MAX_BYTES = 200 * 1024 * 1024   # 缓存总大小上限，超出后按最近使用时间淘汰
+KEPT_HEADERS = ["Content-Type", "ETag", "Last-Modified"]
+
+# =================== 条件请求缓存 ===================
+
+class HttpCache:
+    """
+    持久化的 HTTP 缓存：每个 URL 保存响应正文（.body）和校验信息（.meta，含 ETag / Last-Modified），
+    再次请求时带上 If-None-Match / If-Modified-Since，服务器返回 304 时直接复用缓存正文。
+    """
+
+    def __init__(self, cache_dir, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, ext):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}{ext}")
+
+    def _load_meta(self, url):
+        try:
+            with open(self._path(url, ".meta"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+
+    def conditional_headers(self, url):
+        """
+        返回该 URL 的条件请求头；没有缓存或缓存正文丢失时返回 {}
+        """
+        meta = self._load_meta(url)
+        if not meta or not os.path.exists(self._path(url, ".body")):
+            return {}
+        headers = {}
+        if meta["headers"].get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        return headers
+
+    def cached_response(self, url, response):
+        """
+        服务器返回 304 时，用缓存正文构造一个 200 的 Response（from_cache 为 True），
+        缓存不可用时返回 None
+        """
+        meta = self._load_meta(url)
+        if not meta:
+            return None
+        body_path = self._path(url, ".body")
+        try:
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        # 更新访问时间，淘汰时按最近使用排序
+        os.utime(body_path)
+        cached = requests.models.Response()
+        cached.status_code = 200
+        cached._content = body
+        cached.headers = CaseInsensitiveDict(meta["headers"])
+        cached.encoding = meta.get("encoding")
+        cached.url = url
+        cached.request = response.request
+        cached.elapsed = response.elapsed
+        cached.from_cache = True
+        return cached
+
+    def store(self, url, response):
+        """
+        缓存带有 ETag 或 Last-Modified 的 200 响应
+        """
+        if response.status_code != 200:
+            return
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+        meta = {"url": url, "headers": headers, "encoding": response.encoding}
+        body_path = self._path(url, ".body")
+        old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+        # 先写临时文件再替换，避免中断时留下不完整的缓存
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, body_path)
+        meta_path = self._path(url, ".meta")
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(response.content) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan_size(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir)
+                   if entry.name.endswith(".body"))
+
+    def _evict(self):
+        """
+        按最近使用时间从旧到新删除缓存，直到总大小降到上限的 90% 以下
+        """
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".body")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self._total_bytes <= target:
+                break
+            size = entry.stat().st_size
+            meta_path = entry.path[:-len(".body")] + ".meta"
+            for path in (entry.path, meta_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes -= size
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import threading
+import email.utils
+import urllib.parse
+
+# =================== 配置项 ===================
+RATE = 2.0                  # 初始每秒请求数
+MIN_RATE = 0.2              # 服务器吃紧时最低降到的每秒请求数
+MAX_RATE = 10.0             # 服务器响应良好时最高升到的每秒请求数
+BURST = 4                   # 令牌桶容量，允许的瞬时突发请求数
+HEALTHY_LATENCY = 1.0       # 响应时间低于该秒数视为健康，逐步提速
+SLOW_LATENCY = 4.0          # 响应时间高于该秒数视为吃紧，主动降速
+BACKOFF_BASE = 1.0          # 指数退避的基础秒数
+BACKOFF_CAP = 60.0          # 单次退避的最长秒数
+
+# =================== 自适应令牌桶 ===================
+
+class RateLimiter:
+    """
+    自适应令牌桶限速器：
+    - 每次请求前 acquire() 取一个令牌，令牌按 rate 每秒补充；
+    - 请求健康（延迟低）时逐步提高 rate，延迟高或出错时降低 rate；
+    - 收到 429/503 时按 Retry-After 暂停整个主机的请求。
+    """
+
+    def __init__(self, rate=RATE, burst=BURST, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        阻塞直到取得一个令牌
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def record_success(self, latency):
+        """
+        记录一次成功请求的耗时（秒），据此调整速率
+        """
+        with self._lock:
+            if latency <= HEALTHY_LATENCY:
+                self.rate = min(self.max_rate, self.rate * 1.1)
+            elif latency >= SLOW_LATENCY:
+                self.rate = max(self.min_rate, self.rate * 0.7)
+
+    def record_failure(self, retry_after=None):
+        """
+        记录一次失败请求：速率减半；若服务器给出 Retry-After（秒），在此之前暂停该主机的所有请求
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+def parse_retry_after(value):
+    """
+    解析 Retry-After 头（秒数或 HTTP 日期），返回秒数，无法解析时返回 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, dt.timestamp() - time.time())
+
+
+def backoff(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """
+    第 attempt 次失败后的退避等待：指数增长并加入全抖动（full jitter），
+    避免多个线程在同一时刻一起重试
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    time.sleep(delay)
+    return delay
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def limiter_for(url):
+    """
+    返回 URL 所在主机共享的限速器，同一主机的所有请求共用一个令牌桶
+    """
+    host = urllib.parse.urlsplit(url).netloc
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = RateLimiter()
+        return _limiters[host]
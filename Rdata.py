@@ -1,614 +1,681 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-
-import os
-import re
-import time
-import json
-import hashlib
-import requests
-from bs4 import BeautifulSoup
-import datetime  # 用于解析发布时间
-
-# =================== 配置项 ===================
-BASE_URL = "https://andylee.pro/wp/"
-DATA_DIR = "data"       # 数据存储目录
-PAGE_SIZE = 10              # 每页保存文章数，根据需要调整
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-}
-TARGET_USERS = ["李宗恩", "andy"]  # 针对特定评论作者做高亮处理
-
-# =================== 基础爬虫函数 ===================
-
-def get_article_links(page=1, retries=5):
-    """
-    获取指定页码的所有文章链接（按最新排序）
-    """
-    url = f"{BASE_URL}?paged={page}"
-    attempt = 0
-    while attempt < retries:
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            if attempt > 0:
-                print(f"✅ 获取文章列表成功 (尝试第 {attempt+1} 次)")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"❌ 获取文章列表出错：{e}, 尝试第 {attempt} 次")
-            if attempt == retries:
-                print("❌ 获取文章列表失败，继续执行")
-                return []
-            time.sleep(2)
-    soup = BeautifulSoup(response.text, "html.parser")
-    articles = soup.find_all("h2", class_="entry-title")
-    links = []
-    for article in articles:
-        a_tag = article.find("a")
-        if a_tag and "href" in a_tag.attrs:
-            links.append(a_tag["href"])
-    return links
-
-def get_article_title(article_url, old_title=None, retries=5):
-    """
-    获取文章标题，先查找 <h1 class="post-title">，若无则查找 <h1 class="entry-title">
-    若请求或解析失败，则返回 old_title（如果提供了），否则返回 "未知标题"。
-    成功后打印“✅ 请求文章标题成功”及尝试次数和获取到的标题。
-    """
-    attempt = 0
-    while attempt < retries:
-        try:
-            response = requests.get(article_url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            if attempt > 0:
-                print(f"✅ 请求文章标题成功 (尝试第 {attempt+1} 次)")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"❌ 请求文章标题出错：{e}, 尝试第 {attempt} 次")
-            if attempt == retries:
-                print("❌ 请求文章标题失败，继续执行")
-                return old_title if old_title is not None else "未知标题"
-            time.sleep(2)
-    soup = BeautifulSoup(response.text, "html.parser")
-    title_tag = soup.find("h1", class_="post-title")
-    if not title_tag:
-        title_tag = soup.find("h1", class_="entry-title")
-    result = title_tag.get_text(strip=True) if title_tag else (old_title if old_title is not None else "未知标题")
-    print(f"✅ 请求文章标题成功, 标题为: {result}")
-    return result
-
-def get_article_content(article_url, old_content=None, retries=5):
-    """
-    获取文章正文内容，尝试解析 <div class="entry-content">
-    若请求或解析失败，则返回 old_content（如果提供了），否则返回 "未知内容"。
-    成功后打印“✅ 请求文章内容成功”及尝试次数。
-    """
-    attempt = 0
-    while attempt < retries:
-        try:
-            response = requests.get(article_url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            if attempt > 0:
-                print(f"✅ 请求文章内容成功 (尝试第 {attempt+1} 次)")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"❌ 请求文章内容出错：{e}, 尝试第 {attempt} 次")
-            if attempt == retries:
-                print("❌ 请求文章内容失败，继续执行")
-                return old_content if old_content is not None else "未知内容"
-            time.sleep(2)
-    soup = BeautifulSoup(response.text, "html.parser")
-    content_tag = soup.find("div", class_="entry-content")
-    result = content_tag.decode_contents().strip() if content_tag else (old_content if old_content is not None else "未知内容")
-    print("✅ 请求文章内容成功")
-    return result
-
-def get_article_time(article_url, old_time=None, retries=5):
-    """
-    获取文章发布时间，尝试解析 <span class="entry-date post-date"> 内的发布时间，
-    若请求或解析失败，则返回 old_time（如果提供了），否则返回 ""。
-    成功后打印“✅ 请求文章发布时间成功”及尝试次数。
-    """
-    attempt = 0
-    while attempt < retries:
-        try:
-            response = requests.get(article_url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            if attempt > 0:
-                print(f"✅ 请求文章发布时间成功 (尝试第 {attempt+1} 次)")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"❌ 请求文章发布时间出错：{e}, 尝试第 {attempt} 次")
-            if attempt == retries:
-                print("❌ 请求文章发布时间失败，继续执行")
-                return old_time if old_time is not None else ""
-            time.sleep(2)
-    soup = BeautifulSoup(response.text, "html.parser")
-    time_span = soup.find("span", class_="entry-date post-date")
-    result = ""
-    if time_span:
-        abbr_tag = time_span.find("abbr", class_="published")
-        if abbr_tag and abbr_tag.has_attr("title"):
-            iso_time = abbr_tag["title"]
-            try:
-                dt = datetime.datetime.fromisoformat(iso_time)
-                result = dt.strftime("%Y年%m月%d日 %H:%M")
-            except Exception as e:
-                print("❌ 解析发布时间错误:", e)
-                result = abbr_tag.get_text(strip=True)
-        else:
-            result = time_span.get_text(strip=True)
-    print("✅ 请求文章发布时间成功:", result)
-    return result
-
-def get_comments(article_url, selected_color="white", retries=5):
-    """
-    获取文章的所有评论及其回复，并返回评论数据（列表字典）。
-    如果请求成功但页面中无评论（例如文章本身没有评论），返回空列表并打印相应提示；
-    如果请求始终失败，则返回 None 并打印错误信息。
-    """
-    attempt = 0
-    response = None
-    while attempt < retries:
-        try:
-            response = requests.get(article_url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            if attempt > 0:
-                print(f"✅ 请求文章评论成功 (尝试第 {attempt+1} 次)")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"❌ 请求文章评论出错：{e}, 尝试第 {attempt} 次")
-            if attempt == retries:
-                print("❌ 请求评论失败，继续执行")
-                return None
-            time.sleep(2)
-    soup = BeautifulSoup(response.text, "html.parser")
-    comment_list = soup.find("ol", class_="commentlist")
-    if comment_list:
-        top_comments = comment_list.find_all("li", class_="comment", recursive=False)
-    else:
-        top_comments = soup.find_all("li", class_="comment", recursive=False)
-    results = []
-    index = 0
-    for comment in top_comments:
-        data, index = parse_comment(comment, article_url, selected_color=selected_color, index=index)
-        if data:
-            results.append(data)
-    if response is not None:
-        if len(results) == 0:
-            print("✅ 请求文章评论成功，但文章本身没有评论")
-        else:
-            print(f"✅ 请求文章评论成功, 共获取 {len(results)} 条评论")
-    return results
-
-# ------------------- 以下为评论解析相关 -------------------
-
-def generate_unique_id(article_url, index):
-    """
-    生成唯一的ID，结合文章URL和评论索引
-    """
-    return hashlib.md5(f"{article_url}-{index}".encode('utf-8')).hexdigest()
-
-def parse_comment(comment, article_url, level=0, selected_color="white", index=0):
-    """
-    解析评论及其子评论，并返回数据字典和最新的索引值
-    """
-    author_tag = comment.find("cite", class_="fn")
-    if not author_tag:
-        return None, index
-    comment_user = author_tag.text.strip()
-
-    time_tag = comment.find("small")
-    if time_tag:
-        raw_time = time_tag.get_text(strip=True)
-        match = re.search(r'(\d+)\s*(\d+)\s*月,\s*(\d{4})\s+at\s+(\d+):(\d+)\s*(上午|下午)', raw_time)
-        if match:
-            day = int(match.group(1))
-            month = int(match.group(2))
-            year = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            period = match.group(6)
-            if period == "下午" and hour < 12:
-                hour += 12
-            time_text = f"{year}年{month:02d}月{day:02d}日 {hour:02d}:{minute:02d}"
-        else:
-            time_text = raw_time
-    else:
-        time_text = ""
-
-    comment_text_tag = comment.find("div", class_="comment_text")
-    if not comment_text_tag:
-        return None, index
-
-    # 删除评论中的回复按钮标签
-    for reply in comment_text_tag.find_all("div", class_="reply"):
-        reply.decompose()
-    comment_text = comment_text_tag.decode_contents().strip()
-
-    highlight = (comment_user in TARGET_USERS)
-    current_index = index
-    comment_id = generate_unique_id(article_url, current_index)
-    index = current_index + 1
-
-    data = {
-        "id": comment_id,
-        "author": comment_user,
-        "time": time_text,
-        "content": comment_text,
-        "level": level,
-        "highlight": highlight,
-        "children": []
-    }
-
-    children_container = comment.find("ul", class_="children")
-    if children_container:
-        child_comments = children_container.find_all("li", class_="comment", recursive=False)
-        for child in child_comments:
-            child_data, index = parse_comment(child, article_url, level + 1, selected_color, index)
-            if child_data:
-                data["children"].append(child_data)
-    return data, index
-
-# ------------------- 以下为数据存储与更新逻辑 -------------------
-
-def save_to_json_file(article_data, page, order, fixed=False):
-    """
-    将 article_data 保存为 JSON 文件到相应目录中
-    如果 fixed 为 False，则保存到 data/page{page} 目录下，文件名格式：page{page}_order{order}_{unique}.json
-    如果 fixed 为 True，则保存到 data/fixed 目录下，文件名保持原文件名（若存在）或新生成
-    """
-    unique = generate_unique_id(article_data["article_url"], order)
-    if not fixed:
-        folder = os.path.join(DATA_DIR, f"page{page}")
-        if not os.path.exists(folder):
-            os.makedirs(folder)
-        filename = os.path.join(folder, f"page{page}_order{order}_{unique}.json")
-    else:
-        folder = os.path.join(DATA_DIR, "fixed")
-        if not os.path.exists(folder):
-            os.makedirs(folder)
-        filename = article_data.get("filename")
-        if not filename:
-            filename = os.path.join(folder, f"{unique}.json")
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(article_data, f, ensure_ascii=False, indent=2)
-    return filename
-
-def load_all_local_articles():
-    """
-    遍历 DATA_DIR 下所有 page 文件夹，加载所有 JSON 文件，
-    返回列表，每个元素为字典，包含 article_url, title, content, article_time, comments, page, order, filename 等字段。
-    列表按页码和 order 升序排序（page1_order1 为最新文章）
-    """
-    articles = []
-    if not os.path.exists(DATA_DIR):
-        return articles
-    for folder in os.listdir(DATA_DIR):
-        folder_path = os.path.join(DATA_DIR, folder)
-        if os.path.isdir(folder_path) and folder.startswith("page"):
-            m = re.search(r'page(\d+)', folder)
-            if not m:
-                continue
-            page_num = int(m.group(1))
-            for filename in os.listdir(folder_path):
-                if filename.endswith(".json"):
-                    filepath = os.path.join(folder_path, filename)
-                    try:
-                        with open(filepath, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                        m2 = re.search(r'order(\d+)', filename)
-                        order_num = int(m2.group(1)) if m2 else 0
-                        data["page"] = page_num
-                        data["order"] = order_num
-                        data["filename"] = filepath
-                        articles.append(data)
-                    except Exception as e:
-                        print(f"❌ 加载文件 {filepath} 出错: {e}")
-    articles.sort(key=lambda x: (x["page"], x["order"]))
-    return articles
-
-def load_fixed_articles():
-    """
-    遍历 DATA_DIR/fixed 目录，加载所有 JSON 文件，
-    返回列表，每个元素为字典，包含 article_url, title, content, article_time, comments, filename 等字段。
-    """
-    articles = []
-    fixed_dir = os.path.join(DATA_DIR, "fixed")
-    if not os.path.exists(fixed_dir):
-        return articles
-    for filename in os.listdir(fixed_dir):
-        if filename.endswith(".json"):
-            filepath = os.path.join(fixed_dir, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                data["filename"] = filepath
-                articles.append(data)
-            except Exception as e:
-                print(f"❌ 加载固定页面文件 {filepath} 出错: {e}")
-    return articles
-
-def reassign_and_save_articles(all_articles):
-    """
-    将所有文章按照顺序重新分配页码和 order，
-    清空原 DATA_DIR 下的 JSON 文件后，依 PAGE_SIZE 分页写入文件。
-    """
-    new_articles = all_articles[:]  # 拷贝列表
-    # 清空 DATA_DIR 下所有 JSON 文件（建议事先备份）
-    if os.path.exists(DATA_DIR):
-        for root, dirs, files in os.walk(DATA_DIR):
-            for f in files:
-                # 如果是 fixed 目录下的文件则跳过删除
-                if f.endswith(".json") and "fixed" not in root:
-                    os.remove(os.path.join(root, f))
-    else:
-        os.makedirs(DATA_DIR)
-    for idx, article in enumerate(new_articles):
-        page = idx // PAGE_SIZE + 1
-        order = idx % PAGE_SIZE + 1
-        article["page"] = page
-        article["order"] = order
-        save_to_json_file(article, page, order)
-    print("✅ 重新分配并保存文章完成！")
-
-# =================== 新文章更新相关 ===================
-
-def get_current_website_articles(max_pages=1):
-    """
-    从网站前 max_pages 页中获取文章链接列表，默认只取第一页（新文章总在最前面）
-    """
-    links = []
-    for page in range(1, max_pages + 1):
-        page_links = get_article_links(page)
-        if not page_links:
-            break
-        links.extend(page_links)
-    return links
-
-def fetch_new_articles(new_urls):
-    """
-    针对每个新的文章 URL，爬取标题、正文、发布时间和评论，返回文章数据列表
-    """
-    new_articles = []
-    for url in new_urls:
-        print(f"爬取新文章：{url}")
-        title = get_article_title(url)
-        content = get_article_content(url)
-        article_time = get_article_time(url)
-        comments = get_comments(url)
-        article_data = {
-            "article_url": url,
-            "title": title,
-            "content": content,
-            "article_time": article_time,
-            "comments": comments,  # 如果请求成功但无评论，则 comments 为 []（有效结果）
-            "timestamp": time.time()
-        }
-        new_articles.append(article_data)
-        time.sleep(2)
-    return new_articles
-
-def update_new_articles():
-    """
-    检查网站最新文章与本地 data/page 第一篇是否一致，
-    若有新文章则新文章始终插入在最前面，原文章后移，
-    且只有当 n 篇新文章全部都成功爬取到有效标题、正文、发布时间和评论
-    （即标题不为 “未知标题”，内容不为 “未知内容”，发布时间不为空，且评论数据不为 None；注意：如果文章本身无评论，返回 [] 是有效结果）时，
-    才将 n 篇新文章合并原有文章后重新分配页码和顺序写入文件。
-    """
-    print("检查网站最新文章是否有更新……")
-    # 对获取最新文章链接给予最多 5 次机会
-    attempt = 0
-    website_links = []
-    while attempt < 5:
-        website_links = get_current_website_articles(max_pages=1)
-        if website_links:
-            print(f"✅ 成功获取网站最新文章链接 (尝试第 {attempt+1} 次)")
-            break
-        attempt += 1
-        time.sleep(5)
-    if not website_links:
-        print("❌ 5 次尝试后仍无法获取网站最新文章链接")
-        return
-
-    local_articles = load_all_local_articles()
-    first_local_url = local_articles[0]["article_url"] if local_articles else None
-
-    new_count = 0
-    for link in website_links:
-        if link == first_local_url:
-            break
-        new_count += 1
-
-    if new_count == 0:
-        print("✅ 本地数据已经是最新的，无需更新文章。")
-        return
-    else:
-        print(f"✅ 检测到 {new_count} 篇新文章。")
-        new_urls = website_links[0:new_count]
-
-    # 对 n 篇新文章的爬取，给予最多 5 次机会，要求全部文章都爬取成功
-    attempt = 0
-    all_valid = False
-    new_articles = []
-    while attempt < 5:
-        new_articles = fetch_new_articles(new_urls)
-        # 仅当 get_comments 返回 None 才视为请求失败；若返回 [] 则认为文章本身无评论，是有效结果
-        invalid_articles = [article for article in new_articles if article["title"] == "未知标题"
-                            or article["content"] == "未知内容"
-                            or not article["article_time"]
-                            or article["comments"] is None]
-        if not invalid_articles:
-            all_valid = True
-            break
-        else:
-            print(f"第 {attempt+1} 次尝试爬取新文章未成功，问题文章: {', '.join([article['article_url'] for article in invalid_articles])}")
-            attempt += 1
-            time.sleep(5)
-    if not all_valid:
-        print("❌ 5 次尝试后仍有文章爬取不成功，新文章不写入文件")
-        return
-
-    # 如果重新爬取后全部成功，则打印成功标志
-    print("✅ 新文章全部爬取成功！")
-
-    # 全部 n 篇新文章均爬取成功，合并新文章和旧文章，并重新分配页码后写入文件
-    merged_articles = new_articles + local_articles
-    reassign_and_save_articles(merged_articles)
-
-# =================== 近期留言更新（按文章标题和发布时间匹配） ===================
-
-def get_recent_comment_articles_collection(retries=5):
-    """
-    直接爬取整个近期评论区域，提取每条评论中涉及的文章标题和链接，
-    并构造一个字典，键为文章标题，值为对应的文章链接。
-    假设近期评论区域在 <aside id="recent-comments-5"> 内，
-    每个评论项在 <li class="recentcomments"> 中，
-    且文章链接在该 li 中的第二个 <a> 标签内（如果存在多个 <a> 标签，否则为第一个）。
-    给予最多 retries 次机会
-    """
-    url = BASE_URL  # 以首页为例
-    attempt = 0
-    while attempt < retries:
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            print(f"✅ 成功获取近期评论区域 (尝试第 {attempt+1} 次)")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"❌ 获取近期评论区域出错：{e}, 尝试第 {attempt} 次")
-            if attempt == retries:
-                print("❌ 5 次尝试后仍无法获取近期评论区域")
-                return {}
-            time.sleep(2)
-    soup = BeautifulSoup(response.text, "html.parser")
-    recent_comments = soup.find("aside", id="recent-comments-5")
-    if not recent_comments:
-        print("✅ 未找到近期评论区域")
-        return {}
-    title_to_link = {}
-    comment_items = recent_comments.find_all("li", class_="recentcomments")
-    for li in comment_items:
-        a_tags = li.find_all("a", href=True)
-        # 如果有两个或更多链接，取第二个为文章标题链接；否则取第一个
-        if len(a_tags) >= 2:
-            a_tag = a_tags[1]
-        elif a_tags:
-            a_tag = a_tags[0]
-        else:
-            continue
-        title = a_tag.get_text(strip=True)
-        link = a_tag["href"]
-        if title not in title_to_link:
-            title_to_link[title] = link
-    return title_to_link
-
-def update_recent_comments_by_title():
-    """
-    对于近期留言中涉及的文章，
-    先爬取整个近期评论区域得到【标题, 链接】集合，
-    然后在本地数据中根据标题和文章发布时间查找对应文章（先在 data/page 中查找，若找不到再在 data/fixed 中查找），
-    如果找到则重新爬取该文章的数据（包括标题、正文、发布时间和评论），
-    只有当爬取到的数据有效时才更新，否则保留原数据。
-    如果爬取到的文章发布时间为空，则退回到用文章 URL 进行匹配。
-    """
-    print("开始检查近期留言更新（按文章标题和发布时间匹配）……")
-    title_to_url = get_recent_comment_articles_collection()
-    if not title_to_url:
-        print("近期留言未获取到有效的文章数据。")
-        return
-
-    local_articles = load_all_local_articles()  # data/page 下的文章
-    fixed_articles = load_fixed_articles()        # data/fixed 下的文章
-    updated = 0
-    for title, url in title_to_url.items():
-        # 先获取网页上最新的发布时间，用于匹配
-        new_article_time = get_article_time(url, old_time="")
-        match_found = None
-        location = ""
-        # 如果爬取到发布时间，则同时匹配标题和发布时间
-        if new_article_time:
-            for article in local_articles:
-                if article["title"] == title and article.get("article_time", "") == new_article_time:
-                    match_found = article
-                    location = "常规页面"
-                    break
-            if not match_found:
-                for article in fixed_articles:
-                    if article["title"] == title and article.get("article_time", "") == new_article_time:
-                        match_found = article
-                        location = "固定页面"
-                        break
-        # 如果发布时间为空或匹配失败，则退回到使用 URL 进行匹配
-        if not match_found:
-            for article in local_articles:
-                if article.get("article_url", "") == url:
-                    match_found = article
-                    location = "常规页面"
-                    break
-            if not match_found:
-                for article in fixed_articles:
-                    if article.get("article_url", "") == url:
-                        match_found = article
-                        location = "固定页面"
-                        break
-        if match_found:
-            if location == "常规页面":
-                print(f"📌 正在爬取第 {match_found.get('page', '?')} 页 第 {match_found.get('order', '?')} 篇文章：{title}")
-            else:
-                print(f"📌 正在爬取固定页面：{title}")
-            new_title = get_article_title(url, old_title=match_found["title"])
-            if new_title != "未知标题":
-                match_found["title"] = new_title
-            else:
-                print(f"❌ 标题爬取失败，保留原有标题：{match_found['title']}")
-            new_content = get_article_content(url, old_content=match_found.get("content"))
-            if new_content != "未知内容":
-                match_found["content"] = new_content
-            else:
-                print(f"❌ 正文爬取失败，保留原有内容")
-            new_time = get_article_time(url, old_time=match_found.get("article_time"))
-            if new_time:
-                match_found["article_time"] = new_time
-            else:
-                print(f"❌ 发布时间爬取失败，保留原有发布时间")
-            new_comments = get_comments(url)
-            if new_comments is None:
-                print(f"❌ 评论爬取失败：{title}，保留原有评论")
-            else:
-                match_found["comments"] = new_comments
-                match_found["timestamp"] = time.time()
-            try:
-                with open(match_found["filename"], "w", encoding="utf-8") as f:
-                    json.dump(match_found, f, ensure_ascii=False, indent=2)
-                print(f"✅ 更新完成：{location} - {match_found['title']}")
-                updated += 1
-            except Exception as e:
-                print(f"❌ 保存更新失败（标题：{match_found['title']}）：{e}")
-            time.sleep(2)
-        else:
-            print(f"❌ 未在本地数据中找到匹配文章（标题及发布时间不匹配）：{title}")
-    print(f"✅ 近期留言按标题和发布时间匹配更新完成，共更新 {updated} 篇文章。")
-
-# =================== 主更新流程 ===================
-
-def main_update():
-    """
-    主流程：
-    1. 检查网站是否有新文章，如有则更新文章并重新分配页码与顺序；
-    2. 检查近期留言中涉及的文章，按文章标题和发布时间匹配更新其数据；
-    3. 打印更新完成提示。
-    """
-    update_new_articles()
-    update_recent_comments_by_title()
-    print("✅ 所有更新完成！")
-
-if __name__ == "__main__":
-    main_update()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import Http  # 共享的连接池会话，请求间隔由 RateLimit 中的主机限速器控制
+import RateLimit
+import RetryPolicy
+import WpApi  # WordPress REST API 批量获取
+import CommentFeed  # 评论 RSS 变更检测
+import Sitemap  # 站点地图文章发现
+import HtmlArchive  # 原始网页存档，用于离线回放和重新解析
+import HtmlParse  # 解析器后端与区域解析
+import Extract  # 与 CrawlAll 共用的页面字段和评论提取
+import Timestamps  # 时间戳与排序键
+import ArticleStore  # 按 URL 存储文章，显示顺序和分页记录在单独的索引中
+import SqliteStore  # 可选的 SQLite 存储
+import DataPack  # 供生成 HTML 读取的打包文件
+
+# =================== 配置项 ===================
+BASE_URL = "https://andylee.pro/wp/"
+DATA_DIR = "data"       # 数据存储目录
+PAGE_SIZE = 10              # 每页保存文章数，根据需要调整
+STORAGE_BACKEND = "json"    # 文章存储方式："json" 每篇文章一个 JSON 文件（见 ArticleStore.py）；"sqlite" 存入 SQLITE_FILE（见 SqliteStore.py）
+SQLITE_FILE = os.path.join(DATA_DIR, SqliteStore.DB_NAME)  # SQLite 数据库文件，首次使用时自动导入 DATA_DIR 中已有的 JSON 数据
+CHANGE_LOG = True           # json 存储时，已有文章的更新只追加到变更日志（见 ChangeLog.py），累计过多时压缩写回文章文件
+COMPACT_THRESHOLD = 1024 * 1024  # 变更日志累计超过该字节数时，更新结束后（打包和生成 HTML 之前）压缩
+PACK_ARCHIVE = True         # json 存储时，更新结束后增量更新打包文件（见 DataPack.py），Ghtml 从中读取全部文章
+HEADERS = Http.HEADERS  # 默认请求头与共享会话保持一致
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, ".http_cache")  # 条件请求缓存目录（ETag / Last-Modified）
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 缓存总大小上限
+HTML_ARCHIVE_DIR = None     # 原始网页存档目录，设为 HtmlArchive.ARCHIVE_DIR 等路径即开启存档
+REPLAY = False              # 为 True 时不访问网络，从 HTML_ARCHIVE_DIR 回放页面
+FETCH_BACKEND = "html"      # 文章获取方式："html" 抓取网页；"api" 优先使用 WordPress REST API，不可用时退回网页抓取
+CHANGE_DETECTOR = "feed"    # 近期留言检测方式："feed" 使用评论 RSS 并记录高水位；"widget" 爬取首页近期评论区域；
+                            # "api" 使用 REST API 的 after / modified_after 过滤，同时找出被修改过的文章
+COMMENT_FEED_STATE_FILE = os.path.join(DATA_DIR, "comment_feed_state.txt")  # 评论 feed 上次处理到的位置
+REST_API_STATE_FILE = os.path.join(DATA_DIR, "rest_api_state.txt")  # REST API 上次处理到的评论时间和文章修改时间
+DISCOVERY = "listing"       # 新文章发现方式："listing" 翻阅文章列表页；"sitemap" 读取站点地图并比对 lastmod
+SITEMAP_STATE_FILE = os.path.join(DATA_DIR, "sitemap_state.txt")  # 站点地图中每个页面上次的 lastmod
+RUN_DEADLINE = 30 * 60      # 一次更新最长运行秒数，超时后剩余请求直接放弃，None 表示不限
+COMMENTS_ONLY_REFRESH = True  # 近期留言更新时只通过评论接口刷新评论，不可用时退回到请求完整页面
+WORKERS = 4                 # 并行爬取文章的线程数，设为 1 则逐篇爬取
+
+# =================== 基础爬虫函数 ===================
+
+def get_article_links(page=1, retries=5):
+    """
+    获取指定页码的所有文章链接（按最新排序）
+    """
+    url = f"{BASE_URL}?paged={page}"
+    response = Http.fetch(url, headers=HEADERS, max_attempts=retries)
+    if response is None:
+        print("❌ 获取文章列表失败，继续执行")
+        return []
+    return Extract.extract_links(HtmlParse.response_soup(response, regions=HtmlParse.LISTING_REGIONS))
+
+def fetch_article_page(article_url, retries=5):
+    """
+    请求文章页面并返回解析树，给予最多 retries 次机会（同时受本次运行的重试预算和熔断限制），始终失败返回 None。
+    解析树只包含标题、发布时间、正文和评论区域。
+    """
+    response = Http.fetch(article_url, headers=HEADERS, max_attempts=retries)
+    if response is None:
+        print("❌ 请求文章页面失败，继续执行")
+        return None
+    return HtmlParse.response_soup(response, regions=HtmlParse.ARTICLE_REGIONS)
+
+def get_article_snapshot(article_url, selected_color="white", retries=5):
+    """
+    文章页面快照：只请求并解析一次页面，从同一棵解析树中同时提取标题、正文、发布时间和评论。
+    返回字典 {article_url, title, content, article_time, comments}，
+    页面中缺失的标题、正文为 None，发布时间为 ""；请求始终失败时返回 None。
+    """
+    soup = fetch_article_page(article_url, retries=retries)
+    if soup is None:
+        return None
+    snapshot = Extract.build_snapshot(soup, article_url, selected_color=selected_color)
+    print(f"✅ 请求文章页面成功, 标题为: {snapshot['title']}, 发布时间: {snapshot['article_time']}, "
+          f"共获取 {len(snapshot['comments'])} 条评论")
+    return snapshot
+
+# ------------------- 以下为数据存储与更新逻辑 -------------------
+
+_store = None   # 本次运行使用的文章存储，见 article_store()
+
+def article_store():
+    """
+    返回本次运行使用的文章存储，第一次调用时打开，之后一直沿用（清单只读取一次），运行结束时由 close_article_store() 关闭：
+    STORAGE_BACKEND 为 "sqlite" 时打开 SQLITE_FILE；
+    否则打开 DATA_DIR 下按 URL 存储的文章，发现旧版 data/page* 目录时先迁移（只在打开时进行一次）
+    """
+    global _store
+    if _store is None:
+        if STORAGE_BACKEND == "sqlite":
+            _store = SqliteStore.open_store(SQLITE_FILE, page_size=PAGE_SIZE, data_dir=DATA_DIR)
+        else:
+            _store = ArticleStore.open_store(DATA_DIR, page_size=PAGE_SIZE, change_log=CHANGE_LOG)
+    return _store
+
+def close_article_store():
+    """
+    结束本次运行对文章存储的使用（SQLite 存储时关闭数据库连接），下次调用 article_store() 时重新打开
+    """
+    global _store
+    if _store is not None and STORAGE_BACKEND == "sqlite":
+        _store.close()
+    _store = None
+
+def compact_change_log(force=False):
+    """
+    变更日志累计超过 COMPACT_THRESHOLD（或 force 为 True）时，用本次运行的存储同步压缩，返回写回的文章数；
+    不需要压缩时返回 None
+    """
+    if STORAGE_BACKEND == "sqlite":
+        return None
+    store = article_store()
+    pending = store.log.pending_bytes()
+    if not pending or (pending < COMPACT_THRESHOLD and not force):
+        return None
+    print(f"📌 变更日志已累计 {pending} 字节，压缩中...")
+    return store.compact()
+
+def save_to_json_file(article_data, fixed=False):
+    """
+    将 article_data 保存为 JSON 文件到相应目录中
+    如果 fixed 为 False，则保存到 data/articles 目录下，文件名由文章 URL 决定（见 ArticleStore.py），
+    页码和 order 只记录在 data/index.json 中，不写入文章文件
+    如果 fixed 为 True，则保存到 data/fixed 目录下，文件名保持原文件名（若存在）或新生成
+    STORAGE_BACKEND 为 "sqlite" 时写入数据库，返回数据库文件路径
+    """
+    Timestamps.stamp_article(article_data)
+    if STORAGE_BACKEND == "sqlite":
+        return article_store().save_article(article_data, fixed=fixed)
+    if not fixed:
+        return article_store().save_article(article_data)
+    folder = os.path.join(DATA_DIR, "fixed")
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    filename = article_data.get("filename")
+    if not filename:
+        filename = os.path.join(folder, f"{Extract.generate_unique_id(article_data['article_url'], 0)}.json")
+    ArticleStore.write_article(filename, article_data)
+    article_data["filename"] = filename
+    return filename
+
+def save_article_file(article):
+    """
+    把已加载的文章写回原文件（page、order、filename 等只在内存中使用的字段不写入）
+    """
+    save_article_files([article])
+
+def save_article_files(articles):
+    """
+    把多篇已加载的文章写回存储，SQLite 存储时在一个事务中写入
+    """
+    store = article_store()
+    if STORAGE_BACKEND == "sqlite":
+        store.save_articles(articles)
+        return
+    # 常规文章经由 ArticleStore 写回，同时更新清单中的标题、评论数等；固定页面直接写回原文件
+    regular = [article for article in articles if os.path.dirname(article["filename"]) == store.articles_dir]
+    store.save_articles(regular)
+    for article in articles:
+        if os.path.dirname(article["filename"]) != store.articles_dir:
+            ArticleStore.write_article(article["filename"], article)
+
+def load_all_local_articles():
+    """
+    按 data/index.json 清单中的顺序加载 data/articles 下的所有文章，
+    返回列表，每个元素为字典，包含 article_url, title, content, article_time, comments, page, order, filename 等字段。
+    page 和 order 由文章在清单中的位置算出（page1_order1 为最新文章）。
+    文章为按需读取的 LazyArticle：URL、标题、发布时间、页码等只读清单，访问正文或评论时才读取文章文件
+    """
+    return article_store().load_all(lazy=True)
+
+def load_fixed_articles():
+    """
+    加载 DATA_DIR/fixed 目录（SQLite 存储时为数据库）中的固定页面，
+    返回列表，每个元素为字典，包含 article_url, title, content, article_time, comments, filename 等字段。
+    """
+    if STORAGE_BACKEND == "sqlite":
+        return article_store().load_fixed()
+    return ArticleStore.load_fixed(DATA_DIR)
+
+def reassign_and_save_articles(all_articles):
+    """
+    将所有文章按照顺序重新分配页码和 order 并写入索引 data/index.json（SQLite 存储时为 position 列）。
+    文章按 URL 存储、与位置无关，只写出还没有保存过的文章（即新文章），已有文章不动。
+    """
+    store = article_store()
+    new_articles = [article for article in all_articles if not store.contains(article["article_url"])]
+    for article in new_articles:
+        Timestamps.stamp_article(article)
+    store.save_articles(new_articles)
+    store.save_order(all_articles)
+    print(f"✅ 重新分配并保存文章完成！（写入 {len(new_articles)} 篇文章和顺序索引）")
+
+# =================== 新文章更新相关 ===================
+
+def get_current_website_articles(max_pages=1):
+    """
+    从网站前 max_pages 页中获取文章链接列表，默认只取第一页（新文章总在最前面）
+    """
+    links = []
+    for page in range(1, max_pages + 1):
+        page_links = get_article_links(page)
+        if not page_links:
+            break
+        links.extend(page_links)
+    return links
+
+def fetch_snapshots(urls, workers=WORKERS):
+    """
+    请求多篇文章的页面快照，返回字典 {url: 快照或 None}。
+    FETCH_BACKEND 为 "api" 时先通过 REST API 批量获取，接口不可用或找不到的文章再抓取 HTML；
+    HTML 抓取时 workers 大于 1 使用线程池并行请求，否则逐篇请求；请求间隔都由主机限速器控制。
+    """
+    urls = list(dict.fromkeys(urls))  # 去重并保持顺序
+    snapshots = {}
+    if FETCH_BACKEND == "api":
+        try:
+            snapshots = WpApi.fetch_snapshots(BASE_URL, urls)
+            print(f"✅ 通过 REST API 获取 {len(snapshots)} 篇文章")
+        except WpApi.ApiUnavailable as e:
+            print(f"❌ REST API 不可用，退回 HTML 抓取：{e}")
+    remaining = [url for url in urls if url not in snapshots]
+    if workers <= 1:
+        for url in remaining:
+            snapshots[url] = get_article_snapshot(url)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            snapshots.update(zip(remaining, executor.map(get_article_snapshot, remaining)))
+    return snapshots
+
+def fetch_comment_trees(urls):
+    """
+    只获取评论的轻量刷新：通过评论接口批量获取多篇文章的嵌套评论，不下载文章正文和主题页面。
+    返回 {url: 评论列表}；接口不可用或评论回复关系不完整的文章不在结果中，需要请求完整页面。
+    """
+    try:
+        trees = WpApi.fetch_comment_trees(BASE_URL, list(dict.fromkeys(urls)))
+    except WpApi.ApiUnavailable as e:
+        print(f"❌ 评论接口不可用，改为请求完整页面：{e}")
+        return {}
+    print(f"✅ 通过评论接口获取 {len(trees)} 篇文章的评论")
+    return trees
+
+def fetch_new_articles(new_urls, workers=WORKERS):
+    """
+    针对每个新的文章 URL，请求一次页面快照得到标题、正文、发布时间和评论，返回文章数据列表（顺序与 new_urls 相同）
+    workers 大于 1 时使用线程池并行爬取
+    """
+    for url in new_urls:
+        print(f"爬取新文章：{url}")
+    snapshots = fetch_snapshots(new_urls, workers=workers)
+    new_articles = []
+    for url in new_urls:
+        snapshot = snapshots[url] or {}
+        title = snapshot.get("title")
+        content = snapshot.get("content")
+        article_data = {
+            "article_url": url,
+            "title": title if title is not None else "未知标题",
+            "content": content if content is not None else "未知内容",
+            "article_time": snapshot.get("article_time", ""),
+            "article_epoch": Timestamps.display_to_epoch(snapshot.get("article_time", "")),
+            "comments": snapshot.get("comments"),  # 如果请求成功但无评论，则 comments 为 []（有效结果）
+            "timestamp": time.time()
+        }
+        new_articles.append(article_data)
+    return new_articles
+
+def fetch_valid_new_articles(new_urls, retries=5):
+    """
+    爬取 n 篇新文章，给予最多 retries 次机会，要求全部文章都爬取成功
+    （标题不为 “未知标题”，内容不为 “未知内容”，发布时间不为空，且评论数据不为 None），
+    全部成功返回文章数据列表，否则返回 None。
+    """
+    attempt = 0
+    while attempt < retries:
+        new_articles = fetch_new_articles(new_urls)
+        # 仅当快照中的 comments 为 None 才视为请求失败；为 [] 则认为文章本身无评论，是有效结果
+        invalid_articles = [article for article in new_articles if article["title"] == "未知标题"
+                            or article["content"] == "未知内容"
+                            or not article["article_time"]
+                            or article["comments"] is None]
+        if not invalid_articles:
+            # 如果重新爬取后全部成功，则打印成功标志
+            print("✅ 新文章全部爬取成功！")
+            return new_articles
+        print(f"第 {attempt+1} 次尝试爬取新文章未成功，问题文章: {', '.join([article['article_url'] for article in invalid_articles])}")
+        attempt += 1
+        if Http.get_retry_policy().gave_up(BASE_URL):
+            break
+        RateLimit.backoff(attempt + 1)
+    print(f"❌ {attempt} 次尝试后仍有文章爬取不成功，新文章不写入文件")
+    return None
+
+def update_new_articles():
+    """
+    检查网站最新文章与本地第一篇（data/index.json 中的第一篇）是否一致，
+    若有新文章则新文章始终插入在最前面，原文章后移，
+    且只有当 n 篇新文章全部都成功爬取到有效标题、正文、发布时间和评论
+    （即标题不为 “未知标题”，内容不为 “未知内容”，发布时间不为空，且评论数据不为 None；注意：如果文章本身无评论，返回 [] 是有效结果）时，
+    才将 n 篇新文章合并原有文章后重新分配页码和顺序写入文件。
+    """
+    print("检查网站最新文章是否有更新……")
+    # 对获取最新文章链接给予最多 5 次机会
+    attempt = 0
+    website_links = []
+    while attempt < 5:
+        website_links = get_current_website_articles(max_pages=1)
+        if website_links:
+            print(f"✅ 成功获取网站最新文章链接 (尝试第 {attempt+1} 次)")
+            break
+        attempt += 1
+        if Http.get_retry_policy().gave_up(BASE_URL):
+            break
+        RateLimit.backoff(attempt + 1)
+    if not website_links:
+        print(f"❌ {attempt} 次尝试后仍无法获取网站最新文章链接")
+        return
+
+    local_articles = load_all_local_articles()
+    first_local_url = local_articles[0]["article_url"] if local_articles else None
+
+    new_count = 0
+    for link in website_links:
+        if link == first_local_url:
+            break
+        new_count += 1
+
+    if new_count == 0:
+        print("✅ 本地数据已经是最新的，无需更新文章。")
+        return
+    else:
+        print(f"✅ 检测到 {new_count} 篇新文章。")
+        new_urls = website_links[0:new_count]
+
+    new_articles = fetch_valid_new_articles(new_urls)
+    if new_articles is None:
+        return
+
+    # 全部 n 篇新文章均爬取成功，合并新文章和旧文章，并重新分配页码后写入文件
+    merged_articles = new_articles + local_articles
+    reassign_and_save_articles(merged_articles)
+
+def update_from_sitemap(workers=WORKERS):
+    """
+    站点地图模式：读取站点地图并与上次记录的 lastmod 比对，只处理新增或修改过的文章。
+    新文章全部爬取成功后按发布时间从新到旧插入最前面并重新分配页码；
+    已修改的文章在原文件中原地更新。全部处理成功后才保存新的记录。
+    没有可用站点地图时退回到 update_new_articles()。
+    """
+    print("通过站点地图检查文章更新……")
+    local_articles = load_all_local_articles()
+    fixed_articles = load_fixed_articles()
+    by_url = {article["article_url"]: article for article in local_articles + fixed_articles}
+    try:
+        new_urls, modified_urls, state = Sitemap.discover_changes(BASE_URL, SITEMAP_STATE_FILE, known_urls=by_url)
+    except Exception as e:
+        print(f"❌ 读取站点地图失败，改为检查文章列表：{e}")
+        update_new_articles()
+        return
+    # 固定页面只在 data/fixed 中原地更新，不作为新文章插入
+    new_urls = [url for url in new_urls if "page_id=" not in url]
+    ok = True
+    if new_urls:
+        print(f"✅ 检测到 {len(new_urls)} 篇新文章。")
+        new_articles = fetch_valid_new_articles(new_urls)
+        if new_articles is None:
+            ok = False
+        else:
+            new_articles.sort(key=lambda article: Timestamps.sort_key(article["article_epoch"], descending=True))
+            reassign_and_save_articles(new_articles + local_articles)
+    modified_urls = [url for url in modified_urls if url in by_url]
+    if modified_urls:
+        print(f"✅ 检测到 {len(modified_urls)} 篇文章有修改。")
+        snapshots = fetch_snapshots(modified_urls, workers=workers)
+        for url in modified_urls:
+            article = by_url[url]
+            location = "固定页面" if article.get("fixed") or "page" not in article else "常规页面"
+            if not refresh_local_article(article, snapshots[url], location):
+                ok = False
+    if ok:
+        Sitemap.save_state(SITEMAP_STATE_FILE, state)
+    else:
+        print("❌ 有文章未处理成功，下次运行将重新检查")
+
+# =================== 近期留言更新（按文章标题和发布时间匹配） ===================
+
+SNAPSHOT_FIELDS = ("title", "content", "article_time", "comments")
+
+def refresh_local_article(article, snapshot, location, fields=SNAPSHOT_FIELDS):
+    """
+    用快照中有效的字段更新本地文章并写回原文件，无效字段保留原数据。
+    fields 为需要更新的字段，只刷新评论时传入 ("comments",)。
+    评论获取失败或保存失败返回 False。
+    """
+    title = article["title"]
+    ok = True
+    snapshot = snapshot or {}
+    if "title" in fields:
+        new_title = snapshot.get("title")
+        if new_title is not None:
+            article["title"] = new_title
+        else:
+            print(f"❌ 标题爬取失败，保留原有标题：{article['title']}")
+    if "content" in fields:
+        new_content = snapshot.get("content")
+        if new_content is not None:
+            article["content"] = new_content
+        else:
+            print(f"❌ 正文爬取失败，保留原有内容")
+    if "article_time" in fields:
+        new_time = snapshot.get("article_time")
+        if new_time:
+            article["article_time"] = new_time
+        else:
+            print(f"❌ 发布时间爬取失败，保留原有发布时间")
+    new_comments = snapshot.get("comments")
+    if new_comments is None:
+        print(f"❌ 评论爬取失败：{title}，保留原有评论")
+        ok = False
+    else:
+        article["comments"] = new_comments
+        article["timestamp"] = time.time()
+    Timestamps.stamp_article(article)
+    try:
+        save_article_file(article)
+        print(f"✅ 更新完成：{location} - {article['title']}")
+    except Exception as e:
+        print(f"❌ 保存更新失败（标题：{article['title']}）：{e}")
+        ok = False
+    return ok
+
+def get_recent_comment_articles_collection(retries=5):
+    """
+    直接爬取整个近期评论区域，提取每条评论中涉及的文章标题和链接，
+    并构造一个字典，键为文章标题，值为对应的文章链接。
+    假设近期评论区域在 <aside id="recent-comments-5"> 内，
+    每个评论项在 <li class="recentcomments"> 中，
+    且文章链接在该 li 中的第二个 <a> 标签内（如果存在多个 <a> 标签，否则为第一个）。
+    给予最多 retries 次机会
+    """
+    url = BASE_URL  # 以首页为例
+    response = Http.fetch(url, headers=HEADERS, max_attempts=retries)
+    if response is None:
+        print("❌ 多次尝试后仍无法获取近期评论区域")
+        return {}
+    print("✅ 成功获取近期评论区域")
+    soup = HtmlParse.response_soup(response, regions=HtmlParse.RECENT_COMMENTS_REGIONS)
+    recent_comments = soup.find("aside", id="recent-comments-5")
+    if not recent_comments:
+        print("✅ 未找到近期评论区域")
+        return {}
+    title_to_link = {}
+    comment_items = recent_comments.find_all("li", class_="recentcomments")
+    for li in comment_items:
+        a_tags = li.find_all("a", href=True)
+        # 如果有两个或更多链接，取第二个为文章标题链接；否则取第一个
+        if len(a_tags) >= 2:
+            a_tag = a_tags[1]
+        elif a_tags:
+            a_tag = a_tags[0]
+        else:
+            continue
+        title = a_tag.get_text(strip=True)
+        link = a_tag["href"]
+        if title not in title_to_link:
+            title_to_link[title] = link
+    return title_to_link
+
+def update_recent_comments_by_title(workers=WORKERS):
+    """
+    对于近期留言中涉及的文章，
+    先爬取整个近期评论区域得到【标题, 链接】集合，
+    然后在本地数据中根据标题和文章发布时间查找对应文章（先在 data/articles 中查找，若找不到再在 data/fixed 中查找），
+    每篇文章只请求一次页面快照，同时用于匹配和更新，
+    如果找到则用快照中的数据（包括标题、正文、发布时间和评论）更新，
+    只有当爬取到的数据有效时才更新，否则保留原数据。
+    如果爬取到的文章发布时间为空，则退回到用文章 URL 进行匹配。
+    workers 大于 1 时先用线程池并行请求所有快照，匹配与写入仍在主线程中逐篇进行。
+    CHANGE_DETECTOR 为 "feed" 时改用评论 feed 找出上次运行后有新评论的文章，
+    为 "api" 时改用 REST API 找出上次运行后有新评论或被修改过的文章，
+    全部更新成功后才推进高水位标记；feed 或接口不可用时退回到近期评论区域。
+    COMMENTS_ONLY_REFRESH 为 True 时先通过评论接口只刷新评论（按 URL 匹配），
+    接口不可用或回复关系不完整的文章仍请求完整页面。
+    """
+    print("开始检查近期留言更新（按文章标题和发布时间匹配）……")
+    feed_state = None
+    title_to_url = None
+    modified_urls = set()   # 被修改过的文章，需要请求完整页面
+    state_file = REST_API_STATE_FILE if CHANGE_DETECTOR == "api" else COMMENT_FEED_STATE_FILE
+    if CHANGE_DETECTOR == "feed":
+        result = CommentFeed.detect_changed_articles(BASE_URL, COMMENT_FEED_STATE_FILE)
+        if result is None:
+            print("❌ 评论 feed 不可用，改为爬取近期评论区域")
+        else:
+            title_to_url, feed_state = result
+    elif CHANGE_DETECTOR == "api":
+        try:
+            title_to_url, feed_state, modified_urls = WpApi.detect_changed_articles(
+                BASE_URL, CommentFeed.load_state(state_file))
+        except WpApi.ApiUnavailable as e:
+            print(f"❌ REST API 不可用（{e}），改为爬取近期评论区域")
+    if title_to_url is None:
+        title_to_url = get_recent_comment_articles_collection()
+    if not title_to_url:
+        print("近期留言未获取到有效的文章数据。")
+        if feed_state is not None:
+            CommentFeed.save_state(state_file, feed_state)
+        return
+
+    if STORAGE_BACKEND == "sqlite":
+        # 只按标题和 URL 查询可能匹配的文章（走索引），不加载整个存档
+        local_articles, fixed_articles = article_store().find_candidates(title_to_url.keys(), title_to_url.values())
+    else:
+        local_articles = load_all_local_articles()  # data/articles 下的文章
+        fixed_articles = load_fixed_articles()        # data/fixed 下的文章
+    # 只刷新评论时先通过评论接口获取，被修改过的文章、接口不可用或回复关系不完整的文章再请求完整页面
+    comment_urls = [url for url in title_to_url.values() if url not in modified_urls]
+    comment_trees = fetch_comment_trees(comment_urls) if COMMENTS_ONLY_REFRESH and comment_urls else {}
+    # 其余文章每篇请求一次页面快照，其中的发布时间用于匹配，其余字段用于更新
+    full_urls = [url for url in title_to_url.values() if url not in comment_trees]
+    snapshots = fetch_snapshots(full_urls, workers=workers)
+    updated = 0
+    failed = 0
+    for title, url in title_to_url.items():
+        fields = SNAPSHOT_FIELDS
+        if url in comment_trees:
+            # 只有评论，没有发布时间，按 URL 匹配本地文章
+            snapshot = {"comments": comment_trees[url]}
+            fields = ("comments",)
+        else:
+            snapshot = snapshots[url]
+        new_article_time = snapshot.get("article_time", "") if snapshot else ""
+        match_found = None
+        location = ""
+        # 如果爬取到发布时间，则同时匹配标题和发布时间
+        if new_article_time:
+            for article in local_articles:
+                if article["title"] == title and article.get("article_time", "") == new_article_time:
+                    match_found = article
+                    location = "常规页面"
+                    break
+            if not match_found:
+                for article in fixed_articles:
+                    if article["title"] == title and article.get("article_time", "") == new_article_time:
+                        match_found = article
+                        location = "固定页面"
+                        break
+        # 如果发布时间为空或匹配失败，则退回到使用 URL 进行匹配
+        if not match_found:
+            for article in local_articles:
+                if article.get("article_url", "") == url:
+                    match_found = article
+                    location = "常规页面"
+                    break
+            if not match_found:
+                for article in fixed_articles:
+                    if article.get("article_url", "") == url:
+                        match_found = article
+                        location = "固定页面"
+                        break
+        if match_found:
+            if location == "常规页面":
+                print(f"📌 正在更新第 {match_found.get('page', '?')} 页 第 {match_found.get('order', '?')} 篇文章：{title}")
+            else:
+                print(f"📌 正在更新固定页面：{title}")
+            if fields != SNAPSHOT_FIELDS and not snapshot["comments"] and match_found.get("comments"):
+                # 评论接口返回空但本地已有评论（例如链接与文章 ID 对不上），退回到完整页面
+                snapshot = get_article_snapshot(url)
+                fields = SNAPSHOT_FIELDS
+            if refresh_local_article(match_found, snapshot, location, fields=fields):
+                updated += 1
+            else:
+                failed += 1
+        else:
+            print(f"❌ 未在本地数据中找到匹配文章（标题及发布时间不匹配）：{title}")
+    if feed_state is not None:
+        if failed:
+            print(f"❌ 有 {failed} 篇文章未更新成功，下次运行将重新检查这些评论")
+        else:
+            CommentFeed.save_state(state_file, feed_state)
+    print(f"✅ 近期留言按标题和发布时间匹配更新完成，共更新 {updated} 篇文章。")
+
+# =================== 从原始网页存档重新解析 ===================
+
+def _reparse_worker(task):
+    """
+    在子进程中从存档读取页面并解析为快照，存档中没有该页面时返回 None
+    """
+    archive_dir, article_url = task
+    body, encoding = HtmlArchive.open_archive(archive_dir).get(article_url)
+    if body is None:
+        return None
+    return Extract.parse_article_snapshot(body, article_url, encoding=encoding)
+
+def reparse_local_articles(archive_dir=HtmlArchive.ARCHIVE_DIR, workers=None):
+    """
+    不访问网络，用原始网页存档重新解析本地所有文章（data/articles 和 data/fixed），
+    解析分配到 workers 个进程并行执行（None 表示与 CPU 核数相同），解析结果覆盖写回原文件。
+    """
+    try:
+        articles = load_all_local_articles() + load_fixed_articles()
+        tasks = [(archive_dir, article["article_url"]) for article in articles]
+        updated = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for article, snapshot in zip(articles, executor.map(_reparse_worker, tasks, chunksize=8)):
+                if snapshot is None:
+                    print(f"❌ 存档中没有页面，保留原数据：{article['article_url']}")
+                    continue
+                for key in ("title", "content"):
+                    if snapshot[key] is not None:
+                        article[key] = snapshot[key]
+                if snapshot["article_time"]:
+                    article["article_time"] = snapshot["article_time"]
+                article["comments"] = snapshot["comments"]
+                Timestamps.stamp_article(article)
+                updated.append(article)
+        save_article_files(updated)
+    finally:
+        close_article_store()
+    print(f"✅ 重新解析完成，共更新 {len(updated)} 篇文章。")
+
+# =================== 主更新流程 ===================
+
+def main_update():
+    """
+    主流程：
+    1. 检查网站是否有新文章，如有则更新文章并重新分配页码与顺序；
+    2. 检查近期留言中涉及的文章，按文章标题和发布时间匹配更新其数据；
+    3. 打印更新完成提示。
+    页面请求都经过磁盘上的条件请求缓存，未变化的页面只需一次 304 往返；
+    本次运行的所有请求共享一个重试策略（重试预算、熔断和截止时间），所有读写共用一个文章存储（见 article_store）。
+    """
+    Http.set_retry_policy(RetryPolicy.RetryPolicy(deadline=RUN_DEADLINE))
+    if HTML_ARCHIVE_DIR and REPLAY:
+        Http.enable_replay(HTML_ARCHIVE_DIR)
+    else:
+        Http.enable_cache(HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES)
+        if HTML_ARCHIVE_DIR:
+            Http.enable_archive(HTML_ARCHIVE_DIR)
+    try:
+        article_store()     # 打开存储（旧版目录迁移在这里进行一次）
+        if DISCOVERY == "sitemap":
+            update_from_sitemap()
+        else:
+            update_new_articles()
+        update_recent_comments_by_title()
+        # 先压缩再打包，打包和之后生成 HTML 时读取的文件不会再被替换
+        compact_change_log()
+    finally:
+        close_article_store()
+    print("✅ 所有更新完成！")
+    if STORAGE_BACKEND != "sqlite" and PACK_ARCHIVE:
+        DataPack.build_pack(DATA_DIR)
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    multiprocessing.freeze_support()  # 打包为 exe 后多进程需要
+    parser = argparse.ArgumentParser(description="更新最新文章和留言")
+    parser.add_argument("--reparse", action="store_true", help="不访问网络，从存档多进程重新解析本地文章")
+    parser.add_argument("--archive-dir", default=HtmlArchive.ARCHIVE_DIR, help="原始网页存档目录")
+    parser.add_argument("--workers", type=int, default=None, help="重新解析使用的进程数")
+    parser.add_argument("--compact", action="store_true", help="只压缩变更日志，把记录写回文章文件")
+    args = parser.parse_args()
+    if args.compact:
+        try:
+            if compact_change_log(force=True) is None:
+                print("📌 没有需要压缩的变更日志")
+        finally:
+            close_article_store()
+    elif args.reparse:
+        reparse_local_articles(args.archive_dir, workers=args.workers)
+    else:
+        main_update()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import urllib.parse
+
+# =================== 配置项 ===================
+CONNECT_TIMEOUT = 5         # 建立连接的超时秒数
+READ_TIMEOUT = 20           # 等待响应数据的超时秒数
+MAX_ATTEMPTS = 5            # 单个 URL 最多尝试次数
+RUN_RETRY_BUDGET = 200      # 整次运行允许的重试总数
+HOST_RETRY_BUDGET = 100     # 每个主机允许的重试总数
+BREAKER_THRESHOLD = 8       # 同一主机连续失败多少次后熔断
+BREAKER_COOLDOWN = 60       # 熔断后多少秒再放行一次试探请求
+RUN_DEADLINE = None         # 整次运行的最长秒数，None 表示不限
+
+# =================== 重试策略 ===================
+
+class RetryPolicy:
+    """
+    一次运行共享的重试策略：
+    - 整次运行和每个主机各有一个重试预算，用完后不再重试；
+    - 同一主机连续失败 breaker_threshold 次后熔断，冷却期内的请求直接失败，
+      冷却结束后放行一次试探请求，成功则恢复，失败则继续熔断；
+    - 超过运行截止时间后所有请求直接失败；
+    - 连接超时和读取超时分开设置。
+    """
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, run_budget=RUN_RETRY_BUDGET, host_budget=HOST_RETRY_BUDGET,
+                 breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN,
+                 deadline=RUN_DEADLINE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.max_attempts = max_attempts
+        self.run_budget = run_budget
+        self.host_budget = host_budget
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.deadline = time.monotonic() + deadline if deadline else None
+        self.timeout = (connect_timeout, read_timeout)
+        self._host_retries = {}
+        self._failures = {}
+        self._open_until = {}
+        self._trial = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url):
+        return urllib.parse.urlsplit(url).netloc
+
+    def remaining_time(self):
+        """
+        距离运行截止时间的秒数，不限时返回 None
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _blocked_reason(self, host):
+        # 调用方持有 self._lock
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "已超过本次运行的截止时间"
+        open_until = self._open_until.get(host)
+        if open_until is not None and (time.monotonic() < open_until or host in self._trial):
+            return f"主机 {host} 连续失败，已熔断"
+        return None
+
+    def blocked_reason(self, url):
+        """
+        该 URL 当前不允许请求时返回原因（超过截止时间、主机熔断中），允许时返回 None。
+        只做查询，不占用熔断冷却结束后的试探名额（见 start_request）。
+        """
+        with self._lock:
+            return self._blocked_reason(self._host(url))
+
+    def start_request(self, url):
+        """
+        即将发送请求时调用：不允许请求时返回原因；允许时返回 None，
+        若该主机刚结束熔断冷却，这次请求占用唯一的试探名额，其余请求在结果返回前继续视为熔断。
+        """
+        host = self._host(url)
+        with self._lock:
+            reason = self._blocked_reason(host)
+            if reason is None and host in self._open_until:
+                self._trial.add(host)
+            return reason
+
+    def allow_retry(self, url):
+        """
+        消耗一次重试预算，预算用完或无法再请求时返回 False
+        """
+        if self.blocked_reason(url):
+            return False
+        host = self._host(url)
+        with self._lock:
+            if self.run_budget <= 0 or self._host_retries.get(host, 0) >= self.host_budget:
+                return False
+            self.run_budget -= 1
+            self._host_retries[host] = self._host_retries.get(host, 0) + 1
+            return True
+
+    def record_success(self, url):
+        host = self._host(url)
+        with self._lock:
+            self._failures[host] = 0
+            self._open_until.pop(host, None)
+            self._trial.discard(host)
+
+    def record_failure(self, url):
+        host = self._host(url)
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.breaker_threshold or host in self._trial:
+                if host not in self._open_until or host in self._trial:
+                    print(f"❌ 主机 {host} 连续失败 {self._failures[host]} 次，熔断 {self.breaker_cooldown} 秒")
+                self._open_until[host] = time.monotonic() + self.breaker_cooldown
+                self._trial.discard(host)
+
+    def gave_up(self, url):
+        """
+        该主机已熔断、超过截止时间或预算用完时返回 True，外层循环应停止重试
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return True
+        host = self._host(url)
+        with self._lock:
+            if host in self._open_until and time.monotonic() < self._open_until[host]:
+                return True
+            return self.run_budget <= 0 or self._host_retries.get(host, 0) >= self.host_budget
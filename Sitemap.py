@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import xml.etree.ElementTree as ET
+import Http
+
+# =================== 配置项 ===================
+# 依次尝试的站点地图入口（WordPress 核心、纯参数链接、常见插件）
+SITEMAP_PATHS = ["wp-sitemap.xml", "?sitemap=index", "sitemap_index.xml", "sitemap.xml"]
+# 子站点地图中只读取文章和页面，跳过分类、标签、作者等
+SKIPPED_SITEMAPS = ("taxonom", "users", "category", "tag", "author")
+CHUNK_SIZE = 64 * 1024      # 流式读取时每次读取的字节数
+
+# =================== 流式解析 ===================
+
+def _local_name(tag):
+    """
+    去掉 XML 命名空间，"{http://www.sitemaps.org/...}loc" -> "loc"
+    """
+    return tag.rsplit("}", 1)[-1]
+
+def iter_sitemap(url):
+    """
+    流式读取一个站点地图，边下载边解析，逐条产出 (类型, loc, lastmod)：
+    类型为 "sitemap"（站点地图索引中的子站点地图）或 "url"（具体页面）。
+    请求失败时抛出异常。
+    """
+    response = Http.get(url, stream=True)
+    try:
+        response.raise_for_status()
+        parser = ET.XMLPullParser(events=("end",))
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                kind = _local_name(elem.tag)
+                if kind not in ("sitemap", "url"):
+                    continue
+                loc = lastmod = None
+                for child in elem:
+                    name = _local_name(child.tag)
+                    if name == "loc":
+                        loc = (child.text or "").strip()
+                    elif name == "lastmod":
+                        lastmod = (child.text or "").strip() or None
+                # 处理完立即清空，内存占用与站点地图大小无关
+                elem.clear()
+                if loc:
+                    yield kind, loc, lastmod
+        parser.close()
+    finally:
+        response.close()
+
+def find_sitemap(base_url):
+    """
+    返回第一个可用的站点地图入口地址，都不可用时返回 None
+    """
+    for path in SITEMAP_PATHS:
+        url = base_url + path
+        try:
+            response = Http.get(url, stream=True)
+            response.close()
+        except Exception as e:
+            print(f"❌ 请求站点地图 {url} 出错：{e}")
+            continue
+        if response.status_code == 200 and "xml" in response.headers.get("Content-Type", ""):
+            return url
+    return None
+
+def iter_article_entries(base_url):
+    """
+    遍历站点地图索引及其文章/页面子站点地图，逐条产出 (url, lastmod)；
+    没有可用站点地图时抛出 LookupError
+    """
+    index_url = find_sitemap(base_url)
+    if index_url is None:
+        raise LookupError("没有找到可用的站点地图")
+    pending = [index_url]
+    seen = set()
+    while pending:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        for kind, loc, lastmod in iter_sitemap(sitemap_url):
+            if kind == "sitemap":
+                if not any(word in loc for word in SKIPPED_SITEMAPS):
+                    pending.append(loc)
+            else:
+                yield loc, lastmod
+
+# =================== 与本地状态比对 ===================
+
+def load_state(state_file):
+    """
+    读取上次记录的 {url: lastmod}，没有记录返回 {}
+    """
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"❌ 读取站点地图记录失败: {e}")
+        return {}
+
+def save_state(state_file, state):
+    """
+    保存 {url: lastmod}，应在对应文章全部处理成功后再调用
+    """
+    folder = os.path.dirname(state_file)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+
+def discover_changes(base_url, state_file, known_urls=()):
+    """
+    读取站点地图并与上次记录的 lastmod 比对。
+    返回 (新文章 URL 列表, 已修改文章 URL 列表, 新的记录)，顺序与站点地图一致。
+    known_urls 为本地已有的文章：首次运行时它们只记录 lastmod，不会被当作新文章或已修改文章。
+    """
+    state = load_state(state_file)
+    known_urls = set(known_urls)
+    new_state = {}
+    new_urls = []
+    modified_urls = []
+    for url, lastmod in iter_article_entries(base_url):
+        new_state[url] = lastmod
+        if url in state:
+            if lastmod and state[url] != lastmod:
+                modified_urls.append(url)
+        elif url not in known_urls:
+            new_urls.append(url)
+    print(f"✅ 站点地图共 {len(new_state)} 个页面，新增 {len(new_urls)} 个，修改 {len(modified_urls)} 个")
+    return new_urls, modified_urls, new_state
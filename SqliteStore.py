@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import sqlite3
+import argparse
+import ArticleStore
+
+# =================== 配置项 ===================
+DB_NAME = "archive.db"                      # 数据库文件名，放在数据目录下
+DB_FILE = os.path.join("data", DB_NAME)     # 命令行工具默认使用的数据库
+PAGE_SIZE = ArticleStore.PAGE_SIZE          # 每页文章数，与 JSON 存储一致
+BATCH_SIZE = 500                            # 导入时每个事务写入的文章数
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    article_url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    article_time TEXT,
+    article_epoch INTEGER,
+    position INTEGER,
+    fixed INTEGER NOT NULL DEFAULT 0,
+    fixed_name TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_title_time ON articles (title, article_time);
+CREATE INDEX IF NOT EXISTS articles_position ON articles (position);
+CREATE TABLE IF NOT EXISTS comments (
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    parent_seq INTEGER,
+    comment_id TEXT,
+    author TEXT,
+    time TEXT,
+    epoch INTEGER,
+    content TEXT,
+    level INTEGER,
+    highlight INTEGER,
+    PRIMARY KEY (article_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS comments_author ON comments (author);
+CREATE INDEX IF NOT EXISTS comments_epoch ON comments (epoch);
+"""
+# articles 表：article_url 唯一（自带索引）；position 为常规文章的显示顺序（0 为最新），固定页面为 NULL；
+# fixed_name 为固定页面在 data/fixed 中的文件名，导出时沿用；data 为除评论外的其余字段（JSON，保留字段顺序）。
+# comments 表：每条评论一行，seq 为文章内按先序遍历的序号，parent_seq 为父评论的序号（顶层评论为 NULL）。
+
+COMMENT_COLUMNS = "seq, parent_seq, comment_id, author, time, epoch, content, level, highlight"
+
+# =================== 评论行与嵌套结构的转换 ===================
+
+def comment_rows(article_id, comments):
+    """
+    把嵌套的评论列表按先序展开为 comments 表的行
+    """
+    rows = []
+    stack = [(comment, None) for comment in reversed(comments or [])]
+    while stack:
+        comment, parent_seq = stack.pop()
+        seq = len(rows)
+        rows.append((article_id, seq, parent_seq, comment.get("id"), comment.get("author"), comment.get("time"),
+                     comment.get("epoch"), comment.get("content"), comment.get("level"),
+                     int(bool(comment.get("highlight")))))
+        for child in reversed(comment.get("children", [])):
+            stack.append((child, seq))
+    return rows
+
+def build_comment_tree(rows):
+    """
+    由按 seq 升序排列的行（不含 article_id）重建嵌套的评论列表，字段与 Extract.parse_comment 的结果相同
+    """
+    roots = []
+    nodes = {}
+    for seq, parent_seq, comment_id, author, time_text, epoch, content, level, highlight in rows:
+        comment = {
+            "id": comment_id,
+            "author": author,
+            "time": time_text,
+            "epoch": epoch,
+            "content": content,
+            "level": level,
+            "highlight": bool(highlight),
+            "children": []
+        }
+        nodes[seq] = comment
+        if parent_seq is None:
+            roots.append(comment)
+        else:
+            nodes[parent_seq]["children"].append(comment)
+    return roots
+
+# =================== SQLite 存储 ===================
+
+class SqliteStore:
+    """
+    文章和评论存入一个 SQLite 数据库，接口与 ArticleStore 相同（load_all、save_article、save_order 等），
+    可以替换 JSON 文件存储。批量写入在一个事务中完成；按标题、URL 查找文章时走索引，不必加载整个存档。
+    """
+
+    def __init__(self, db_file=DB_FILE, page_size=PAGE_SIZE):
+        folder = os.path.dirname(db_file)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.db_file = db_file
+        self.page_size = page_size
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def contains(self, article_url):
+        return self.conn.execute("SELECT 1 FROM articles WHERE article_url = ?", (article_url,)).fetchone() is not None
+
+    def position(self, i):
+        """
+        顺序中第 i 篇（从 0 开始）对应的 (页码, 页内序号)，均从 1 开始
+        """
+        return i // self.page_size + 1, i % self.page_size + 1
+
+    # ------------------- 写入 -------------------
+
+    def _upsert(self, article, fixed):
+        # 评论单独存表，data 中只留占位，读取时放回原来的位置
+        data = {key: (None if key == "comments" else value) for key, value in article.items()
+                if key not in ArticleStore.TRANSIENT_FIELDS}
+        fixed_name = os.path.basename(article["filename"]) if fixed and article.get("filename") else None
+        article_id = self.conn.execute(
+            """INSERT INTO articles (article_url, title, article_time, article_epoch, fixed, fixed_name, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (article_url) DO UPDATE SET
+                   title = excluded.title,
+                   article_time = excluded.article_time,
+                   article_epoch = excluded.article_epoch,
+                   fixed = MAX(fixed, excluded.fixed),
+                   fixed_name = COALESCE(excluded.fixed_name, fixed_name),
+                   data = excluded.data
+               RETURNING id""",
+            (article["article_url"], article.get("title"), article.get("article_time"), article.get("article_epoch"),
+             int(fixed), fixed_name, json.dumps(data, ensure_ascii=False))).fetchone()[0]
+        self.conn.execute("DELETE FROM comments WHERE article_id = ?", (article_id,))
+        self.conn.executemany(f"INSERT INTO comments (article_id, {COMMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              comment_rows(article_id, article.get("comments")))
+
+    def save_articles(self, articles, fixed=False):
+        """
+        在一个事务中写入（或更新）多篇文章及其评论；已有文章的显示顺序不变，固定页面不会因更新变为常规文章
+        """
+        with self.conn:
+            for article in articles:
+                self._upsert(article, fixed)
+
+    def save_article(self, article, fixed=False):
+        self.save_articles([article], fixed=fixed)
+        return self.db_file
+
+    def save_order(self, articles):
+        """
+        按给定顺序写入常规文章的显示顺序，并更新各文章的 page、order 字段；重复的 URL 只保留第一次出现的位置
+        """
+        rows = []
+        seen = set()
+        for article in articles:
+            url = article["article_url"]
+            if url in seen:
+                continue
+            seen.add(url)
+            article["page"], article["order"] = self.position(len(rows))
+            rows.append((len(rows), url))
+        with self.conn:
+            self.conn.execute("UPDATE articles SET position = NULL WHERE position IS NOT NULL")
+            self.conn.executemany("UPDATE articles SET position = ? WHERE article_url = ?", rows)
+
+    # ------------------- 读取 -------------------
+
+    def _load_comments(self, article_ids):
+        """
+        返回 {文章 id: 嵌套评论列表}
+        """
+        rows_by_article = {}
+        for start in range(0, len(article_ids), BATCH_SIZE):
+            chunk = article_ids[start:start + BATCH_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT article_id, {COMMENT_COLUMNS} FROM comments "
+                                         f"WHERE article_id IN ({placeholders}) ORDER BY article_id, seq", chunk):
+                rows_by_article.setdefault(row[0], []).append(row[1:])
+        return {article_id: build_comment_tree(rows) for article_id, rows in rows_by_article.items()}
+
+    def _load(self, where, params=()):
+        rows = self.conn.execute(f"SELECT id, position, data FROM articles WHERE {where}", params).fetchall()
+        comments = self._load_comments([row[0] for row in rows])
+        articles = []
+        for article_id, position, data in rows:
+            article = json.loads(data)
+            article["comments"] = comments.get(article_id, [])
+            if position is not None:
+                article["page"], article["order"] = self.position(position)
+            articles.append(article)
+        return articles
+
+    def load_all(self, lazy=False):
+        """
+        按显示顺序加载全部常规文章，每篇附带 page、order 字段
+        （一次查询读取全部数据，lazy 参数只为与 ArticleStore.load_all 的接口一致）
+        """
+        return self._load("position IS NOT NULL ORDER BY position")
+
+    def load_fixed(self):
+        return self._load("fixed = 1 ORDER BY id")
+
+    def find_candidates(self, titles, urls):
+        """
+        按标题或 URL 查找文章（走索引），返回 (常规文章列表, 固定页面列表)，常规文章按显示顺序排列
+        """
+        titles, urls = list(titles), list(urls)
+        where = (f"title IN ({', '.join('?' * len(titles))}) OR article_url IN ({', '.join('?' * len(urls))}) "
+                 "ORDER BY position IS NULL, position, id")
+        articles = self._load(where, titles + urls)
+        regular = [article for article in articles if "page" in article]
+        fixed = [article for article in articles if "page" not in article]
+        return regular, fixed
+
+    # ------------------- 与 data/ 目录互相转换 -------------------
+
+    def import_folder(self, data_dir, batch_size=BATCH_SIZE):
+        """
+        把 data_dir 中的文章（articles + index.json 或旧版 page* 目录，以及 fixed）导入数据库，不修改原文件。
+        返回 (常规文章数, 固定页面数)
+        """
+        source = ArticleStore.ArticleStore(data_dir, page_size=self.page_size)
+        articles = source.load_all() if source.has_index() else source.load_legacy()
+        for start in range(0, len(articles), batch_size):
+            self.save_articles(articles[start:start + batch_size])
+        self.save_order(articles)
+        fixed = ArticleStore.load_fixed(data_dir)
+        self.save_articles(fixed, fixed=True)
+        return len(articles), len(fixed)
+
+    def export_folder(self, data_dir):
+        """
+        把数据库导出为 ArticleStore 的目录结构（articles + index.json，固定页面写入 fixed）。
+        返回 (常规文章数, 固定页面数)
+        """
+        target = ArticleStore.ArticleStore(data_dir, page_size=self.page_size)
+        articles = self.load_all()
+        target.save_articles(articles)
+        target.save_order(articles)
+        fixed_names = dict(self.conn.execute("SELECT article_url, fixed_name FROM articles WHERE fixed = 1"))
+        fixed = self.load_fixed()
+        fixed_dir = os.path.join(data_dir, ArticleStore.FIXED_DIR)
+        os.makedirs(fixed_dir, exist_ok=True)
+        for article in fixed:
+            name = fixed_names.get(article["article_url"]) or f"{ArticleStore.article_key(article['article_url'])}.json"
+            ArticleStore.write_article(os.path.join(fixed_dir, name), article)
+        return len(articles), len(fixed)
+
+
+def open_store(db_file=DB_FILE, page_size=PAGE_SIZE, data_dir=None):
+    """
+    打开数据库；数据库中还没有文章而 data_dir 中有 JSON 数据时先导入，切换存储方式后不会丢失已有文章
+    """
+    store = SqliteStore(db_file, page_size=page_size)
+    if data_dir and store.count() == 0:
+        source = ArticleStore.ArticleStore(data_dir, page_size=page_size)
+        if source.has_index() or source.legacy_files() or ArticleStore.load_fixed(data_dir):
+            articles, fixed = store.import_folder(data_dir)
+            print(f"✅ 已从 {data_dir} 导入 {articles} 篇文章和 {fixed} 个固定页面到 {db_file}")
+    return store
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 存储与 data/ 目录（JSON 文件）之间的导入导出")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="把 data/ 目录中的文章导入数据库")
+    import_parser.add_argument("data_dir", nargs="?", default="data", help="数据目录")
+    import_parser.add_argument("--db", default=DB_FILE, help="数据库文件")
+    export_parser = subparsers.add_parser("export", help="把数据库导出为 data/ 目录结构")
+    export_parser.add_argument("data_dir", help="导出目录")
+    export_parser.add_argument("--db", default=DB_FILE, help="数据库文件")
+    args = parser.parse_args()
+    store = SqliteStore(args.db)
+    try:
+        if args.command == "import":
+            articles, fixed = store.import_folder(args.data_dir)
+            print(f"✅ 已从 {args.data_dir} 导入 {articles} 篇文章和 {fixed} 个固定页面到 {args.db}")
+        else:
+            articles, fixed = store.export_folder(args.data_dir)
+            print(f"✅ 已将 {articles} 篇文章和 {fixed} 个固定页面导出到 {args.data_dir}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
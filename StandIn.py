@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import random
+import hashlib
+import datetime
+import threading
+import argparse
+import email.utils
+import urllib.parse
+import http.server
+
+# =================== 配置项 ===================
+ARTICLES = 50               # 合成文章总数
+ARTICLES_PER_PAGE = 10      # 列表页每页文章数，与站点设置一致
+COMMENTS_PER_ARTICLE = 8    # 每篇文章的评论数
+THREAD_DEPTH = 3            # 回复的最大层级（0 表示没有回复，全部为顶层评论）
+FIXED_PAGE_IDS = [11, 18, 1230, 2115]  # 固定页面 ID，与 CrawlAll.PAGE_URLS 一致
+LATENCY = 0.0               # 每个请求注入的延迟秒数
+ERROR_RATE = 0.0            # 随机返回 503 的请求比例（0~1）
+FEED_PAGE_SIZE = 10         # 评论 feed 每页条目数，与 WordPress 默认一致
+RECENT_COMMENTS = 10        # 近期评论小工具显示的条数
+CHROME_LINKS = 120          # 页眉菜单、侧边栏归档和页脚中的链接数，模拟主题页面中与文章无关的部分
+SEED = 0                    # 随机数种子，相同配置生成相同的站点
+START_TIME = datetime.datetime(2025, 1, 29, 16, 49)  # 最新一篇文章的发布时间
+
+# =================== 合成站点数据 ===================
+
+class StandInSite:
+    """
+    本地 WordPress 替身站点的数据：按配置生成文章、固定页面和嵌套评论，
+    渲染与 andylee.pro 主题结构相同的列表页、文章页、近期评论小工具，
+    以及评论 RSS feed 和 REST API（/wp-json/wp/v2/posts|pages|comments）。
+    文章 ID 从 100 开始，ID 越大越新；评论 ID 为 文章ID * 10000 + 序号。
+    """
+
+    def __init__(self, articles=ARTICLES, comments=COMMENTS_PER_ARTICLE, depth=THREAD_DEPTH,
+                 per_page=ARTICLES_PER_PAGE, fixed_page_ids=FIXED_PAGE_IDS):
+        self.per_page = per_page
+        self.comments_per_article = comments
+        self.depth = depth
+        self.fixed_page_ids = list(fixed_page_ids)
+        self.posts = {}         # {文章 ID: 文章字典}
+        self.comments = {}      # {文章 ID: [评论字典]}，按发表顺序
+        self._lock = threading.Lock()
+        for _ in range(articles):
+            self.add_article()
+        for page_id in self.fixed_page_ids:
+            self._add_post(page_id, f"固定页面 {page_id}", START_TIME - datetime.timedelta(days=365), fixed=True)
+
+    def _add_post(self, post_id, title, date, fixed=False):
+        self.posts[post_id] = {"id": post_id, "title": title, "date": date, "fixed": fixed,
+                               "content": f"<p>{title} 的正文。</p>\n<p>第二段内容。</p>"}
+        self.comments[post_id] = []
+        for _ in range(self.comments_per_article):
+            self.add_comment(post_id)
+
+    def add_article(self):
+        """
+        发表一篇新文章（排在列表第一位），返回文章 ID
+        """
+        with self._lock:
+            articles = [post_id for post_id, post in self.posts.items() if not post["fixed"]]
+            post_id = max(articles, default=99) + 1
+            date = START_TIME + datetime.timedelta(hours=post_id - 100)
+            self._add_post(post_id, f"文章 {post_id}", date)
+            return post_id
+
+    def add_comment(self, post_id, author=None):
+        """
+        给文章添加一条评论：每 depth+1 条为一组，组内第一条为顶层评论，其余依次回复上一条
+        """
+        comments = self.comments[post_id]
+        n = len(comments)
+        parent = 0
+        if n % (self.depth + 1):
+            parent = comments[-1]["id"]
+        date = self.posts[post_id]["date"] + datetime.timedelta(minutes=n + 1)
+        comments.append({
+            "id": post_id * 10000 + n + 1,
+            "post": post_id,
+            "parent": parent,
+            "author": author or f"读者{n % 7}",
+            "date": date,
+            "content": f"<p>第 {n + 1} 条评论，回复 {parent or '文章'}。</p>",
+        })
+        return comments[-1]["id"]
+
+    def article_ids(self):
+        """
+        普通文章 ID，从新到旧
+        """
+        return sorted((post_id for post_id, post in self.posts.items() if not post["fixed"]), reverse=True)
+
+    def recent_comments(self):
+        """
+        全站评论，从新到旧
+        """
+        all_comments = [comment for comments in self.comments.values() for comment in comments]
+        return sorted(all_comments, key=lambda c: (c["date"], c["id"]), reverse=True)
+
+    # ------------------- 页面渲染 -------------------
+
+    def post_url(self, base_url, post_id):
+        key = "page_id" if self.posts[post_id]["fixed"] else "p"
+        return f"{base_url}?{key}={post_id}"
+
+    def listing_page(self, base_url, page):
+        """
+        文章列表页 ?paged=N，页码超出范围返回 None（404）
+        """
+        ids = self.article_ids()[(page - 1) * self.per_page:page * self.per_page]
+        if not ids:
+            return None
+        items = "".join(f'<article><h2 class="entry-title"><a href="{self.post_url(base_url, post_id)}">'
+                        f'{self.posts[post_id]["title"]}</a></h2></article>' for post_id in ids)
+        return self._layout(base_url, "文章列表", items)
+
+    def article_page(self, base_url, post_id):
+        """
+        文章页或固定页面，包含 ol.commentlist 嵌套评论树；文章不存在返回 None（404）
+        """
+        post = self.posts.get(post_id)
+        if post is None:
+            return None
+        iso_time = post["date"].isoformat() + "-08:00"
+        body = (f'<h1 class="post-title entry-title">{post["title"]}</h1>'
+                f'<span class="entry-date post-date"><abbr class="published" title="{iso_time}">'
+                f'{post["date"]:%Y-%m-%d}</abbr></span>'
+                f'<div class="entry-content">{post["content"]}</div>'
+                f'<ol class="commentlist">{self._comment_list(post_id, 0)}</ol>')
+        return self._layout(base_url, post["title"], body)
+
+    def _comment_list(self, post_id, parent):
+        children = {}
+        for comment in self.comments[post_id]:
+            children.setdefault(comment["parent"], []).append(comment)
+        # 显式栈渲染，回复层级很深时不受递归深度限制
+        parts = []
+        stack = [("open", comment) for comment in reversed(children.get(parent, []))]
+        while stack:
+            action, comment = stack.pop()
+            if action == "close":
+                parts.append("</ul></li>" if children.get(comment["id"]) else "</li>")
+                continue
+            parts.append(f'<li class="comment" id="li-comment-{comment["id"]}"><div class="comment-body">'
+                         f'<div class="comment-author"><cite class="fn">{comment["author"]}</cite></div>'
+                         f'<small>{self._comment_time(comment["date"])}</small>'
+                         f'<div class="comment_text">{comment["content"]}'
+                         f'<div class="reply"><a href="#">回复</a></div></div></div>')
+            stack.append(("close", comment))
+            replies = children.get(comment["id"], [])
+            if replies:
+                parts.append('<ul class="children">')
+                stack.extend(("open", reply) for reply in reversed(replies))
+        return "".join(parts)
+
+    @staticmethod
+    def _comment_time(date):
+        """
+        主题中的评论时间格式，例如 "29 1 月, 2025 at 4:49 下午"
+        """
+        period = "下午" if date.hour >= 12 else "上午"
+        hour = date.hour % 12 or 12
+        return f"{date.day} {date.month} 月, {date.year} at {hour}:{date.minute:02d} {period}"
+
+    def _layout(self, base_url, title, main):
+        widget = "".join(f'<li class="recentcomments"><span class="comment-author-link">{c["author"]}</span> 发表在《'
+                         f'<a href="{self.post_url(base_url, c["post"])}#comment-{c["id"]}">'
+                         f'{self.posts[c["post"]]["title"]}</a>》</li>'
+                         for c in self.recent_comments()[:RECENT_COMMENTS])
+        menu = "".join(f'<li class="menu-item menu-item-{i}"><a href="{base_url}?cat={i}">分类 {i}</a></li>'
+                       for i in range(CHROME_LINKS // 3))
+        archives = "".join(f'<li><a href="{base_url}?m=2024{i % 12 + 1:02d}">{2024 - i // 12} 年 {i % 12 + 1} 月</a></li>'
+                           for i in range(CHROME_LINKS // 3))
+        footer = "".join(f'<a class="footer-link" href="{base_url}?page_id={i}">链接 {i}</a> '
+                         for i in range(CHROME_LINKS - 2 * (CHROME_LINKS // 3)))
+        return (f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{title}</title>'
+                f'<style>body{{margin:0}} .widget{{padding:1em}}</style>'
+                f'<script>var wpData = {{"ajaxurl": "{base_url}wp-admin/admin-ajax.php"}};</script></head><body>'
+                f'<div id="page" class="site"><header id="masthead" class="site-header">'
+                f'<p class="site-title"><a href="{base_url}">替身站点</a></p>'
+                f'<nav id="site-navigation" class="main-navigation"><ul class="menu">{menu}</ul></nav></header>'
+                f'<div id="content" class="site-content"><main id="main" class="site-main">{main}</main>'
+                f'<div id="secondary" class="widget-area">'
+                f'<aside id="recent-comments-5" class="widget widget_recent_comments">'
+                f'<h3>近期评论</h3><ul>{widget}</ul></aside>'
+                f'<section id="archives-2" class="widget widget_archive"><h3>归档</h3><ul>{archives}</ul></section>'
+                f'</div></div><footer id="colophon" class="site-footer">{footer}</footer></div></body></html>')
+
+    def comment_feed(self, base_url, page):
+        """
+        评论 RSS（?feed=comments-rss2&paged=N），最新在前；页码超出范围返回 None（404）
+        """
+        items = self.recent_comments()[(page - 1) * FEED_PAGE_SIZE:page * FEED_PAGE_SIZE]
+        if not items and page > 1:
+            return None
+        entries = []
+        for c in items:
+            link = f"{self.post_url(base_url, c['post'])}#comment-{c['id']}"
+            pub_date = email.utils.format_datetime(c["date"].replace(tzinfo=datetime.timezone.utc))
+            entries.append(f"<item><title>Comment on {self.posts[c['post']]['title']} by {c['author']}</title>"
+                           f"<link>{link}</link><guid isPermaLink=\"false\">{link}</guid>"
+                           f"<pubDate>{pub_date}</pubDate></item>")
+        return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>评论</title>'
+                + "".join(entries) + "</channel></rss>")
+
+    def api(self, base_url, route, query):
+        """
+        REST API：posts / pages 支持 include、after、modified_after 和 orderby=modified，
+        comments 支持 post 和 after；返回 (数据列表, 总页数)，不支持的路由返回 None（404）
+        """
+        per_page = int(query.get("per_page", ["10"])[0])
+        page = int(query.get("page", ["1"])[0])
+        if route in ("posts", "pages"):
+            fixed = route == "pages"
+            ids = [post_id for post_id in self.article_ids() + self.fixed_page_ids
+                   if self.posts[post_id]["fixed"] == fixed]
+            if "include" in query:
+                include = {int(x) for x in query["include"][0].split(",") if x}
+                ids = [post_id for post_id in ids if post_id in include]
+            data = [self._api_post(base_url, self.posts[post_id]) for post_id in ids]
+            for param, field in (("after", "date"), ("modified_after", "modified")):
+                if param in query:
+                    data = [post for post in data if post[field] > query[param][0]]
+            if query.get("orderby", [""])[0] == "modified":
+                data.sort(key=lambda post: post["modified"], reverse=query.get("order", ["desc"])[0] == "desc")
+        elif route == "comments":
+            comments = [c for cs in self.comments.values() for c in cs]
+            if "post" in query:
+                include = {int(x) for x in query["post"][0].split(",") if x}
+                comments = [c for c in comments if c["post"] in include]
+            comments.sort(key=lambda c: (c["date"], c["id"]), reverse=query.get("order", ["desc"])[0] == "desc")
+            data = [self._api_comment(c) for c in comments]
+            if "after" in query:
+                data = [comment for comment in data if comment["date"] > query["after"][0]]
+        else:
+            return None
+        total_pages = max(1, -(-len(data) // per_page))
+        return data[(page - 1) * per_page:page * per_page], total_pages
+
+    def _api_post(self, base_url, post):
+        return {"id": post["id"], "link": self.post_url(base_url, post["id"]),
+                "date": post["date"].isoformat(), "modified": post.get("modified", post["date"]).isoformat(),
+                "title": {"rendered": post["title"]},
+                "content": {"rendered": post["content"] + "\n"}}
+
+    @staticmethod
+    def _api_comment(comment):
+        return {"id": comment["id"], "post": comment["post"], "parent": comment["parent"],
+                "author_name": comment["author"], "date": comment["date"].isoformat(),
+                "date_gmt": comment["date"].isoformat(), "content": {"rendered": comment["content"] + "\n"}}
+
+# =================== HTTP 服务 ===================
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """
+    把请求路由到 StandInSite，支持 ETag 条件请求，并按配置注入延迟和 503 错误
+    """
+    protocol_version = "HTTP/1.1"  # 支持长连接，与共享会话的连接池配合
+    disable_nagle_algorithm = True  # 响应头和正文分两次写出，避免与延迟确认叠加出 40ms 的等待
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.count("requests")
+        if server.latency:
+            time.sleep(server.latency)
+        if server.error_rate and server.random() < server.error_rate:
+            server.count("errors")
+            self._send(503, b"", "text/plain", extra={"Retry-After": "1"})
+            return
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parts.query)
+        base_url = f"http://{self.headers.get('Host', '127.0.0.1')}/wp/"
+        site = server.site
+        ctype = "text/html; charset=UTF-8"
+        extra = {}
+        if not parts.path.startswith("/wp/"):
+            body = None
+        elif "/wp-json/wp/v2/" in parts.path:
+            server.count("api")
+            result = site.api(base_url, parts.path.rsplit("/", 1)[-1], query)
+            body = None
+            if result is not None:
+                data, total_pages = result
+                body = json.dumps(data, ensure_ascii=False)
+                ctype = "application/json; charset=UTF-8"
+                extra["X-WP-TotalPages"] = str(total_pages)
+        elif "feed" in query:
+            server.count("feed")
+            body = site.comment_feed(base_url, int(query.get("paged", ["1"])[0]))
+            ctype = "application/rss+xml; charset=UTF-8"
+        elif "p" in query or "page_id" in query:
+            server.count("articles")
+            body = site.article_page(base_url, int((query.get("p") or query["page_id"])[0]))
+        elif "paged" in query:
+            server.count("listings")
+            body = site.listing_page(base_url, int(query["paged"][0]))
+        else:
+            server.count("listings")
+            body = site.listing_page(base_url, 1)
+        if body is None:
+            self._send(404, b"", "text/plain")
+            return
+        data = body.encode("utf-8")
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            server.count("not_modified")
+            self._send(304, b"", None, extra={"ETag": etag})
+            return
+        extra["ETag"] = etag
+        server.count("bytes", len(data))
+        self._send(200, data, ctype, extra=extra)
+
+    def _send(self, status, data, ctype, extra=None):
+        self.send_response(status)
+        if ctype:
+            self.send_header("Content-Type", ctype)
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """
+    多线程的本地替身服务器，stats 中记录各类请求数、错误数和发送的字节数
+    """
+    daemon_threads = True
+
+    def __init__(self, site, host="127.0.0.1", port=0, latency=LATENCY, error_rate=ERROR_RATE, seed=SEED):
+        super().__init__((host, port), StandInHandler)
+        self.site = site
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = {}
+        self._random = random.Random(seed)
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/wp/"
+
+    def random(self):
+        with self._stats_lock:
+            return self._random.random()
+
+    def count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def snapshot_stats(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+def start(site=None, host="127.0.0.1", port=0, latency=LATENCY, error_rate=ERROR_RATE, seed=SEED):
+    """
+    在后台线程中启动替身服务器并返回，port=0 时自动选择空闲端口，站点地址为 server.base_url
+    """
+    server = StandInServer(site or StandInSite(), host=host, port=port,
+                           latency=latency, error_rate=error_rate, seed=seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动本地 WordPress 替身站点，用于离线测试和性能测试")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口")
+    parser.add_argument("--articles", type=int, default=ARTICLES, help="文章总数")
+    parser.add_argument("--comments", type=int, default=COMMENTS_PER_ARTICLE, help="每篇文章的评论数")
+    parser.add_argument("--depth", type=int, default=THREAD_DEPTH, help="回复的最大层级")
+    parser.add_argument("--latency", type=float, default=LATENCY, help="每个请求注入的延迟秒数")
+    parser.add_argument("--error-rate", type=float, default=ERROR_RATE, help="随机返回 503 的请求比例")
+    args = parser.parse_args()
+    site = StandInSite(articles=args.articles, comments=args.comments, depth=args.depth)
+    server = StandInServer(site, port=args.port, latency=args.latency, error_rate=args.error_rate)
+    print(f"✅ 替身站点已启动：{server.base_url}（按 Ctrl+C 停止）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import sys
+import DataCodec
+import calendar
+import datetime
+
+# =================== 配置项 ===================
+DATA_FOLDERS = ["data", "datatest"]     # 批量迁移时默认处理的数据目录（Rdata 与 CrawlAll 的输出）
+UNKNOWN_TIMES = {"", "未知时间"}         # 表示没有发布时间的显示字符串
+
+# 评论页面上的原始时间，例如 "29 1 月, 2025 at 4:49 下午"
+COMMENT_TIME_RE = re.compile(r'(\d+)\s*(\d+)\s*月,\s*(\d{4})\s+at\s+(\d+):(\d+)\s*(上午|下午)')
+# 本地数据中的显示时间，例如 "2025年01月29日 16:49"（标准格式走切片快速路径，这里兼容不补零的写法）
+DISPLAY_TIME_RE = re.compile(r'(\d{4})\s*年\s*(\d{1,2})\s*月\s*(\d{1,2})\s*日\s*(\d{1,2}):(\d{2})')
+
+# =================== 时间解析 ===================
+# 时间戳（epoch）按站点本地时间（页面显示的时间）计算，即把显示时间视为 UTC 换算为秒数，
+# 与显示字符串一一对应，只用于排序和比较；没有时间或无法识别时为 None（JSON 中为 null）。
+
+def to_epoch(year, month, day, hour=0, minute=0):
+    return calendar.timegm((year, month, day, hour, minute, 0))
+
+def parse_comment_time(raw_time):
+    """
+    解析评论区的原始时间，返回 (显示时间 "YYYY年MM月DD日 HH:MM", 时间戳)；
+    无法识别时原样返回显示字符串，时间戳为 None
+    """
+    match = COMMENT_TIME_RE.search(raw_time)
+    if not match:
+        return raw_time, display_to_epoch(raw_time)
+    day = int(match.group(1))
+    month = int(match.group(2))
+    year = int(match.group(3))
+    hour = int(match.group(4))
+    minute = int(match.group(5))
+    if match.group(6) == "下午" and hour < 12:
+        hour += 12
+    try:
+        epoch = to_epoch(year, month, day, hour, minute)
+    except ValueError:
+        epoch = None
+    return f"{year}年{month:02d}月{day:02d}日 {hour:02d}:{minute:02d}", epoch
+
+def display_to_epoch(text):
+    """
+    把显示时间转为时间戳：标准格式 "YYYY年MM月DD日 HH:MM" 直接按位置切片，
+    其余依次尝试宽松的显示格式、ISO 时间和评论区原始格式，都不匹配时返回 None
+    """
+    if not text or text in UNKNOWN_TIMES:
+        return None
+    try:
+        if len(text) == 17 and text[4] == "年" and text[7] == "月" and text[10] == "日" and text[14] == ":":
+            return to_epoch(int(text[:4]), int(text[5:7]), int(text[8:10]), int(text[12:14]), int(text[15:17]))
+        match = DISPLAY_TIME_RE.search(text)
+        if match:
+            return to_epoch(*(int(group) for group in match.groups()))
+        if COMMENT_TIME_RE.search(text):
+            return parse_comment_time(text)[1]
+        return iso_to_epoch(text)
+    except ValueError:
+        return None
+
+def iso_to_epoch(iso_time):
+    """
+    ISO 时间（例如 REST API 的 "2025-01-29T16:49:00" 或页面上的 "2025-01-29T16:49:00-08:00"）
+    按其中的本地时间转为时间戳，与 strftime 得到的显示时间一致；无法解析返回 None
+    """
+    try:
+        dt = datetime.datetime.fromisoformat(iso_time)
+    except (TypeError, ValueError):
+        return None
+    return to_epoch(dt.year, dt.month, dt.day, dt.hour, dt.minute)
+
+# =================== 文章数据 ===================
+
+def _set_after(d, after_key, key, value):
+    """
+    设置 d[key]，新增的键放在 after_key 之后，写出的 JSON 与新爬取的数据字段顺序一致
+    """
+    if key in d or after_key not in d:
+        d[key] = value
+        return
+    items = list(d.items())
+    d.clear()
+    for k, v in items:
+        d[k] = v
+        if k == after_key:
+            d[key] = value
+
+def stamp_article(article):
+    """
+    按文章字典中的显示时间补全时间戳：文章的 article_epoch 总是按 article_time 重新计算，
+    评论缺少 epoch 字段时按 time 计算（解析页面和 REST API 时已经写入的不再重复计算）。
+    返回是否有改动。
+    """
+    changed = False
+    epoch = display_to_epoch(article.get("article_time", ""))
+    if "article_epoch" not in article or article["article_epoch"] != epoch:
+        _set_after(article, "article_time", "article_epoch", epoch)
+        changed = True
+    stack = list(article.get("comments") or [])
+    while stack:
+        comment = stack.pop()
+        if "epoch" not in comment:
+            _set_after(comment, "time", "epoch", display_to_epoch(comment.get("time", "")))
+            changed = True
+        stack.extend(comment.get("children", []))
+    return changed
+
+def sort_key(epoch, descending=False):
+    """
+    按时间戳排序时使用的键，没有时间的排在最后（与页面上“未知时间”的排序一致）
+    """
+    if epoch is None:
+        return (1, 0)
+    return (0, -epoch if descending else epoch)
+
+def migrate_folder(data_folder):
+    """
+    为目录下（含 articles/fixed 以及旧版 page* 子目录）已有的文章 JSON 文件批量补全时间戳，只重写有改动的文件；
+    不含 article_url 的 JSON（例如 ArticleStore 的顺序索引）跳过。
+    按 DataCodec.FORMAT 先写临时文件再替换，中途出错不会损坏原文件。返回 (检查的文件数, 更新的文件数)。
+    """
+    checked = updated = 0
+    for root, _, files in os.walk(data_folder):
+        for filename in sorted(files):
+            if not filename.endswith(".json"):
+                continue
+            path = os.path.join(root, filename)
+            checked += 1
+            try:
+                article = DataCodec.load_file(path)
+            except Exception as e:
+                print(f"❌ 读取 {path} 失败: {e}")
+                continue
+            if not isinstance(article, dict) or "article_url" not in article or not stamp_article(article):
+                continue
+            DataCodec.dump_file(path, article)
+            updated += 1
+    return checked, updated
+
+def main():
+    folders = sys.argv[1:] or DATA_FOLDERS
+    for folder in folders:
+        if not os.path.isdir(folder):
+            print(f"📌 目录 {folder} 不存在，跳过")
+            continue
+        # 先把变更日志写回文章文件，补全时间戳后日志中的记录仍能对上文件内容
+        import ArticleStore
+        store = ArticleStore.ArticleStore(folder)
+        if store.log.pending_bytes():
+            store.compact()
+        checked, updated = migrate_folder(folder)
+        print(f"✅ {folder}：检查 {checked} 个文件，补全时间戳 {updated} 个")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import urllib.parse
+from bs4 import BeautifulSoup
+import Http
+import Timestamps
+import Extract
+
+# =================== 配置项 ===================
+PER_PAGE = 100              # REST API 单页最大条数
+
+
+class ApiUnavailable(Exception):
+    """
+    REST API 被禁用、无权限或返回的不是 JSON 时抛出，调用方应退回到 HTML 抓取
+    """
+
+
+# =================== 请求与分页 ===================
+
+def api_url(base_url, route, params=None):
+    """
+    构造 REST API 地址，例如 api_url(BASE_URL, "posts", {"page": 2}) ->
+    https://andylee.pro/wp/wp-json/wp/v2/posts?page=2
+    """
+    url = f"{base_url}wp-json/wp/v2/{route}"
+    if params:
+        url += "?" + urllib.parse.urlencode(params, safe=",")
+    return url
+
+def get_json(url, timeout=None):
+    """
+    请求并解析一个 REST API 地址，返回 (数据, 响应)；接口不可用时抛出 ApiUnavailable
+    """
+    try:
+        response = Http.get(url, timeout=timeout)
+    except Exception as e:
+        raise ApiUnavailable(f"请求 {url} 出错: {e}")
+    if response.status_code != 200:
+        raise ApiUnavailable(f"请求 {url} 失败，状态码: {response.status_code}")
+    try:
+        return response.json(), response
+    except ValueError:
+        raise ApiUnavailable(f"{url} 返回的不是 JSON")
+
+def fetch_all(base_url, route, params=None):
+    """
+    按 per_page=100 翻页取回某个集合的全部条目，依据 X-WP-TotalPages 判断结束
+    """
+    params = dict(params or {})
+    params["per_page"] = PER_PAGE
+    items = []
+    page = 1
+    while True:
+        params["page"] = page
+        data, response = get_json(api_url(base_url, route, params))
+        if not isinstance(data, list):
+            raise ApiUnavailable(f"{route} 返回的数据格式不正确")
+        items.extend(data)
+        total_pages = int(response.headers.get("X-WP-TotalPages", page))
+        if not data or page >= total_pages:
+            return items
+        page += 1
+
+def fetch_posts(base_url, include=None, after=None, modified_after=None, route="posts"):
+    """
+    批量获取文章（route="pages" 获取固定页面）；
+    include 为文章 ID 列表，after / modified_after 为 ISO 时间字符串，只返回之后发布/修改的文章
+    """
+    params = {"orderby": "date", "order": "desc"}
+    if include:
+        params["include"] = ",".join(str(post_id) for post_id in include)
+    if after:
+        params["after"] = after
+    if modified_after:
+        params["modified_after"] = modified_after
+    return fetch_all(base_url, route, params)
+
+def fetch_comments(base_url, post_ids=None, after=None):
+    """
+    批量获取评论，按发布时间升序（与页面上的显示顺序一致）；
+    post_ids 为文章 ID 列表，after 为 ISO 时间字符串，只返回之后发表的评论
+    """
+    params = {"orderby": "date_gmt", "order": "asc"}
+    if post_ids:
+        params["post"] = ",".join(str(post_id) for post_id in post_ids)
+    if after:
+        params["after"] = after
+    return fetch_all(base_url, "comments", params)
+
+def posts_with_new_comments(base_url, after):
+    """
+    返回 after 之后有新评论的文章 {文章 ID: 其中最新一条评论的时间}（每 100 条评论一次请求）
+    """
+    latest = {}
+    for comment in fetch_comments(base_url, after=after):
+        latest[comment["post"]] = max(latest.get(comment["post"], ""), comment.get("date", ""))
+    return latest
+
+def fetch_latest(base_url, route, orderby):
+    """
+    按 orderby 降序取某个集合的第一条，集合为空返回 None
+    """
+    data, _ = get_json(api_url(base_url, route, {"orderby": orderby, "order": "desc", "per_page": 1}))
+    if not isinstance(data, list):
+        raise ApiUnavailable(f"{route} 返回的数据格式不正确")
+    return data[0] if data else None
+
+# =================== 变更检测 ===================
+
+def detect_changed_articles(base_url, state):
+    """
+    用 after / modified_after 过滤找出上次运行之后有新评论或被修改过的文章（含固定页面）。
+    state 为上次保存的位置 {"comment_after": 评论时间, "modified_after": 文章修改时间}（都取自接口返回的站点时间），
+    返回 (标题->链接 字典, 新的位置, 被修改过的文章链接集合)；首次运行（state 为 None）时只记录当前位置，不返回文章。
+    站点还没有评论或文章时不记录对应的位置，之后的运行不加过滤，取到的第一批评论或文章即为新的位置。
+    接口不可用时抛出 ApiUnavailable。
+    """
+    if state is None:
+        comment = fetch_latest(base_url, "comments", "date")
+        post = fetch_latest(base_url, "posts", "modified")
+        print("📌 首次使用 REST API 检测变更，只记录当前位置")
+        new_state = {}
+        if comment:
+            new_state["comment_after"] = comment["date"]
+        if post:
+            new_state["modified_after"] = post["modified"]
+        return {}, new_state, set()
+    new_state = dict(state)
+    commented = posts_with_new_comments(base_url, state.get("comment_after"))
+    if commented:
+        new_state["comment_after"] = max(commented.values())
+    posts = {}
+    modified = set()
+    for route in ("posts", "pages"):
+        for post in fetch_posts(base_url, modified_after=state.get("modified_after"), route=route):
+            posts[post["id"]] = post
+            modified.add(post["link"])
+            new_state["modified_after"] = max(new_state.get("modified_after", ""), post.get("modified", ""))
+        # 有新评论但没有修改过的文章，按 ID 批量取回标题和链接
+        id_list = sorted(set(commented) - set(posts))
+        for start in range(0, len(id_list), PER_PAGE):
+            for post in fetch_posts(base_url, include=id_list[start:start + PER_PAGE], route=route):
+                posts[post["id"]] = post
+    title_to_url = {}
+    for post in posts.values():
+        if post["link"] not in title_to_url.values():
+            title_to_url.setdefault(rendered_text(post.get("title", {})), post["link"])
+    print(f"✅ REST API 中有 {len(commented)} 篇文章有新评论，{len(modified)} 篇文章被修改，"
+          f"共涉及 {len(title_to_url)} 篇文章")
+    return title_to_url, new_state, modified
+
+# =================== 转换为本地数据结构 ===================
+
+def format_time(iso_time):
+    """
+    将 REST API 的本地时间 "2025-01-29T16:49:00" 转为 "2025年01月29日 16:49"
+    """
+    try:
+        return datetime.datetime.fromisoformat(iso_time).strftime("%Y年%m月%d日 %H:%M")
+    except (TypeError, ValueError):
+        return iso_time or ""
+
+def rendered_text(field):
+    """
+    取 {"rendered": "..."} 字段的纯文本（与页面上 get_text(strip=True) 的结果一致）
+    """
+    return BeautifulSoup(field.get("rendered", ""), "html.parser").get_text(strip=True)
+
+def post_id_from_url(article_url):
+    """
+    从 ?p=123 或 ?page_id=123 形式的链接中取出文章 ID，取不到返回 None
+    """
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(article_url).query)
+    for key in ("p", "page_id"):
+        if key in query and query[key][0].isdigit():
+            return int(query[key][0])
+    return None
+
+def build_comment_tree(comments, article_url):
+    """
+    按 parent 把平铺的评论组装为嵌套结构，
+    生成与 Extract.parse_comment 相同的字典（id 按先序遍历的索引生成，level 为回复层级）
+    """
+    children = {}
+    known = {comment["id"] for comment in comments}
+    for comment in sorted(comments, key=lambda c: (c.get("date_gmt", ""), c["id"])):
+        parent = comment.get("parent", 0)
+        # 父评论不可见（例如未审核）时作为顶层评论显示
+        children.setdefault(parent if parent in known else 0, []).append(comment)
+
+    results = []
+    index = 0
+    # 显式栈先序遍历：(评论, 层级, 父节点的 children 列表)
+    stack = [(comment, 0, results) for comment in reversed(children.get(0, []))]
+    while stack:
+        comment, level, siblings = stack.pop()
+        author = comment.get("author_name", "")
+        data = {
+            "id": Extract.generate_unique_id(article_url, index),
+            "author": author,
+            "time": format_time(comment.get("date")),
+            "epoch": Timestamps.iso_to_epoch(comment.get("date")),
+            "content": comment.get("content", {}).get("rendered", "").strip(),
+            "level": level,
+            "highlight": author in Extract.TARGET_USERS,
+            "children": []
+        }
+        index += 1
+        siblings.append(data)
+        for child in reversed(children.get(comment["id"], [])):
+            stack.append((child, level + 1, data["children"]))
+    return results
+
+def build_snapshot(post, comments, article_url=None):
+    """
+    由 REST API 的文章和评论构造与 Rdata.get_article_snapshot 相同结构的快照
+    """
+    article_url = article_url or post["link"]
+    return {
+        "article_url": article_url,
+        "title": rendered_text(post.get("title", {})),
+        "content": post.get("content", {}).get("rendered", "").strip(),
+        "article_time": format_time(post.get("date")),
+        "comments": build_comment_tree(comments, article_url),
+    }
+
+def fetch_snapshots(base_url, urls):
+    """
+    批量获取多篇文章的快照：文章和固定页面各按 100 篇一批请求，评论按 100 条一页请求。
+    返回 {url: 快照}，API 中找不到的 URL 不在结果中（由调用方退回 HTML 抓取）；
+    接口不可用时抛出 ApiUnavailable。
+    """
+    ids = {}
+    for url in urls:
+        post_id = post_id_from_url(url)
+        if post_id is not None:
+            ids[post_id] = url
+    if not ids:
+        return {}
+    posts = []
+    for route in ("posts", "pages"):
+        id_list = sorted(ids)
+        for start in range(0, len(id_list), PER_PAGE):
+            posts.extend(fetch_posts(base_url, include=id_list[start:start + PER_PAGE], route=route))
+    found = {post["id"]: post for post in posts if post["id"] in ids}
+    comments_by_post = {post_id: [] for post_id in found}
+    found_ids = sorted(found)
+    for start in range(0, len(found_ids), PER_PAGE):
+        for comment in fetch_comments(base_url, post_ids=found_ids[start:start + PER_PAGE]):
+            comments_by_post.setdefault(comment["post"], []).append(comment)
+    return {ids[post_id]: build_snapshot(post, comments_by_post[post_id], article_url=ids[post_id])
+            for post_id, post in found.items()}
+
+def fetch_comment_trees(base_url, urls):
+    """
+    只获取评论，不下载文章正文：按 100 条一页批量请求这些文章的评论并组装为嵌套结构。
+    返回 {url: 评论列表}；无法从链接得到文章 ID、或评论缺少 parent 回复关系（
+    例如父评论不在结果中）的文章不在结果中，由调用方退回到请求完整页面。
+    接口不可用时抛出 ApiUnavailable。
+    """
+    ids = {}
+    for url in urls:
+        post_id = post_id_from_url(url)
+        if post_id is not None:
+            ids[post_id] = url
+    comments_by_post = {post_id: [] for post_id in ids}
+    id_list = sorted(ids)
+    for start in range(0, len(id_list), PER_PAGE):
+        for comment in fetch_comments(base_url, post_ids=id_list[start:start + PER_PAGE]):
+            comments_by_post.setdefault(comment.get("post"), []).append(comment)
+    trees = {}
+    for post_id, comments in comments_by_post.items():
+        if post_id not in ids:
+            continue
+        known = {comment["id"] for comment in comments}
+        if any("parent" not in comment or (comment["parent"] and comment["parent"] not in known)
+               for comment in comments):
+            print(f"❌ 评论回复关系不完整，需要请求完整页面：{ids[post_id]}")
+            continue
+        trees[ids[post_id]] = build_comment_tree(comments, ids[post_id])
+    return trees